@@ -1,5 +1,7 @@
 __all__ = ["table", "dice", "strategy", "bet", "Table", "Player"]
 
+__version__ = "0.3.1"
+
 from crapssim.dice import Dice
 from crapssim.table import Player, Table
 
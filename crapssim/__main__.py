@@ -0,0 +1,248 @@
+"""
+Command line interface of crapssim. Run a simulation of many sessions of a strategy on
+a pool of processes, writing a row of running summary statistics after each chunk of
+sessions, e.g.
+
+    python -m crapssim simulate --strategy IronCross --param base_amount=10 \\
+        --sessions 100000 --bankroll 500 --max-shooter 10 --seed 1 --workers 8
+
+The strategy is a preset from crapssim.strategy.examples (or any other strategy type a
+spec can name) with its parameters given by --param, a JSON or YAML spec file, or an
+inline JSON spec (see crapssim.strategy.spec).
+
+Only the argument parser is set up on import; the simulation modules are imported when
+a command runs, so --help and bad arguments answer quickly.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import pathlib
+import sys
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from crapssim.simulation import SimulationSummary
+
+__all__ = ["main"]
+
+COLUMNS = (
+    "sessions",
+    "mean",
+    "standard_deviation",
+    "standard_error",
+    "win_rate",
+    "ruin_rate",
+    "mean_rolls",
+    "elapsed",
+)
+"""The columns of the summary rows of simulate."""
+
+
+def _parameter(text: str) -> tuple[str, typing.Any]:
+    """A NAME=VALUE strategy parameter, with the value read as JSON if it can be
+    (so numbers, lists and dictionaries work) and as a string otherwise."""
+    name, separator, value = text.partition("=")
+    if separator == "" or name == "":
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
+
+
+def _json_argument(text: str) -> typing.Any:
+    """Inline JSON, or the contents of a JSON file."""
+    if text.lstrip().startswith(("{", "[")):
+        return json.loads(text)
+    return json.loads(pathlib.Path(text).read_text())
+
+
+def _numeric_keys(value: typing.Any) -> typing.Any:
+    """The table settings with the keys that are numbers in JSON strings (the dice
+    totals and numbers of made points) turned back into ints."""
+    if isinstance(value, dict):
+        return {
+            int(k) if isinstance(k, str) and k.isdigit() else k: _numeric_keys(v)
+            for k, v in value.items()
+        }
+    return value
+
+
+def _strategy_spec(
+    strategy: str, parameters: list[tuple[str, typing.Any]]
+) -> typing.Any:
+    """The spec of the --strategy and --param arguments."""
+    from crapssim.strategy.spec import STRATEGY_TYPES, load_spec
+
+    if strategy in STRATEGY_TYPES:
+        return {"type": strategy, **dict(parameters)}
+    if len(parameters) > 0:
+        raise ValueError("--param can only be used with a strategy name")
+    if strategy.lstrip().startswith(("{", "[", '"')):
+        return json.loads(strategy)
+    return load_spec(strategy)
+
+
+def _row(summary: "SimulationSummary", elapsed: float) -> dict[str, typing.Any]:
+    """The summary row of a SimulationSummary."""
+    stats = summary.summary
+    return {
+        "sessions": stats.n_sessions,
+        "mean": stats.mean,
+        "standard_deviation": stats.standard_deviation,
+        "standard_error": stats.standard_error,
+        "win_rate": stats.win_rate,
+        "ruin_rate": stats.ruin_rate,
+        "mean_rolls": stats.mean_rolls,
+        "elapsed": round(elapsed, 3),
+    }
+
+
+def _row_writer(
+    output: typing.TextIO, format: str
+) -> typing.Callable[[dict[str, typing.Any]], typing.Any]:
+    """Function writing a summary row to the output as CSV (after writing the header)
+    or as a line of JSON."""
+    if format == "csv":
+        writer = csv.DictWriter(output, COLUMNS)
+        writer.writeheader()
+        return writer.writerow
+    return lambda row: output.write(json.dumps(row) + "\n")
+
+
+def simulate(args: argparse.Namespace) -> None:
+    """Run the simulate command."""
+    from crapssim.progress import Progress
+    from crapssim.simulation import Simulation
+    from crapssim.strategy.spec import strategy_from_spec
+    from crapssim.table import TableSettings
+
+    try:
+        strategy = strategy_from_spec(_strategy_spec(args.strategy, args.param))
+    except (ValueError, OSError, json.JSONDecodeError) as e:
+        sys.exit(f"Invalid strategy: {e}")
+
+    table_settings = None
+    if args.table_settings is not None:
+        try:
+            table_settings = _numeric_keys(_json_argument(args.table_settings))
+        except (OSError, json.JSONDecodeError) as e:
+            sys.exit(f"Invalid table settings: {e}")
+        unknown = set(table_settings) - set(TableSettings.__annotations__)
+        if len(unknown) > 0:
+            sys.exit(f"Unknown table settings: {sorted(unknown)}")
+
+    simulation = Simulation(
+        strategy,
+        args.sessions,
+        args.bankroll,
+        args.max_rolls,
+        args.max_shooter,
+        args.seed,
+        args.runout,
+        table_settings,
+    )
+    n_workers = args.workers or os.cpu_count() or 1
+    # enough chunks to keep the workers busy and to write a useful number of rows
+    chunk_size = args.chunk_size or max(
+        1, math.ceil(args.sessions / max(20, 4 * n_workers))
+    )
+    progress = None
+    if args.progress is not None:
+        progress = Progress(
+            lambda x: print(x, file=sys.stderr, flush=True), args.progress
+        )
+
+    print(f"Simulating {simulation!r}", file=sys.stderr)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    summaries = simulation.iter_summarize(n_workers, chunk_size, args.backend, progress)
+    try:
+        write = _row_writer(output, args.format)
+        start = time.perf_counter()
+        for summary in summaries:
+            write(_row(summary, time.perf_counter() - start))
+            output.flush()
+    except BrokenPipeError:
+        # the reader went away (e.g. piped into head): stop, and point stdout at
+        # devnull so Python doesn't fail flushing it at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        summaries.close()  # cancels the chunks which haven't started
+        if output is not sys.stdout:
+            output.close()
+
+
+def main(argv: typing.Sequence[str] | None = None) -> None:
+    """Command line interface, see the module docstring."""
+    parser = argparse.ArgumentParser(
+        prog="python -m crapssim", description="Simulate craps strategies."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate_parser = commands.add_parser(
+        "simulate",
+        help="run many sessions of a strategy",
+        description="Run many sessions of a strategy, writing a row of running "
+        "summary statistics after each chunk of sessions.",
+    )
+    simulate_parser.add_argument(
+        "--strategy",
+        required=True,
+        help="strategy name (e.g. a preset like IronCross), spec file or inline JSON "
+        "spec",
+    )
+    simulate_parser.add_argument(
+        "--param",
+        type=_parameter,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="parameter of the named strategy, the value read as JSON if it can be",
+    )
+    simulate_parser.add_argument("--sessions", type=int, default=1000)
+    simulate_parser.add_argument("--bankroll", type=float, default=100)
+    simulate_parser.add_argument("--max-rolls", type=float, default=float("inf"))
+    simulate_parser.add_argument("--max-shooter", type=float, default=10)
+    simulate_parser.add_argument(
+        "--runout",
+        action="store_true",
+        help="keep rolling past --max-rolls until the player has no bets left",
+    )
+    simulate_parser.add_argument(
+        "--table-settings",
+        help="JSON file or inline JSON of table settings replacing the defaults, "
+        'e.g. \'{"hop_payouts": {"easy": 15, "hard": 30}}\'',
+    )
+    simulate_parser.add_argument("--seed", type=int)
+    simulate_parser.add_argument(
+        "--workers", type=int, help="number of worker processes, defaults to the CPUs"
+    )
+    simulate_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="sessions per chunk, a row is written after each chunk",
+    )
+    simulate_parser.add_argument(
+        "--backend", choices=("process", "thread"), default="process"
+    )
+    simulate_parser.add_argument(
+        "--output", default="-", help="file to write the rows to, defaults to stdout"
+    )
+    simulate_parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    simulate_parser.add_argument(
+        "--progress",
+        type=float,
+        metavar="SECONDS",
+        help="print the progress to stderr every SECONDS",
+    )
+
+    args = parser.parse_args(argv)
+    simulate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 import copy
+import types
 import typing
 from abc import ABC, ABCMeta, abstractmethod
 from dataclasses import dataclass
 from typing import Protocol, TypedDict
 
-from crapssim.dice import Dice
+import numpy as np
+
+from crapssim.dice import OUTCOMES, Dice
 from crapssim.point import Point
 
 __all__ = [
     "BetResult",
+    "PayoffVector",
     "Bet",
     "_WinningLosingNumbersBet",
     "_SimpleBet",
@@ -32,8 +36,11 @@ __all__ = [
     "All",
     "Tall",
     "Small",
+    "get_type_mask",
 ]
-ALL_DICE_NUMBERS = {2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12}
+ALL_DICE_NUMBERS = frozenset({2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12})
+OUTCOME_TOTALS: np.ndarray = OUTCOMES.sum(axis=1)
+"""Dice total for each of the 36 outcomes in crapssim.dice.OUTCOMES"""
 
 
 class TableSettings(TypedDict):
@@ -96,12 +103,122 @@ class BetResult:
             return 0
 
 
+@dataclass(slots=True, frozen=True)
+class PayoffVector:
+    """
+    Represents the outcome of a bet over all 36 possible dice outcomes
+
+    Entries follow the order of crapssim.dice.OUTCOMES. The payoff is for
+    a single roll given the current table state (point, settings, etc.)
+    and is per unit wagered, so it doesn't depend on the bet amount.
+    """
+
+    net: np.ndarray
+    """Net win (positive) or loss (negative) per unit wagered for each outcome."""
+    resolves: np.ndarray
+    """Mask of the outcomes where the bet is resolved and removed from the table."""
+
+    @property
+    def expected_value(self) -> float:
+        """Expected net win per unit wagered for a single roll."""
+        return float(self.net.mean())
+
+    @property
+    def resolve_probability(self) -> float:
+        """Probability that the bet is resolved on a single roll."""
+        return float(self.resolves.mean())
+
+
+def _table_with_outcome(table: "Table", outcome: typing.Iterable[int]) -> "Table":
+    """Shallow copy of the table with the dice showing the given outcome."""
+    outcome_table = copy.copy(table)
+    outcome_table.dice = copy.copy(table.dice)
+    outcome_table.dice.result = tuple(int(x) for x in outcome)
+    return outcome_table
+
+
+_BUILTIN_TYPE_CODES = {
+    name: code
+    for code, name in enumerate(
+        (
+            "Bet",
+            "_WinningLosingNumbersBet",
+            "_SimpleBet",
+            "PassLine",
+            "Come",
+            "DontPass",
+            "DontCome",
+            "Odds",
+            "Place",
+            "Field",
+            "CAndE",
+            "Any7",
+            "Two",
+            "Three",
+            "Yo",
+            "Boxcars",
+            "AnyCraps",
+            "HardWay",
+            "Hop",
+            "Fire",
+            "_ATSBet",
+            "All",
+            "Tall",
+            "Small",
+        )
+    )
+}
+"""The type_code of each Bet class of this module, fixed so the codes (e.g. stored by
+crapssim.kernel) don't depend on the order the classes are defined or imported in.
+New bets get the next code at the end."""
+
+_BET_TYPES: dict[int, type] = {}
+"""Every Bet class by type_code. Bet classes defined outside this module get the codes
+after the built-in ones, in the order they're created."""
+
+
 class _MetaBetABC(ABCMeta):
+    def __init__(cls, name, bases, namespace, **kwargs):
+        # Register an integer type code and bitmasks for fast type checks, since
+        # isinstance checks on ABCs are slow. family_mask has the bit of the class
+        # and of every Bet class it inherits from.
+        super().__init__(name, bases, namespace, **kwargs)
+        if cls.__module__ == __name__ and name in _BUILTIN_TYPE_CODES:
+            cls.type_code = _BUILTIN_TYPE_CODES[name]
+        else:
+            cls.type_code = max(
+                len(_BUILTIN_TYPE_CODES), max(_BET_TYPES, default=-1) + 1
+            )
+        cls.type_mask = 1 << cls.type_code
+        cls.family_mask = cls.type_mask
+        for base in cls.__mro__[1:]:
+            cls.family_mask |= base.__dict__.get("type_mask", 0)
+        _BET_TYPES[cls.type_code] = cls
+
     # Trick to get a bet like `PassLine` to have it's repr be `crapssim.bet.PassLine`
     def __repr__(cls):
         return f"crapssim.bet.{cls.__name__}"
 
 
+def get_type_mask(
+    bet_type: typing.Type["Bet"] | tuple[typing.Type["Bet"], ...],
+) -> int:
+    """
+    Bitmask for the given bet type(s), such that bet.family_mask & mask is
+    non-zero exactly when isinstance(bet, bet_type) would be True.
+
+    Checks of bets from a player read the mask as bet.__class__.family_mask, which
+    is the same for bets, and like isinstance also works for mocks with a bet class
+    spec (e.g. MagicMock(Come)), whose __class__ is the spec.
+    """
+    if isinstance(bet_type, tuple):
+        mask = 0
+        for x in bet_type:
+            mask |= x.type_mask
+        return mask
+    return bet_type.type_mask
+
+
 class Bet(ABC, metaclass=_MetaBetABC):
     """
     A generic bet for the craps table.
@@ -125,6 +242,29 @@ class Bet(ABC, metaclass=_MetaBetABC):
         """
         pass
 
+    def get_payoff_vector(self, table: Table) -> PayoffVector:
+        """
+        Payoff of the bet for each of the 36 dice outcomes.
+
+        This is the net win or loss per unit wagered, along with whether
+        the bet resolves, for the next roll given the table state. By
+        default, a copy of the bet is resolved with get_result for each
+        outcome, so any bet is supported. Subclasses override this with
+        vectorized versions, which must not change the bet's state.
+        """
+        net = np.zeros(len(OUTCOMES))
+        resolves = np.zeros(len(OUTCOMES), dtype=bool)
+        for i, outcome in enumerate(OUTCOMES):
+            unit_bet = copy.deepcopy(self)
+            unit_bet.amount = 1.0
+            result = unit_bet.get_result(_table_with_outcome(table, outcome))
+            if result.won:
+                net[i] = result.amount - unit_bet.amount
+            elif result.lost:
+                net[i] = result.amount
+            resolves[i] = result.remove
+        return PayoffVector(net, resolves)
+
     def update_number(self, table: Table):
         """
         Update the bet's number, if applicable
@@ -234,13 +374,39 @@ class _WinningLosingNumbersBet(Bet, ABC):
 
         return BetResult(result_amount, should_remove)
 
+    def get_payoff_vector(self, table: Table) -> PayoffVector:
+        """Payoff of the bet for each of the 36 dice outcomes, using the
+        winning and losing numbers and the payout ratios.
+        """
+        winning = np.isin(OUTCOME_TOTALS, self.get_winning_numbers(table))
+        losing = np.isin(OUTCOME_TOTALS, self.get_losing_numbers(table)) & ~winning
+        net = np.where(
+            winning, self.get_payout_ratios(table), np.where(losing, -1.0, 0.0)
+        )
+        return PayoffVector(net, winning | losing)
+
+    def get_payout_ratios(self, table: Table) -> np.ndarray:
+        """Returns the payout ratio (X to 1) for each of the 36 dice outcomes.
+
+        Payout ratios can depend on the roll (e.g. Field), so by default the
+        ratio is looked up for each winning number with the dice set to that
+        number. Outcomes that don't win have a ratio of zero.
+        """
+        ratios = np.zeros(len(OUTCOMES))
+        for number in self.get_winning_numbers(table):
+            outcome = OUTCOMES[OUTCOME_TOTALS == number]
+            if len(outcome) > 0:
+                ratio = self.get_payout_ratio(_table_with_outcome(table, outcome[0]))
+                ratios[OUTCOME_TOTALS == number] = ratio
+        return ratios
+
     @abstractmethod
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the winnings numbers, based on table features"""
         pass
 
     @abstractmethod
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the losing numbers, based on table features"""
         pass
 
@@ -258,18 +424,18 @@ class _SimpleBet(_WinningLosingNumbersBet, ABC):
     at instantiation and don't depend on the table.
     """
 
-    winning_numbers: list[int] = []
+    winning_numbers: tuple[int, ...] = ()
     """Winning numbers for the bet"""
-    losing_numbers: list[int] = []
+    losing_numbers: tuple[int, ...] = ()
     """Losing numbers for the bet"""
     payout_ratio: int = 1
     """Payout ratio for the bet"""
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the winning numbers (table not used here)"""
         return self.winning_numbers
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the losing numbers (table not used here)"""
         return self.losing_numbers
 
@@ -277,6 +443,10 @@ class _SimpleBet(_WinningLosingNumbersBet, ABC):
         """Returns the payout ratio (table not used here)"""
         return float(self.payout_ratio)
 
+    def get_payout_ratios(self, table: Table) -> np.ndarray:
+        """Returns the payout ratio for each outcome (the same for all outcomes)"""
+        return np.full(len(OUTCOMES), float(self.payout_ratio))
+
 
 # Passline and related bets ---------------------------------------------------
 
@@ -291,7 +461,7 @@ class PassLine(_WinningLosingNumbersBet):
     the point number again before rolling a 7. Pays 1 to 1.
     """
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Winnings numbers are 7, 11 before point is set,
         and the point number after point is set. Uses table
         to determine the point number and status.
@@ -300,7 +470,7 @@ class PassLine(_WinningLosingNumbersBet):
             return [7, 11]
         return [table.point.number]
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Losing numbers are 2, 3, 12 before point is set,
         and 7 after point is set. Uses table to determine the
         point number and status.
@@ -349,7 +519,7 @@ class Come(_WinningLosingNumbersBet):
         else:
             self.number = None
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Winnings numbers are 7, 11 before the number is set,
         and the number after it is set. Number is stored within
         the bet.
@@ -358,7 +528,7 @@ class Come(_WinningLosingNumbersBet):
             return [7, 11]
         return [self.number]
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Losing numbers are 2, 3, 12 before the number is set,
         and 7 after it is set. Number is stored within
         the bet.
@@ -414,7 +584,7 @@ class DontPass(_WinningLosingNumbersBet):
     Note that a push will keep the bet active and not result in any change to bankroll.
     """
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Winnings numbers are 2 or 3 before point is set,
         and 7 after point is set. Uses table to determine the point
         number and status.
@@ -423,7 +593,7 @@ class DontPass(_WinningLosingNumbersBet):
             return [2, 3]
         return [7]
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Losing numbers are 7 or 11 before point is set,
         and table point number after point is set. Uses table to determine the
         point number and status.
@@ -464,12 +634,12 @@ class DontCome(_WinningLosingNumbersBet):
         else:
             self.number = None
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         if self.number is None:
             return [2, 3]
         return [7]
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         if self.number is None:
             return [7, 11]
         return [self.number]
@@ -501,6 +671,9 @@ class DontCome(_WinningLosingNumbersBet):
 
 # Odds bets -------------------------------------------------------------------
 
+_LIGHT_SIDE_MASK = get_type_mask((PassLine, Come))
+_DARK_SIDE_MASK = get_type_mask((DontPass, DontCome))
+
 
 class Odds(_WinningLosingNumbersBet):
     """
@@ -524,19 +697,19 @@ class Odds(_WinningLosingNumbersBet):
 
     @property
     def light_side(self) -> bool:
-        return issubclass(self.base_type, (PassLine, Come))
+        return bool(self.base_type.family_mask & _LIGHT_SIDE_MASK)
 
     @property
     def dark_side(self) -> bool:
-        return issubclass(self.base_type, (DontPass, DontCome))
+        return bool(self.base_type.family_mask & _DARK_SIDE_MASK)
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         if self.light_side:
             return [self.number]
         elif self.dark_side:
             return [7]
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         if self.light_side:
             return [7]
         elif self.dark_side:
@@ -569,10 +742,11 @@ class Odds(_WinningLosingNumbersBet):
             raise NotImplementedError
 
     def base_amount(self, player: Player):
+        base_mask = self.base_type.type_mask
         base_bets = [
             x
             for x in player.bets
-            if isinstance(x, self.base_type)
+            if x.__class__.family_mask & base_mask
             and x.get_winning_numbers(player.table)
             == self.get_winning_numbers(player.table)
         ]
@@ -601,16 +775,18 @@ class Place(_SimpleBet):
     Remains active until the number or a 7 is rolled.
     """
 
-    payout_ratios = {4: 9 / 5, 5: 7 / 5, 6: 7 / 6, 8: 7 / 6, 9: 7 / 5, 10: 9 / 5}
+    payout_ratios = types.MappingProxyType(
+        {4: 9 / 5, 5: 7 / 5, 6: 7 / 6, 8: 7 / 6, 9: 7 / 5, 10: 9 / 5}
+    )
     """Stores the place bet payouts: 9 to 5 on (4, 10), 7 to 5 on (5, 9), and 7 to 6 on (6, 8)."""
-    losing_numbers: list[int] = [7]
+    losing_numbers: tuple[int, ...] = (7,)
 
     def __init__(self, number: int, amount: typing.SupportsFloat):
         super().__init__(amount)
         self.number = number
         """The placed number, which determines payout ratio"""
         self.payout_ratio = self.payout_ratios[number]
-        self.winning_numbers = [number]
+        self.winning_numbers = (number,)
 
     @property
     def _placed_key(self) -> typing.Hashable:
@@ -633,16 +809,16 @@ class Field(_WinningLosingNumbersBet):
     "field_payouts":, which default to 2 to 1 for (2, 12) and 1 to 1 otherwise.
     """
 
-    winning_numbers = [2, 3, 4, 9, 10, 11, 12]
+    winning_numbers: tuple[int, ...] = (2, 3, 4, 9, 10, 11, 12)
     """Field wins on 2, 3, 4, 9, 10, 11, or 12"""
-    losing_numbers = [5, 6, 7, 8]
+    losing_numbers: tuple[int, ...] = (5, 6, 7, 8)
     """Field loses on 5, 6, 7, or 8"""
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the winning numbers (table not used here)"""
         return self.winning_numbers
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the losing numbers (table not used here)"""
         return self.losing_numbers
 
@@ -654,6 +830,13 @@ class Field(_WinningLosingNumbersBet):
             return float(table.settings["field_payouts"][table.dice.total])
         return 0.0
 
+    def get_payout_ratios(self, table: Table) -> np.ndarray:
+        """Returns the payout ratio for each outcome based on table settings
+        (:func:`~crapssim.table.TableSettings`, "field_payouts")
+        """
+        payouts = table.settings["field_payouts"]
+        return np.array([float(payouts.get(int(x), 0.0)) for x in OUTCOME_TOTALS])
+
 
 class CAndE(_WinningLosingNumbersBet):
     """
@@ -666,16 +849,16 @@ class CAndE(_WinningLosingNumbersBet):
     Loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [2, 3, 11, 12]
+    winning_numbers: tuple[int, ...] = (2, 3, 11, 12)
     """Winning numbers are (2, 3, 11, 12)."""
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {2, 3, 11, 12})
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {2, 3, 11, 12}))
     """Losing numbers are anything besides (2, 3, 11, 12)."""
 
-    def get_winning_numbers(self, table: Table) -> list[int]:
+    def get_winning_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the winning numbers (table not used here)"""
         return self.winning_numbers
 
-    def get_losing_numbers(self, table: Table) -> list[int]:
+    def get_losing_numbers(self, table: Table) -> typing.Sequence[int]:
         """Returns the losing numbers (table not used here)"""
         return self.losing_numbers
 
@@ -700,8 +883,8 @@ class Any7(_SimpleBet):
     Offers a 4 to 1 payout and loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [7]
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {7})
+    winning_numbers: tuple[int, ...] = (7,)
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {7}))
     """Losing number is anything except 7."""
     payout_ratio: int = 4
 
@@ -714,8 +897,8 @@ class Two(_SimpleBet):
     Offers a 30 to 1 payout and loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [2]
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {2})
+    winning_numbers: tuple[int, ...] = (2,)
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {2}))
     """Losing number is anything except 2."""
     payout_ratio: int = 30
 
@@ -728,8 +911,8 @@ class Three(_SimpleBet):
     Offers a 15 to 1 payout and loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [3]
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {3})
+    winning_numbers: tuple[int, ...] = (3,)
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {3}))
     """Losing number is anything except 3."""
     payout_ratio: int = 15
 
@@ -742,8 +925,8 @@ class Yo(_SimpleBet):
     Offers a 15 to 1 payout and loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [11]
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {11})
+    winning_numbers: tuple[int, ...] = (11,)
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {11}))
     """Losing number is anything except 11."""
     payout_ratio: int = 15
 
@@ -756,8 +939,8 @@ class Boxcars(_SimpleBet):
     Offers a 30 to 1 payout and loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [12]
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {12})
+    winning_numbers: tuple[int, ...] = (12,)
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {12}))
     """Losing number is anything except 12."""
     payout_ratio: int = 30
 
@@ -770,8 +953,8 @@ class AnyCraps(_SimpleBet):
     Offers a 7 to 1 payout and loses on all other numbers.
     """
 
-    winning_numbers: list[int] = [2, 3, 12]
-    losing_numbers: list[int] = list(ALL_DICE_NUMBERS - {2, 3, 12})
+    winning_numbers: tuple[int, ...] = (2, 3, 12)
+    losing_numbers: tuple[int, ...] = tuple(sorted(ALL_DICE_NUMBERS - {2, 3, 12}))
     """Losing number is anything except (2, 3, 12)."""
     payout_ratio: int = 7
 
@@ -789,7 +972,7 @@ class HardWay(Bet):
     the number is rolled in a "soft" way.
     """
 
-    payout_ratios = {4: 7, 6: 9, 8: 9, 10: 7}
+    payout_ratios = types.MappingProxyType({4: 7, 6: 9, 8: 9, 10: 7})
     """Payout ratios vary: 7 to 1 for hard 4 or 10, 9 to 1 for hard 6 or 8."""
 
     def __init__(self, number: int, amount: typing.SupportsFloat) -> None:
@@ -809,6 +992,12 @@ class HardWay(Bet):
             should_remove = False
         return BetResult(result_amount, should_remove)
 
+    def get_payoff_vector(self, table: Table) -> PayoffVector:
+        winning = np.all(OUTCOMES == self.winning_result, axis=1)
+        losing = np.isin(OUTCOME_TOTALS, (7, self.number)) & ~winning
+        net = np.where(winning, float(self.payout_ratio), np.where(losing, -1.0, 0.0))
+        return PayoffVector(net, winning | losing)
+
     @property
     def winning_result(self) -> tuple[int, int]:
         """Returns the dice result that wins, e.g. (2, 2) for Hard 4."""
@@ -853,6 +1042,13 @@ class Hop(Bet):
             should_remove = True
         return BetResult(result_amount, should_remove)
 
+    def get_payoff_vector(self, table: Table) -> PayoffVector:
+        winning = np.any(
+            [np.all(OUTCOMES == x, axis=1) for x in self.winning_results], axis=0
+        )
+        net = np.where(winning, float(self.payout_ratio(table)), -1.0)
+        return PayoffVector(net, np.ones(len(OUTCOMES), dtype=bool))
+
     @property
     def is_easy(self) -> bool:
         return self.result[0] != self.result[1]
@@ -899,6 +1095,13 @@ class Fire(Bet):
         self.points_made: set[int] = set()
         self.ended: bool = False
 
+    def __copy__(self) -> "Fire":
+        # copies (e.g. when a strategy places its Fire bet) get their own set of points
+        new_bet = type(self).__new__(type(self))
+        new_bet.__dict__.update(self.__dict__)
+        new_bet.points_made = set(self.points_made)
+        return new_bet
+
     def get_result(self, table: Table) -> BetResult:
 
         if table.point.status == "Off":
@@ -922,6 +1125,22 @@ class Fire(Bet):
 
         return BetResult(result_amount, remove=ended)
 
+    def get_payoff_vector(self, table: Table) -> PayoffVector:
+        if table.point.status == "Off":
+            return PayoffVector(
+                np.zeros(len(OUTCOMES)), np.zeros(len(OUTCOMES), dtype=bool)
+            )
+
+        n_points_made = np.full(len(OUTCOMES), len(self.points_made))
+        n_points_made[OUTCOME_TOTALS == table.point.number] = len(
+            self.points_made | {table.point.number}
+        )
+        ended = (OUTCOME_TOTALS == 7) | (n_points_made == 6)
+
+        payouts = table.settings["fire_payouts"]
+        ratios = np.array([float(payouts.get(int(x), -1.0)) for x in n_points_made])
+        return PayoffVector(np.where(ended, ratios, 0.0), ended)
+
     def is_removable(self, table: Table) -> bool:
         """Fire bet is removable only if there is a new shooter.
 
@@ -945,19 +1164,26 @@ class Fire(Bet):
 class _ATSBet(Bet):
     """Class representing ATS (All, Tall, Small) bets, not a usable bet by itself."""
 
-    numbers: list[int] = []
+    numbers: frozenset[int] = frozenset()
     type: str = "_ATSBet"
 
     def __init__(self, amount: float):
         super().__init__(amount)
         self.rolled_numbers: set[int] = set()
 
+    def __copy__(self) -> "_ATSBet":
+        # copies (e.g. when a strategy places its bet) get their own set of numbers
+        new_bet = type(self).__new__(type(self))
+        new_bet.__dict__.update(self.__dict__)
+        new_bet.rolled_numbers = set(self.rolled_numbers)
+        return new_bet
+
     def get_result(self, table: Table) -> BetResult:
 
         if table.dice.total in self.numbers:
             self.rolled_numbers.add(table.dice.total)
 
-        if self.numbers == list(self.rolled_numbers):
+        if self.rolled_numbers == self.numbers:
             payout_ratio = table.settings["ATS_payouts"][self.type]
             result_amount = payout_ratio * self.amount + self.amount
             should_remove = True
@@ -970,6 +1196,18 @@ class _ATSBet(Bet):
 
         return BetResult(result_amount, should_remove)
 
+    def get_payoff_vector(self, table: Table) -> PayoffVector:
+        missing = set(self.numbers) - self.rolled_numbers
+        if len(missing) == 1:
+            winning = OUTCOME_TOTALS == next(iter(missing))
+        else:
+            winning = np.full(len(OUTCOMES), len(missing) == 0)
+        losing = (OUTCOME_TOTALS == 7) & ~winning
+
+        payout_ratio = float(table.settings["ATS_payouts"][self.type])
+        net = np.where(winning, payout_ratio, np.where(losing, -1.0, 0.0))
+        return PayoffVector(net, winning | losing)
+
     def is_removable(self, table: Table) -> bool:
         """All/Tall/Small bets are removable only if there is a new shooter.
 
@@ -998,7 +1236,7 @@ class All(_ATSBet):
     """
 
     type: str = "all"
-    numbers: list[int] = [2, 3, 4, 5, 6, 8, 9, 10, 11, 12]
+    numbers: frozenset[int] = frozenset({2, 3, 4, 5, 6, 8, 9, 10, 11, 12})
 
 
 class Tall(_ATSBet):
@@ -1012,7 +1250,7 @@ class Tall(_ATSBet):
     """
 
     type: str = "tall"
-    numbers: list[int] = [8, 9, 10, 11, 12]
+    numbers: frozenset[int] = frozenset({8, 9, 10, 11, 12})
 
 
 class Small(_ATSBet):
@@ -1026,4 +1264,4 @@ class Small(_ATSBet):
     """
 
     type: str = "small"
-    numbers: list[int] = [2, 3, 4, 5, 6]
+    numbers: frozenset[int] = frozenset({2, 3, 4, 5, 6})
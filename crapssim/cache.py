@@ -0,0 +1,228 @@
+"""
+On-disk cache of simulation results, so running the same simulation again (in another
+notebook, service or process) loads its results instead of running the sessions.
+
+Entries are content addressed: the key of a simulation is the SHA-256 hash of its
+canonical configuration (the repr of the strategy, the bankroll, the limits of the
+sessions, the table settings with the defaults filled in, the seed, the number of
+sessions) and the crapssim version, so results of an older version of the simulator
+are never returned. Strategies whose repr isn't stable (e.g. an AddIfTrue with a
+lambda key, whose repr has its address) simply miss the cache.
+
+The cache is safe to share between processes without locks: each entry is written to
+a temporary file and renamed into place, so readers see a whole entry or none, and
+writers of the same key write the same results. Reading an entry marks it as used,
+and storing an entry evicts the least recently used entries until the cache is under
+its size limit. An entry evicted while another process is reading it stays readable
+by that process.
+"""
+
+import hashlib
+import io
+import json
+import os
+import pathlib
+import typing
+
+import numpy as np
+
+import crapssim
+from crapssim.simulation import Simulation, _write_atomic
+from crapssim.table import Table
+
+__all__ = ["ResultCache", "simulation_key"]
+
+_SUFFIX = ".npz"
+
+
+def _canonical_settings(settings: typing.Mapping | None) -> typing.Any:
+    """The complete table settings as sorted lists of [key, value] pairs, so leaving
+    out a default setting and giving it explicitly have the same key."""
+    complete = Table().settings | dict(settings or {})
+
+    def canonical(value: typing.Any) -> typing.Any:
+        if isinstance(value, typing.Mapping):
+            return sorted([str(k), canonical(v)] for k, v in value.items())
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        return value
+
+    return canonical(complete)
+
+
+def simulation_key(simulation: Simulation, kind: str = "run", **extra) -> str:
+    """
+    Cache key of the results of a simulation.
+
+    Parameters
+    ----------
+    simulation
+        The simulation.
+    kind
+        What the results are, e.g. "run" for the results of each session or "summary"
+        for the summary statistics.
+    **extra
+        Other settings the results depend on, e.g. the chunk size of a summary.
+
+    Returns
+    -------
+    The hex digest of the SHA-256 hash of the canonical configuration.
+    """
+    return hashlib.sha256(_configuration(simulation, kind, extra).encode()).hexdigest()
+
+
+def _configuration(simulation: Simulation, kind: str, extra: dict) -> str:
+    """The canonical JSON of the configuration of the simulation's results."""
+    configuration = {
+        "version": crapssim.__version__,
+        "kind": kind,
+        "strategy": repr(simulation.strategy),
+        "n_sessions": simulation.n_sessions,
+        "bankroll": float(simulation.bankroll),
+        "max_rolls": float(simulation.max_rolls),
+        "max_shooter": float(simulation.max_shooter),
+        "runout": bool(simulation.runout),
+        "table_settings": _canonical_settings(simulation.table_settings),
+        "seed": int(simulation.seed),
+        "extra": extra,
+    }
+    # infinite limits are written as Infinity, which is fine for hashing
+    return json.dumps(configuration, sort_keys=True, separators=(",", ":"))
+
+
+class ResultCache:
+    """
+    Directory of cached simulation results, each a set of named NumPy arrays, with the
+    total size kept under a limit by evicting the least recently used entries.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 2**30):
+        """Open the cache, creating the directory if it doesn't exist.
+
+        Parameters
+        ----------
+        directory
+            The directory of the cache, which can be shared by many processes.
+        max_bytes
+            Maximum total size of the entries. Storing an entry evicts the least
+            recently used ones (possibly the new one, if it's bigger than this on its
+            own) until the cache is under the limit.
+        """
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> list[tuple[float, int, pathlib.Path]]:
+        """(last use, size, path) of each entry, skipping entries removed by other
+        processes while listing."""
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def load(
+        self, simulation: Simulation, kind: str = "run", **extra
+    ) -> dict[str, np.ndarray] | None:
+        """
+        The cached results of a simulation, marking them as used.
+
+        Parameters
+        ----------
+        simulation
+            The simulation.
+        kind, **extra
+            What the results are, see simulation_key.
+
+        Returns
+        -------
+        The arrays stored for the simulation, or None if they aren't in the cache.
+        """
+        configuration = _configuration(simulation, kind, extra)
+        path = self._path(hashlib.sha256(configuration.encode()).hexdigest())
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:  # not cached, or evicted by another process
+            return None
+        try:
+            os.utime(path)  # the modification time is the time of the last use
+        except FileNotFoundError:
+            pass
+        try:
+            with np.load(io.BytesIO(data)) as entry:
+                arrays = {x: entry[x] for x in entry.files}
+        except (OSError, ValueError, EOFError):  # damaged, e.g. by a full disk
+            self._remove(path)
+            return None
+        if str(arrays.pop("configuration")) != configuration:  # hash collision
+            return None
+        return arrays
+
+    def store(
+        self,
+        simulation: Simulation,
+        arrays: typing.Mapping[str, np.ndarray],
+        kind: str = "run",
+        **extra,
+    ) -> None:
+        """
+        Store the results of a simulation, then evict the least recently used entries
+        if the cache is over its size limit.
+
+        Parameters
+        ----------
+        simulation
+            The simulation.
+        arrays
+            The results to store, by name.
+        kind, **extra
+            What the results are, see simulation_key.
+        """
+        configuration = _configuration(simulation, kind, extra)
+        data = io.BytesIO()
+        np.savez(data, configuration=configuration, **arrays)
+        key = hashlib.sha256(configuration.encode()).hexdigest()
+        _write_atomic(self._path(key), data.getvalue())
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache is under its size
+        limit."""
+        entries = sorted(self._entries(), key=lambda x: x[0])
+        size = sum(x[1] for x in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            self._remove(path)
+            size -= entry_size
+
+    @staticmethod
+    def _remove(path: pathlib.Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:  # removed by another process
+            pass
+
+    @property
+    def size(self) -> int:
+        """Total size of the entries in bytes."""
+        return sum(x[1] for x in self._entries())
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __contains__(self, simulation: Simulation) -> bool:
+        """Whether the results of each session of the simulation are cached."""
+        return self._path(simulation_key(simulation)).exists()
@@ -9,6 +9,11 @@ import typing
 
 import numpy as np
 
+OUTCOMES: np.ndarray = np.array(
+    [(d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)]
+)
+"""All 36 equally likely outcomes of two dice, from (1, 1), (1, 2), ... to (6, 6)"""
+
 
 class Dice:
     """
@@ -0,0 +1,419 @@
+"""
+Spread the sessions of a simulation over many machines with only a shared directory.
+plan writes a manifest splitting the sessions into shards (ranges of session numbers,
+and so of child seeds of the root seed), any number of workers on any machines then
+run work on the directory, each claiming shards by creating their lock files (which
+only one worker can create) and writing a result file for each shard, and merge
+combines the results of all the shards.
+
+The results don't depend on which worker ran which shard, since session i always uses
+the dice of child i of the root seed like crapssim.simulation.Simulation, and the
+shard results are merged in shard order.
+
+From the command line:
+
+    python -m crapssim.farm plan runs/ironcross --strategy ironcross.json --sessions 1000000
+    python -m crapssim.farm work runs/ironcross   # on each machine, as many as wanted
+    python -m crapssim.farm merge runs/ironcross
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import json
+import math
+import os
+import pathlib
+import socket
+import sys
+import threading
+import time
+import typing
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+
+from crapssim.simulation import _summarize_sessions, _write_atomic
+from crapssim.strategy.spec import load_spec, spec_hash, strategy_from_spec
+from crapssim.sweep import SessionSummary
+
+__all__ = ["Manifest", "Shard", "main", "merge", "plan", "work"]
+
+MANIFEST = "manifest.json"
+
+
+@dataclass(slots=True, frozen=True)
+class Shard:
+    """A range of sessions of a simulation, run by one worker at a time."""
+
+    id: int
+    """Number of the shard."""
+    start: int
+    """First session of the shard."""
+    stop: int
+    """One past the last session of the shard."""
+
+    @property
+    def name(self) -> str:
+        """Name of the shard's lock and result files, without the extension."""
+        return f"shard-{self.id:06d}"
+
+
+@dataclass(slots=True, frozen=True)
+class Manifest:
+    """The settings of a simulation and its shards, stored as manifest.json."""
+
+    strategy: typing.Any
+    """The strategy spec (see crapssim.strategy.spec)."""
+    n_sessions: int
+    """Total number of sessions."""
+    bankroll: float
+    """The starting bankroll of the player in each session."""
+    max_rolls: float
+    """Maximum number of rolls of each session."""
+    max_shooter: float
+    """Maximum number of shooters of each session."""
+    seed: int
+    """Root seed of the dice."""
+    shards: tuple[Shard, ...]
+    """The shards of the sessions, in order."""
+
+    @property
+    def spec_hash(self) -> str:
+        """Hash of the strategy spec, recorded in each shard result."""
+        return spec_hash(self.strategy)
+
+    def to_json(self) -> str:
+        """The manifest as JSON, with infinite maximums as null."""
+        data = dataclasses.asdict(self)
+        # JSON has no infinity
+        for name in ("max_rolls", "max_shooter"):
+            data[name] = None if math.isinf(data[name]) else data[name]
+        data["shards"] = [[x.start, x.stop] for x in self.shards]
+        return json.dumps(data, indent=2)
+
+    @classmethod
+    def from_json(cls, text: str) -> "Manifest":
+        """The manifest from its JSON."""
+        data = json.loads(text)
+        for name in ("max_rolls", "max_shooter"):
+            data[name] = math.inf if data[name] is None else data[name]
+        data["shards"] = tuple(
+            Shard(i, start, stop) for i, (start, stop) in enumerate(data["shards"])
+        )
+        return cls(**data)
+
+    @classmethod
+    def load(cls, directory: str | os.PathLike) -> "Manifest":
+        """The manifest of the simulation in the directory."""
+        return cls.from_json((pathlib.Path(directory) / MANIFEST).read_text())
+
+
+def _lock_state(lock: pathlib.Path) -> tuple[float, str] | None:
+    """The (modification time, owner) of a lock file, or None if there's no lock."""
+    try:
+        return lock.stat().st_mtime, lock.read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _take_over(lock: pathlib.Path, state: tuple[float, str]) -> bool:
+    """Move a stale lock with the given state out of the way, returning False if the
+    lock changed first. Only one of the workers taking over the lock can rename it,
+    but what it renames may already be the new lock of a worker that took it over
+    first, or have just been touched by its owner: then it's put back."""
+    moved = lock.with_name(f".{lock.name}.{uuid.uuid4().hex}.stale")
+    try:
+        os.rename(lock, moved)
+    except FileNotFoundError:
+        return False
+    if _lock_state(moved) == state:
+        return True
+    try:
+        os.link(moved, lock)  # the same file, so its owner and time are kept
+    except OSError:  # another worker has created the lock since
+        pass
+    moved.unlink()
+    return False
+
+
+def _claim(lock: pathlib.Path, stale_after: float | None) -> bool:
+    """Create the lock file, returning False if another worker holds it. A lock
+    untouched for stale_after seconds (of a worker that died) is taken over."""
+    owner = f"{socket.gethostname()} {os.getpid()} {time.time()} {uuid.uuid4().hex}\n"
+    for _ in range(2):
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if stale_after is None:
+                return False
+            state = _lock_state(lock)
+            if state is None:
+                continue
+            if time.time() - state[0] < stale_after or not _take_over(lock, state):
+                return False
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(owner)
+        return True
+    return False
+
+
+@contextlib.contextmanager
+def _heartbeat(lock: pathlib.Path, interval: float) -> typing.Iterator[None]:
+    """Touch the lock file every interval seconds from a thread while the shard runs, so
+    workers don't take it for the lock of a worker that died."""
+    stopped = threading.Event()
+
+    def touch() -> None:
+        while not stopped.wait(interval):
+            try:
+                os.utime(lock)
+            except FileNotFoundError:  # taken over after all
+                return
+
+    thread = threading.Thread(target=touch, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def plan(
+    directory: str | os.PathLike,
+    strategy: typing.Any,
+    n_sessions: int,
+    shard_size: int = 1000,
+    bankroll: float = 100,
+    max_rolls: float = float("inf"),
+    max_shooter: float = 10,
+    seed: int | None = None,
+) -> Manifest:
+    """
+    Split a simulation into shards, writing its manifest into the directory.
+
+    Parameters
+    ----------
+    directory
+        The directory for the manifest, locks and results, created if it doesn't
+        exist. Must be on a filesystem shared by all the workers.
+    strategy
+        The strategy spec (see crapssim.strategy.spec) of the player.
+    n_sessions
+        Total number of sessions.
+    shard_size
+        Number of sessions of each shard.
+    bankroll
+        The starting bankroll of the player in each session.
+    max_rolls
+        Maximum number of rolls of each session.
+    max_shooter
+        Maximum number of shooters of each session.
+    seed
+        Root seed of the dice, if None a random seed is used.
+
+    Returns
+    -------
+    The Manifest written.
+
+    Raises
+    ------
+    FileExistsError
+        If the directory already has a manifest.
+    """
+    strategy_from_spec(strategy, compile=False)  # fail now for bad specs
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    shards = tuple(
+        Shard(i, start, min(start + shard_size, n_sessions))
+        for i, start in enumerate(range(0, n_sessions, shard_size))
+    )
+    manifest = Manifest(
+        strategy, n_sessions, bankroll, max_rolls, max_shooter, seed, shards
+    )
+
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / MANIFEST
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+    _write_atomic(path, manifest.to_json())
+    return manifest
+
+
+def work(
+    directory: str | os.PathLike,
+    max_shards: float = float("inf"),
+    stale_after: float | None = None,
+    heartbeat: float = 10,
+) -> list[int]:
+    """
+    Run shards of the simulation in the directory until none are left to claim.
+
+    Parameters
+    ----------
+    directory
+        The directory with the manifest from plan.
+    max_shards
+        Maximum number of shards to run.
+    stale_after
+        Seconds without a heartbeat after which the lock of a shard without a result is
+        assumed to belong to a worker which died, and the shard is run again. If None,
+        locked shards are never taken over. Should be a few times the heartbeat of
+        all the workers.
+    heartbeat
+        Seconds between touches of the lock of the shard being run, which show the
+        other workers this one is alive.
+
+    Returns
+    -------
+    The ids of the shards run.
+    """
+    directory = pathlib.Path(directory)
+    manifest = Manifest.load(directory)
+    strategy = strategy_from_spec(manifest.strategy)
+    settings = (
+        strategy,
+        manifest.bankroll,
+        manifest.max_rolls,
+        manifest.max_shooter,
+        manifest.seed,
+        False,  # no runout
+        None,  # default table settings
+    )
+
+    done = []
+    for shard in manifest.shards:
+        if len(done) >= max_shards:
+            break
+        result = directory / f"{shard.name}.json"
+        lock = directory / f"{shard.name}.lock"
+        if result.exists() or not _claim(lock, stale_after):
+            continue
+        if result.exists():  # finished by a worker whose stale lock was taken over
+            continue
+
+        with _heartbeat(lock, heartbeat):
+            summary = _summarize_sessions(*settings, shard.start, shard.stop)
+        data = {
+            "shard": shard.id,
+            "start": shard.start,
+            "stop": shard.stop,
+            "spec_hash": manifest.spec_hash,
+            "summary": dataclasses.asdict(summary),
+        }
+        _write_atomic(result, json.dumps(data))
+        done.append(shard.id)
+    return done
+
+
+def merge(directory: str | os.PathLike) -> SessionSummary:
+    """
+    Combine the results of all the shards of the simulation in the directory.
+
+    Parameters
+    ----------
+    directory
+        The directory with the manifest from plan and the shard results from work.
+
+    Returns
+    -------
+    The SessionSummary of all the sessions.
+
+    Raises
+    ------
+    ValueError
+        If any shard doesn't have a result yet, or a result is for another strategy.
+    """
+    directory = pathlib.Path(directory)
+    manifest = Manifest.load(directory)
+    missing = [
+        x.id for x in manifest.shards if not (directory / f"{x.name}.json").exists()
+    ]
+    if len(missing) > 0:
+        raise ValueError(f"{len(missing)} shards have no result yet: {missing[:10]}")
+
+    summary = SessionSummary.from_sessions([], [], 0)
+    for shard in manifest.shards:
+        data = json.loads((directory / f"{shard.name}.json").read_text())
+        if data["spec_hash"] != manifest.spec_hash:
+            raise ValueError(f"Result of {shard.name} is for a different strategy")
+        summary = summary.merge(SessionSummary(**data["summary"]))
+    return summary
+
+
+def main(argv: typing.Sequence[str] | None = None) -> None:
+    """Command line interface, see the module docstring."""
+    parser = argparse.ArgumentParser(
+        prog="python -m crapssim.farm",
+        description="Run a simulation over many workers sharing a directory.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = commands.add_parser("plan", help="split a simulation into shards")
+    plan_parser.add_argument("directory")
+    plan_parser.add_argument(
+        "--strategy", required=True, help="JSON or YAML strategy spec file"
+    )
+    plan_parser.add_argument("--sessions", type=int, required=True)
+    plan_parser.add_argument("--shard-size", type=int, default=1000)
+    plan_parser.add_argument("--bankroll", type=float, default=100)
+    plan_parser.add_argument("--max-rolls", type=float, default=float("inf"))
+    plan_parser.add_argument("--max-shooter", type=float, default=10)
+    plan_parser.add_argument("--seed", type=int)
+
+    work_parser = commands.add_parser("work", help="run shards until none are left")
+    work_parser.add_argument("directory")
+    work_parser.add_argument("--max-shards", type=int, default=float("inf"))
+    work_parser.add_argument(
+        "--stale-after",
+        type=float,
+        help="seconds without a heartbeat after which locks of unfinished shards are "
+        "taken over",
+    )
+    work_parser.add_argument(
+        "--heartbeat",
+        type=float,
+        default=10,
+        help="seconds between touches of the lock of the shard being run",
+    )
+
+    merge_parser = commands.add_parser("merge", help="combine the shard results")
+    merge_parser.add_argument("directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "plan":
+        manifest = plan(
+            args.directory,
+            load_spec(args.strategy),
+            args.sessions,
+            args.shard_size,
+            args.bankroll,
+            args.max_rolls,
+            args.max_shooter,
+            args.seed,
+        )
+        print(f"Planned {len(manifest.shards)} shards with seed {manifest.seed}")
+    elif args.command == "work":
+        done = work(args.directory, args.max_shards, args.stale_after, args.heartbeat)
+        print(f"Ran {len(done)} shards")
+    else:
+        try:
+            summary = merge(args.directory)
+        except ValueError as e:
+            sys.exit(str(e))
+        data = dataclasses.asdict(summary)
+        data |= {
+            "win_rate": summary.win_rate,
+            "ruin_rate": summary.ruin_rate,
+            "mean_rolls": summary.mean_rolls,
+            "standard_error": summary.standard_error,
+        }
+        print(json.dumps(data, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Vectorized resolution of many bets at once, for batch simulation. Bets are
+stored as a structure of arrays (BetArrays), and resolve_bets resolves all of
+them against the dice of their tables in a single NumPy pass, giving the same
+results as calling get_result on each of the bets.
+"""
+
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from crapssim.bet import (
+    All,
+    Any7,
+    AnyCraps,
+    Bet,
+    Boxcars,
+    CAndE,
+    Come,
+    DontCome,
+    DontPass,
+    Field,
+    Fire,
+    HardWay,
+    Hop,
+    Odds,
+    PassLine,
+    Place,
+    Small,
+    Tall,
+    Three,
+    Two,
+    Yo,
+    _ATSBet,
+    _BET_TYPES,
+    get_type_mask,
+)
+from crapssim.table import TableSettings
+
+__all__ = ["BetArrays", "BetArraysResult", "resolve_bets"]
+
+_SIMPLE_BETS = (Any7, Two, Three, Yo, Boxcars, AnyCraps)
+_ATS_BETS = (All, Tall, Small)
+SUPPORTED_BETS: tuple[typing.Type[Bet], ...] = (
+    PassLine,
+    Come,
+    DontPass,
+    DontCome,
+    Odds,
+    Place,
+    Field,
+    CAndE,
+    HardWay,
+    Hop,
+    Fire,
+    *_SIMPLE_BETS,
+    *_ATS_BETS,
+)
+"""Bets that can be resolved by the kernel (exactly these classes, not subclasses)"""
+
+_LIGHT_SIDE_MASK = get_type_mask((PassLine, Come))
+_DARK_SIDE_MASK = get_type_mask((DontPass, DontCome))
+_POPCOUNT = np.array([bin(x).count("1") for x in range(1 << 13)])
+
+
+def _bits(numbers: typing.Iterable[int]) -> int:
+    """Bit flags for the given dice totals (bit n is set for total n)."""
+    bits = 0
+    for number in numbers:
+        bits |= 1 << number
+    return bits
+
+
+def _hop_number(result: tuple[int, int]) -> int:
+    """Encode a Hop result, e.g. (2, 5) as 25."""
+    return 10 * result[0] + result[1]
+
+
+@dataclass(slots=True)
+class BetArrays:
+    """
+    Bets stored as a structure of arrays, one entry per bet.
+
+    Bets are described by their type_code (see crapssim.bet.Bet), number and
+    amount, along with the type_code of the base bet for Odds, the state of
+    stateful bets, and the index of the table the bet is on.
+    """
+
+    type_code: np.ndarray
+    """Type code of the bet class."""
+    number: np.ndarray
+    """Number of the bet (Place, HardWay, Come, DontCome, Odds), 0 if there is none.
+    Hop bets store their result, e.g. 25 for (2, 5)."""
+    amount: np.ndarray
+    """Wagered amount for the bet."""
+    base_type: np.ndarray
+    """Type code of the base bet for Odds bets, -1 otherwise."""
+    state: np.ndarray
+    """Bit flags of the points made for Fire bets, or the numbers rolled for
+    All/Tall/Small bets, 0 otherwise."""
+    table: np.ndarray
+    """Index of the table the bet is on."""
+
+    def __len__(self) -> int:
+        return len(self.type_code)
+
+    @classmethod
+    def from_bets(
+        cls, bets: typing.Sequence[Bet], table: typing.Sequence[int] | None = None
+    ) -> "BetArrays":
+        """
+        Create the arrays from Bet objects.
+
+        Parameters
+        ----------
+        bets
+            The bets to store, which must be one of the SUPPORTED_BETS.
+        table
+            Index of the table for each bet, defaults to all bets on table 0.
+        """
+        n = len(bets)
+        type_code = np.zeros(n, dtype=np.int64)
+        number = np.zeros(n, dtype=np.int64)
+        amount = np.zeros(n, dtype=np.float64)
+        base_type = np.full(n, -1, dtype=np.int64)
+        state = np.zeros(n, dtype=np.int64)
+
+        for i, bet in enumerate(bets):
+            if type(bet) not in SUPPORTED_BETS:
+                raise NotImplementedError(
+                    f"{type(bet).__name__} can't be resolved by the kernel"
+                )
+            type_code[i] = bet.type_code
+            amount[i] = bet.amount
+            if isinstance(bet, Hop):
+                number[i] = _hop_number(bet.result)
+            elif getattr(bet, "number", None) is not None:
+                number[i] = bet.number
+            if isinstance(bet, Odds):
+                base_type[i] = bet.base_type.type_code
+            elif isinstance(bet, Fire):
+                state[i] = _bits(bet.points_made)
+            elif isinstance(bet, _ATSBet):
+                state[i] = _bits(bet.rolled_numbers)
+
+        if table is None:
+            table = np.zeros(n, dtype=np.int64)
+        return cls(type_code, number, amount, base_type, state, np.asarray(table))
+
+
+@dataclass(slots=True, frozen=True)
+class BetArraysResult:
+    """Results of resolving BetArrays, one entry per bet (see BetResult)."""
+
+    amount: np.ndarray
+    """Result amount, as in BetResult.amount."""
+    remove: np.ndarray
+    """Flag indicating whether the bet should be removed from the table."""
+    state: np.ndarray
+    """New state of the bets after the roll (see BetArrays.state)."""
+
+
+def resolve_bets(
+    bets: BetArrays,
+    dice: np.ndarray,
+    point: np.ndarray,
+    settings: TableSettings,
+) -> BetArraysResult:
+    """
+    Resolve all the bets against the dice of their tables.
+
+    Parameters
+    ----------
+    bets
+        The bets to resolve.
+    dice
+        Dice result for each table, with shape (n_tables, 2).
+    point
+        Point number for each table, 0 if the point is Off.
+    settings
+        Table settings for the payouts, shared by all the tables.
+
+    Returns
+    -------
+    The result amounts, remove flags, and new states of the bets, which are
+    the same as calling get_result on each bet.
+    """
+    dice = np.asarray(dice)
+    d1 = dice[bets.table, 0]
+    d2 = dice[bets.table, 1]
+    total = d1 + d2
+    table_point = np.asarray(point)[bets.table]
+    code = bets.type_code
+    number = bets.number
+    amount = bets.amount
+
+    # Most bets win and lose on dice totals; keep bit flags of those totals
+    win_bits = np.zeros(len(bets), dtype=np.int64)
+    lose_bits = np.zeros(len(bets), dtype=np.int64)
+    ratio = np.zeros(len(bets), dtype=np.float64)
+    handled = np.zeros(len(bets), dtype=bool)
+
+    def select(bet_type: typing.Type[Bet]) -> np.ndarray:
+        is_type = code == bet_type.type_code
+        handled[is_type] = True
+        return is_type
+
+    for bet_type, line_numbers, point_numbers in (
+        (PassLine, table_point, ((7, 11), (2, 3, 12))),
+        (Come, number, ((7, 11), (2, 3, 12))),
+        (DontPass, table_point, ((2, 3), (7, 11))),
+        (DontCome, number, ((2, 3), (7, 11))),
+    ):
+        is_type = select(bet_type)
+        come_out = is_type & (line_numbers == 0)
+        win_bits[come_out] = _bits(point_numbers[0])
+        lose_bits[come_out] = _bits(point_numbers[1])
+        has_number = is_type & (line_numbers != 0)
+        number_bits = np.left_shift(1, line_numbers[has_number])
+        if bet_type in (PassLine, Come):
+            win_bits[has_number] = number_bits
+            lose_bits[has_number] = 1 << 7
+        else:
+            win_bits[has_number] = 1 << 7
+            lose_bits[has_number] = number_bits
+        ratio[is_type] = 1.0
+
+    is_odds = select(Odds)
+    for side_mask, side_base in (
+        (_LIGHT_SIDE_MASK, PassLine),
+        (_DARK_SIDE_MASK, DontPass),
+    ):
+        side_codes = [x for x, y in _BET_TYPES.items() if y.family_mask & side_mask]
+        side = is_odds & np.isin(bets.base_type, side_codes)
+        ratios = np.zeros(11)
+        for n in (4, 5, 6, 8, 9, 10):
+            ratios[n] = Odds(side_base, n, 1).get_payout_ratio(None)
+        ratio[side] = ratios[number[side]]
+        if side_base is PassLine:
+            win_bits[side] = np.left_shift(1, number[side])
+            lose_bits[side] = 1 << 7
+        else:
+            win_bits[side] = 1 << 7
+            lose_bits[side] = np.left_shift(1, number[side])
+
+    is_place = select(Place)
+    place_ratios = np.zeros(11)
+    for n, x in Place.payout_ratios.items():
+        place_ratios[n] = float(x)
+    win_bits[is_place] = np.left_shift(1, number[is_place])
+    lose_bits[is_place] = _bits(Place.losing_numbers)
+    ratio[is_place] = place_ratios[number[is_place]]
+
+    is_field = select(Field)
+    field_ratios = np.zeros(13)
+    for n, x in settings["field_payouts"].items():
+        field_ratios[n] = float(x)
+    win_bits[is_field] = _bits(Field.winning_numbers)
+    lose_bits[is_field] = _bits(Field.losing_numbers)
+    ratio[is_field] = field_ratios[total[is_field]]
+
+    is_c_and_e = select(CAndE)
+    win_bits[is_c_and_e] = _bits(CAndE.winning_numbers)
+    lose_bits[is_c_and_e] = _bits(CAndE.losing_numbers)
+    ratio[is_c_and_e] = np.where(total[is_c_and_e] == 11, 7.0, 3.0)
+
+    for bet_type in _SIMPLE_BETS:
+        is_type = select(bet_type)
+        win_bits[is_type] = _bits(bet_type.winning_numbers)
+        lose_bits[is_type] = _bits(bet_type.losing_numbers)
+        ratio[is_type] = float(bet_type.payout_ratio)
+
+    win = (np.right_shift(win_bits, total) & 1).astype(bool)
+    lose = ~win & (np.right_shift(lose_bits, total) & 1).astype(bool)
+
+    is_hard_way = select(HardWay)
+    hard_way_ratios = np.zeros(11)
+    for n, x in HardWay.payout_ratios.items():
+        hard_way_ratios[n] = x
+    hard_win = is_hard_way & (d1 == d2) & (d1 + d2 == number)
+    win[is_hard_way] = hard_win[is_hard_way]
+    lose[is_hard_way] = (~hard_win & ((total == 7) | (total == number)))[is_hard_way]
+    ratio[is_hard_way] = hard_way_ratios[number[is_hard_way]]
+
+    is_hop = select(Hop)
+    hop_win = is_hop & (10 * np.minimum(d1, d2) + np.maximum(d1, d2) == number)
+    win[is_hop] = hop_win[is_hop]
+    lose[is_hop] = ~hop_win[is_hop]
+    hop_hard = number // 10 == number % 10
+    ratio[is_hop] = np.where(
+        hop_hard, settings["hop_payouts"]["hard"], settings["hop_payouts"]["easy"]
+    )[is_hop]
+
+    result_amount = np.where(
+        win, ratio * amount + amount, np.where(lose, -1 * amount, 0.0)
+    )
+    remove = win | lose
+    state = bets.state.copy()
+
+    # Fire: tracks the points made until the shooter sevens out
+    is_fire = select(Fire)
+    fire_on = is_fire & (table_point != 0)
+    point_made = fire_on & (total == table_point)
+    state[point_made] |= np.left_shift(1, table_point[point_made])
+    n_points_made = _POPCOUNT[state & ((1 << 13) - 1)]
+    ended = fire_on & ((total == 7) | (n_points_made == 6))
+    fire_ratios = np.full(7, np.nan)
+    for n, x in settings["fire_payouts"].items():
+        fire_ratios[n] = x
+    fire_ratio = fire_ratios[np.minimum(n_points_made, 6)]
+    fire_paid = ended & ~np.isnan(fire_ratio)
+    result_amount[is_fire] = 0.0
+    result_amount[fire_paid] = (fire_ratio * amount + amount)[fire_paid]
+    result_amount[ended & ~fire_paid] = (-1 * amount)[ended & ~fire_paid]
+    remove[is_fire] = ended[is_fire]
+
+    # All/Tall/Small: tracks the numbers rolled until a 7
+    for bet_type in _ATS_BETS:
+        is_type = select(bet_type)
+        numbers_bits = _bits(bet_type.numbers)
+        rolled = is_type & ((np.right_shift(numbers_bits, total) & 1) == 1)
+        state[rolled] |= np.left_shift(1, total[rolled])
+        ats_win = is_type & (state == numbers_bits)
+        ats_lose = is_type & ~ats_win & (total == 7)
+        ats_ratio = float(settings["ATS_payouts"][bet_type.type])
+        result_amount[is_type] = 0.0
+        result_amount[ats_win] = (ats_ratio * amount + amount)[ats_win]
+        result_amount[ats_lose] = (-1 * amount)[ats_lose]
+        remove[is_type] = (ats_win | ats_lose)[is_type]
+
+    if not handled.all():
+        unknown = {_BET_TYPES[x].__name__ for x in code[~handled]}
+        raise NotImplementedError(f"{unknown} can't be resolved by the kernel")
+
+    return BetArraysResult(result_amount, remove, state)
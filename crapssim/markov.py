@@ -0,0 +1,479 @@
+"""
+Exact analysis of bets by modelling the life of a bet as an absorbing Markov
+chain. The states of the chain are the table point together with the internal
+state of the bets (e.g. the number of a Come bet, or the points made for a
+Fire bet), and each roll of the dice moves the chain between states until
+all the bets are resolved. Solving the chain gives the exact expected value,
+variance, and distribution of the number of rolls until the bet is resolved,
+without any simulation.
+
+Strategies can be analyzed the same way with explore_strategy, as long as the
+strategy only has a finite number of states (e.g. counters like the
+place_win_count of HammerLock which are reset). The states of that chain also
+include the bets the strategy has made and the state of the strategy itself.
+"""
+
+import copy
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from crapssim.bet import (
+    Bet,
+    CAndE,
+    Come,
+    DontCome,
+    DontPass,
+    Field,
+    HardWay,
+    Hop,
+    Odds,
+    PassLine,
+    Place,
+    _ATSBet,
+    _SimpleBet,
+)
+from crapssim.strategy import Strategy
+from crapssim.table import Table, TableSettings, TableUpdate
+
+__all__ = ["BetAnalysis", "StrategyChain", "analyze_bet", "explore_strategy"]
+
+_POINT_INDEPENDENT_BETS = (
+    Come,
+    DontCome,
+    Odds,
+    Place,
+    Field,
+    CAndE,
+    _SimpleBet,
+    HardWay,
+    Hop,
+    _ATSBet,
+)
+"""Bets whose result doesn't depend on the table point, so the point can be
+left out of the state of the chain."""
+
+_UNORDERED_OUTCOMES: list[tuple[tuple[int, int], float]] = [
+    ((d1, d2), (1 if d1 == d2 else 2) / 36) for d1 in range(1, 7) for d2 in range(d1, 7)
+]
+"""The 21 distinct dice outcomes (order of the dice doesn't matter for bets)
+with their probabilities."""
+
+
+@dataclass(slots=True, frozen=True)
+class BetAnalysis:
+    """
+    Exact results for the life of a bet, from being placed until it is
+    resolved. All amounts are in the same units as the bet amount.
+    """
+
+    expected_value: float
+    """Expected net win (positive) or loss (negative) of the bet."""
+    variance: float
+    """Variance of the net win or loss of the bet."""
+    expected_wager: float
+    """Expected total amount wagered, including any odds added to the bet."""
+    expected_rolls: float
+    """Expected number of rolls until the bet is resolved."""
+    resolution_time: np.ndarray
+    """Probability that the bet is resolved on roll k (index k, index 0 is 0)."""
+    n_states: int
+    """Number of transient states in the Markov chain."""
+
+    @property
+    def standard_deviation(self) -> float:
+        """Standard deviation of the net win or loss of the bet."""
+        return float(np.sqrt(self.variance))
+
+    @property
+    def house_edge(self) -> float:
+        """Expected loss as a fraction of the expected total amount wagered."""
+        return -self.expected_value / self.expected_wager
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    """Hashable version of a bet attribute (e.g. sets and lists)."""
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _copy_bet(bet: Bet) -> Bet:
+    """Copy of the bet with its own copy of any set, list or dict attributes, which
+    is all the state bets keep (and much faster than copy.deepcopy)."""
+    new_bet = copy.copy(bet)
+    for name, value in vars(bet).items():
+        if isinstance(value, (set, list, dict)):
+            setattr(new_bet, name, copy.copy(value))
+    return new_bet
+
+
+def _state_key(point: int | None, bets: list[Bet]) -> typing.Hashable:
+    return point, tuple((type(x), _freeze(vars(x))) for x in bets)
+
+
+def _add_odds(
+    bets: list[Bet], table: Table, odds_multiplier: dict[int, float]
+) -> float:
+    """Add odds to any PassLine, DontPass, Come, or DontCome bets that have a
+    number and don't have odds yet. Returns the amount added."""
+    added = 0.0
+    for bet in bets[:]:
+        if isinstance(bet, (PassLine, DontPass)):
+            number = table.point.number
+        elif isinstance(bet, (Come, DontCome)):
+            number = bet.number
+        else:
+            continue
+        if number not in odds_multiplier:
+            continue
+        odds = Odds(type(bet), number, bet.amount * odds_multiplier[number])
+        if not any(x._placed_key == odds._placed_key for x in bets):
+            bets.append(odds)
+            added += odds.amount
+    return added
+
+
+def analyze_bet(
+    bet: Bet | typing.Iterable[Bet],
+    settings: TableSettings | None = None,
+    point: int | None = None,
+    odds_multiplier: dict[int, float] | float | None = None,
+    max_rolls: int = 1000,
+) -> BetAnalysis:
+    """
+    Exact expected value, variance and resolution time for a bet.
+
+    The bet is followed from the given table point until it (and any odds
+    added to it) is resolved. Each reachable combination of table point and
+    bet state is a transient state of an absorbing Markov chain, and the
+    results come from solving the linear systems of the chain.
+
+    Parameters
+    ----------
+    bet
+        The bet to analyze, or several bets which are followed together until
+        all of them are resolved.
+    settings
+        The table settings used for payouts and maximum odds, defaults to the
+        settings of a new Table.
+    point
+        The table point when the bet is placed, defaults to the point being Off.
+    odds_multiplier
+        If given, odds of bet amount * odds_multiplier are added to PassLine,
+        DontPass, Come and DontCome bets once they have a number. Can be a
+        dictionary of the multiplier for each number, like OddsMultiplier.
+    max_rolls
+        Number of rolls to compute the resolution time distribution for.
+
+    Returns
+    -------
+    A BetAnalysis with the exact results for the bet.
+    """
+    bets = [bet] if isinstance(bet, Bet) else list(bet)
+    if isinstance(odds_multiplier, typing.SupportsFloat):
+        odds_multiplier = {x: float(odds_multiplier) for x in (4, 5, 6, 8, 9, 10)}
+    elif odds_multiplier is None:
+        odds_multiplier = {}
+
+    table = Table()
+    if settings is not None:
+        table.settings = settings
+    track_point = not all(isinstance(x, _POINT_INDEPENDENT_BETS) for x in bets)
+    if not track_point:
+        point = None
+
+    table.point.number = point
+    bets = copy.deepcopy(bets)
+    initial_wager = sum(x.amount for x in bets)
+    initial_wager += _add_odds(bets, table, odds_multiplier)
+
+    states: list[tuple[int | None, list[Bet]]] = [(point, bets)]
+    state_index = {_state_key(point, bets): 0}
+    # (state, next state or -1 if all bets resolved, probability, net win, added wager)
+    transitions: list[tuple[int, int, float, float, float]] = []
+
+    i = 0
+    while i < len(states):
+        state_point, state_bets = states[i]
+        for outcome, probability in _UNORDERED_OUTCOMES:
+            table.point.number = state_point
+            table.dice.result = outcome
+            next_bets = [_copy_bet(x) for x in state_bets]
+
+            reward = 0.0
+            remaining = []
+            for x in next_bets:
+                result = x.get_result(table)
+                if result.won:
+                    reward += result.amount - x.amount
+                elif result.lost:
+                    reward += result.amount
+                if not result.remove:
+                    remaining.append(x)
+
+            if len(remaining) == 0:
+                transitions.append((i, -1, probability, reward, 0.0))
+                continue
+
+            for x in remaining:
+                x.update_number(table)
+            if track_point:
+                table.point.update(table.dice)
+            added = _add_odds(remaining, table, odds_multiplier)
+
+            key = _state_key(table.point.number, remaining)
+            if key not in state_index:
+                state_index[key] = len(states)
+                states.append((table.point.number, remaining))
+            transitions.append((i, state_index[key], probability, reward, added))
+        i += 1
+
+    n = len(states)
+    rows, cols, probabilities, net, added = (np.array(x) for x in zip(*transitions))
+    rows, cols = rows.astype(int), cols.astype(int)
+    moves = cols >= 0
+
+    q = np.zeros((n, n))
+    np.add.at(q, (rows[moves], cols[moves]), probabilities[moves])
+    step = np.zeros((n, 3))
+    np.add.at(
+        step,
+        rows,
+        np.column_stack([probabilities * net, probabilities * added, probabilities]),
+    )
+    expected_value, expected_wager, expected_rolls = np.linalg.solve(
+        np.eye(n) - q, step
+    ).T
+
+    # E[X^2 | s] = sum over outcomes of p * (r^2 + 2 * r * E[X | s'] + E[X^2 | s'])
+    next_value = np.where(moves, expected_value[np.maximum(cols, 0)], 0.0)
+    second_step = np.zeros(n)
+    np.add.at(second_step, rows, probabilities * (net**2 + 2 * net * next_value))
+    second_moment = np.linalg.solve(np.eye(n) - q, second_step)
+
+    absorb = 1 - q.sum(axis=1)
+    resolution_time = np.zeros(max_rolls + 1)
+    distribution = np.zeros(n)
+    distribution[0] = 1.0
+    for k in range(1, max_rolls + 1):
+        resolution_time[k] = distribution @ absorb
+        distribution = np.bincount(
+            cols[moves],
+            weights=distribution[rows[moves]] * probabilities[moves],
+            minlength=n,
+        )
+        if distribution.sum() < 1e-16:
+            break
+
+    return BetAnalysis(
+        expected_value=float(expected_value[0]),
+        variance=float(second_moment[0] - expected_value[0] ** 2),
+        expected_wager=float(initial_wager + expected_wager[0]),
+        expected_rolls=float(expected_rolls[0]),
+        resolution_time=resolution_time,
+        n_states=n,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class StrategyChain:
+    """
+    Markov chain of a player playing a strategy, from a fresh table. The
+    transition matrix is stored sparsely as the (from state, to state) pairs of
+    the transitions, each with its probability and the net amount the player
+    wins (positive) or loses (negative) on that roll. State 0 is the fresh
+    table, before the first roll.
+    """
+
+    n_states: int
+    """Number of states reachable from a fresh table."""
+    rows: np.ndarray
+    """State each transition starts from."""
+    cols: np.ndarray
+    """State each transition goes to."""
+    probabilities: np.ndarray
+    """Probability of each transition."""
+    net: np.ndarray
+    """Net win (positive) or loss (negative) of the player on each transition,
+    counting the bets on the table at their amount like Player.total_player_cash."""
+
+    def transition_matrix(self) -> np.ndarray:
+        """Dense (n_states, n_states) matrix of the transition probabilities."""
+        matrix = np.zeros((self.n_states, self.n_states))
+        np.add.at(matrix, (self.rows, self.cols), self.probabilities)
+        return matrix
+
+    def _step(self, distribution: np.ndarray) -> np.ndarray:
+        return np.bincount(
+            self.cols,
+            weights=distribution[self.rows] * self.probabilities,
+            minlength=self.n_states,
+        )
+
+    @property
+    def expected_net_from_state(self) -> np.ndarray:
+        """Expected net win of the next roll from each state."""
+        return np.bincount(
+            self.rows, weights=self.probabilities * self.net, minlength=self.n_states
+        )
+
+    def expected_net_per_roll(self, n_rolls: int) -> np.ndarray:
+        """
+        Exact expected net win of each of the first n_rolls rolls from a fresh
+        table.
+
+        Parameters
+        ----------
+        n_rolls
+            Number of rolls.
+
+        Returns
+        -------
+        Array with the expected net win of roll k at index k - 1.
+        """
+        reward = self.expected_net_from_state
+        distribution = np.zeros(self.n_states)
+        distribution[0] = 1.0
+        result = np.zeros(n_rolls)
+        for k in range(n_rolls):
+            result[k] = distribution @ reward
+            distribution = self._step(distribution)
+        return result
+
+    def expected_session_net(self, n_rolls: int) -> float:
+        """
+        Exact expected net win of a session of n_rolls rolls from a fresh table.
+
+        Parameters
+        ----------
+        n_rolls
+            Number of rolls of the session.
+
+        Returns
+        -------
+        The expected net win of the session.
+        """
+        return float(self.expected_net_per_roll(n_rolls).sum())
+
+    @property
+    def stationary_distribution(self) -> np.ndarray:
+        """Long-run fraction of rolls made from each state. Assumes the states
+        keep coming back to the same recurrent states (e.g. each new come out),
+        which is the case for the strategies in this package."""
+        system = np.vstack(
+            [self.transition_matrix().T - np.eye(self.n_states), np.ones(self.n_states)]
+        )
+        target = np.zeros(self.n_states + 1)
+        target[-1] = 1.0
+        return np.linalg.lstsq(system, target, rcond=None)[0]
+
+    @property
+    def expected_value_per_roll(self) -> float:
+        """Long-run expected net win per roll of the strategy."""
+        return float(self.stationary_distribution @ self.expected_net_from_state)
+
+
+def explore_strategy(
+    strategy: Strategy,
+    settings: TableSettings | None = None,
+    bankroll: float = 1e6,
+    max_states: int = 100_000,
+) -> StrategyChain:
+    """
+    Exact Markov chain of a strategy, with every state reachable from a fresh
+    table.
+
+    Starting from a fresh table, each of the dice outcomes is played from each
+    state found so far, like a roll of Table.run. The state after the roll
+    (the table point, whether there's a new shooter, the player's bets and
+    Strategy.state_key) is looked up by its hash, so states which are reached
+    in different ways are only explored once.
+
+    Parameters
+    ----------
+    strategy
+        The strategy to explore. It is cloned, so the strategy given isn't
+        changed.
+    settings
+        The table settings used for payouts and maximum odds, defaults to the
+        settings of a new Table.
+    bankroll
+        The bankroll of the player before each roll. It isn't part of the state,
+        so it should be large enough to never limit the strategy.
+    max_states
+        Maximum number of states to explore, to stop strategies with unbounded
+        state (like a counter that's never reset).
+
+    Returns
+    -------
+    The StrategyChain of the strategy.
+
+    Raises
+    ------
+    ValueError
+        If more than max_states states are reachable.
+    """
+    table = Table()
+    if settings is not None:
+        table.settings = settings
+    table.add_player(bankroll, strategy)
+    player = table.players[0]
+
+    def state_key() -> typing.Hashable:
+        return (
+            table.point.number,
+            table.new_shooter,
+            tuple((type(x), _freeze(vars(x))) for x in player.bets),
+            player.strategy.state_key(),
+        )
+
+    states = [(table.point.number, table.new_shooter, [], player.strategy)]
+    state_index = {state_key(): 0}
+    transitions: list[tuple[int, int, float, float]] = []
+
+    i = 0
+    while i < len(states):
+        point, new_shooter, bets, state_strategy = states[i]
+        for outcome, probability in _UNORDERED_OUTCOMES:
+            table.point.number = point
+            table.new_shooter = new_shooter
+            player.bets = [_copy_bet(x) for x in bets]
+            player.strategy = state_strategy.clone()
+            player.bankroll = bankroll
+            cash = player.total_player_cash
+
+            TableUpdate().run(table, outcome)
+
+            key = state_key()
+            if key not in state_index:
+                if len(states) == max_states:
+                    raise ValueError(
+                        f"More than {max_states} states are reachable for the strategy"
+                    )
+                state_index[key] = len(states)
+                states.append(
+                    (
+                        table.point.number,
+                        table.new_shooter,
+                        player.bets,
+                        player.strategy,
+                    )
+                )
+            net = player.total_player_cash - cash
+            transitions.append((i, state_index[key], probability, net))
+        i += 1
+
+    rows, cols, probabilities, net = (np.array(x) for x in zip(*transitions))
+    return StrategyChain(
+        n_states=len(states),
+        rows=rows.astype(int),
+        cols=cols.astype(int),
+        probabilities=probabilities,
+        net=net,
+    )
@@ -0,0 +1,278 @@
+"""
+Optimal betting policies for reaching a bankroll target. Given a menu of actions (sets
+of bets the player can make before a roll), solve_target finds the policy which
+maximizes the probability of reaching the target bankroll before running out of money,
+by value iteration over every state reachable from the starting bankroll. A state is
+the player's bankroll, the table point, whether there's a new shooter and the bets on
+the table, and transitions play each dice outcome through the table as in
+crapssim.markov. The policy can be run as a normal Strategy with
+TargetPolicy.strategy() to check it by simulation.
+"""
+
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from crapssim.bet import Bet
+from crapssim.markov import _UNORDERED_OUTCOMES, _copy_bet, _freeze
+from crapssim.strategy.tools import NullStrategy, Player, Strategy
+from crapssim.table import Table, TableSettings, TableUpdate
+
+__all__ = ["PolicyStrategy", "TargetPolicy", "solve_target"]
+
+
+def _state_key(player: Player) -> typing.Hashable:
+    return (
+        round(player.bankroll, 9),
+        player.table.point.number,
+        player.table.new_shooter,
+        tuple((type(x), _freeze(vars(x))) for x in player.bets),
+    )
+
+
+def _apply_action(player: Player, action: tuple[Bet, ...]) -> bool:
+    """Place each bet of the action that the player doesn't have yet and is allowed.
+    Returns whether any bet was placed."""
+    placed = False
+    for bet in action:
+        if not player.already_placed(bet) and bet.is_allowed(player):
+            n_bets = len(player.bets)
+            player.add_bet(bet)
+            placed = placed or len(player.bets) > n_bets
+    return placed
+
+
+@dataclass(slots=True, frozen=True)
+class TargetPolicy:
+    """
+    The optimal policy for reaching a bankroll target, from solve_target.
+    """
+
+    probability: float
+    """Probability of reaching the target from the starting bankroll with the
+    policy."""
+    target: float
+    """The bankroll target."""
+    actions: tuple[tuple[Bet, ...], ...]
+    """The actions the policy chooses from."""
+    policy: dict[typing.Hashable, int]
+    """Index of the best action for each state where the player is still playing."""
+    values: dict[typing.Hashable, float]
+    """Probability of reaching the target from each state."""
+
+    @property
+    def n_states(self) -> int:
+        """Number of states reachable from the starting bankroll."""
+        return len(self.values)
+
+    def strategy(self) -> "PolicyStrategy":
+        """The policy as a Strategy, to run on a Table."""
+        return PolicyStrategy(self)
+
+
+class PolicyStrategy(Strategy):
+    """Strategy making the bets of the optimal action of a TargetPolicy for the player's
+    state. The strategy is completed when the bankroll reaches the target, or when the
+    player has no bets and can't make any more."""
+
+    _shared_attributes = frozenset({"policy"})
+    memoizable = True
+
+    def __init__(self, policy: TargetPolicy):
+        """Play the given policy.
+
+        Parameters
+        ----------
+        policy
+            The policy from solve_target.
+        """
+        self.policy = policy
+
+    def completed(self, player: Player) -> bool:
+        """The strategy is completed once the bankroll reaches the target, or the
+        player has no bets and the policy has no action for the player's state.
+
+        Parameters
+        ----------
+        player
+            The player to check.
+
+        Returns
+        -------
+        True if the player should stop playing, otherwise False.
+        """
+        if player.bankroll >= self.policy.target:
+            return True
+        return len(player.bets) == 0 and _state_key(player) not in self.policy.policy
+
+    def update_bets(self, player: Player) -> None:
+        """Make the bets of the best action for the player's state, if there is one.
+
+        Parameters
+        ----------
+        player
+            The player to make the bets for.
+        """
+        action = self.policy.policy.get(_state_key(player))
+        if action is not None:
+            _apply_action(player, self.policy.actions[action])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(target={self.policy.target})"
+
+
+def solve_target(
+    bankroll: float,
+    target: float,
+    actions: typing.Iterable[typing.Iterable[Bet]],
+    settings: TableSettings | None = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100_000,
+    max_states: int = 200_000,
+) -> TargetPolicy:
+    """
+    Find the betting policy that maximizes the probability of reaching a bankroll
+    target before running out of money.
+
+    Before each roll the player chooses one of the actions, placing each bet of the
+    action they don't already have (if it's allowed and they can afford it). Letting
+    the bets on the table ride is always an option. The player reaches the target when
+    their bankroll (not counting bets on the table) is at least the target, and is
+    ruined when they have no bets and can't place any.
+
+    Parameters
+    ----------
+    bankroll
+        The starting bankroll.
+    target
+        The bankroll to reach.
+    actions
+        The actions to choose from, each an iterable of bets, e.g.
+        [[PassLine(5)], [PassLine(10)], [Odds(PassLine, 6, 10), Odds(PassLine, 8, 10)]].
+    settings
+        The table settings used for payouts and maximum odds, defaults to the settings
+        of a new Table.
+    tolerance
+        Value iteration stops when no probability changes by more than this.
+    max_iterations
+        Maximum number of iterations of value iteration.
+    max_states
+        Maximum number of states to explore.
+
+    Returns
+    -------
+    The TargetPolicy with the optimal action for each state.
+
+    Raises
+    ------
+    ValueError
+        If more than max_states states are reachable.
+    """
+    actions = tuple(tuple(x) for x in actions)
+    menu = ((),) + actions
+
+    table = Table()
+    if settings is not None:
+        table.settings = settings
+    table.add_player(bankroll, NullStrategy())
+    player = table.players[0]
+
+    start = _state_key(player)
+    states = [(player.bankroll, table.point.number, table.new_shooter, [])]
+    state_index = {start: 0}
+    # (state, index in menu) of each decision, and (decision, next state, probability)
+    decisions: list[tuple[int, int]] = []
+    transitions: list[tuple[int, int, float]] = []
+    success = []
+
+    i = 0
+    while i < len(states):
+        state_bankroll, point, new_shooter, bets = states[i]
+        if state_bankroll >= target:
+            success.append(i)
+            i += 1
+            continue
+        for a, action in enumerate(menu):
+            table.point.number = point
+            table.new_shooter = new_shooter
+            player.bets = [_copy_bet(x) for x in bets]
+            player.bankroll = state_bankroll
+            if not _apply_action(player, action) and a > 0:
+                continue  # same as letting the bets ride
+            if len(player.bets) == 0:
+                continue
+            action_bets, action_bankroll = player.bets, player.bankroll
+
+            decision = len(decisions)
+            decisions.append((i, a))
+            for outcome, probability in _UNORDERED_OUTCOMES:
+                table.point.number = point
+                table.new_shooter = new_shooter
+                player.bets = [_copy_bet(x) for x in action_bets]
+                player.bankroll = action_bankroll
+                TableUpdate().run(table, outcome)
+
+                key = _state_key(player)
+                if key not in state_index:
+                    if len(states) == max_states:
+                        raise ValueError(
+                            f"More than {max_states} states are reachable for the target"
+                        )
+                    state_index[key] = len(states)
+                    states.append(
+                        (
+                            player.bankroll,
+                            table.point.number,
+                            table.new_shooter,
+                            player.bets,
+                        )
+                    )
+                transitions.append((decision, state_index[key], probability))
+        i += 1
+
+    n = len(states)
+    values = np.zeros(n)
+    values[success] = 1.0
+    if len(decisions) > 0:
+        decision_state = np.array([s for s, _ in decisions])
+        rows, cols, probabilities = (np.array(x) for x in zip(*transitions))
+        rows, cols = rows.astype(int), cols.astype(int)
+        # decisions are in order of their state, so each state's are contiguous
+        starts = np.flatnonzero(np.r_[True, decision_state[1:] != decision_state[:-1]])
+        playing = decision_state[starts]
+
+        for _ in range(max_iterations):
+            q = np.bincount(
+                rows, weights=probabilities * values[cols], minlength=len(decisions)
+            )
+            new_values = values.copy()
+            new_values[playing] = np.maximum.reduceat(q, starts)
+            change = np.abs(new_values - values).max()
+            values = new_values
+            if change <= tolerance:
+                break
+
+        q = np.bincount(
+            rows, weights=probabilities * values[cols], minlength=len(decisions)
+        )
+        best = {}
+        for decision in range(len(decisions)):
+            state, a = decisions[decision]
+            # ties go to the first action (letting the bets ride first)
+            if state not in best or q[decision] > q[best[state]] + tolerance:
+                best[state] = decision
+
+    keys = list(state_index)
+    policy = {}
+    for state, decision in (best.items() if len(decisions) > 0 else []):
+        a = decisions[decision][1]
+        if a > 0:
+            policy[keys[state]] = a - 1
+    return TargetPolicy(
+        probability=float(values[0]),
+        target=float(target),
+        actions=actions,
+        policy=policy,
+        values={keys[x]: float(values[x]) for x in range(n)},
+    )
@@ -0,0 +1,382 @@
+"""
+Progress of long simulations, cheap enough to leave on. The workers running the
+sessions count the sessions and rolls they finish in a block of shared memory, once
+per session rather than once per roll, and a monitor thread (see Progress) or another
+process (see main) reads the block to report how far along the simulation is, how fast
+each worker is going and when it should finish.
+
+Each chunk of sessions has its own row of counters, which only the worker running the
+chunk writes, so the workers never wait on each other or on a lock.
+
+From the command line, for a simulation run with Progress(name="ironcross"):
+
+    python -m crapssim.progress ironcross
+"""
+
+import argparse
+import datetime
+import math
+import sys
+import threading
+import time
+import typing
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+__all__ = ["Progress", "ProgressCounters", "ProgressSnapshot", "main", "watch"]
+
+_FIELDS = 5
+"""Number of float64 counters in each row of the block. The first row is the header:
+total sessions, number of chunks, start time, end time (0 until the run is over) and
+the number of sessions done before the run (e.g. from a checkpoint). Each following
+row is a chunk: sessions done, rolls done, start time, time of the last update and
+the id of the worker thread running it."""
+
+
+@dataclass(slots=True, frozen=True)
+class ProgressSnapshot:
+    """
+    The progress of a simulation at one point in time.
+    """
+
+    n_sessions: int
+    """Total number of sessions of the run."""
+    sessions_done: int
+    """Number of sessions finished, including those done before the run started."""
+    rolls: int
+    """Number of rolls of the sessions finished during the run."""
+    elapsed: float
+    """Seconds since the run started."""
+    worker_rates: dict[int, float]
+    """Rolls per second of each worker (by thread id) while running its chunks."""
+    finished: bool
+    """Whether the run is over."""
+    resumed: int = 0
+    """Number of sessions done before the run started."""
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the sessions finished."""
+        return self.sessions_done / self.n_sessions if self.n_sessions > 0 else 1.0
+
+    @property
+    def rolls_per_second(self) -> float:
+        """Rolls per second of all the workers together."""
+        return self.rolls / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Estimated seconds until the run finishes, at the rate of sessions so far,
+        or inf before any session finishes."""
+        if self.finished or self.sessions_done >= self.n_sessions:
+            return 0.0
+        done = self.sessions_done - self.resumed
+        if done <= 0 or self.elapsed <= 0:
+            return math.inf
+        return (self.n_sessions - self.sessions_done) * self.elapsed / done
+
+    def __str__(self) -> str:
+        eta = (
+            "?"
+            if math.isinf(self.eta)
+            else str(datetime.timedelta(seconds=round(self.eta)))
+        )
+        return (
+            f"{self.sessions_done}/{self.n_sessions} sessions "
+            f"({self.fraction:.1%}), {self.rolls_per_second:,.0f} rolls/s on "
+            f"{len(self.worker_rates)} workers, ETA {eta}"
+        )
+
+
+class ProgressCounters:
+    """
+    Block of progress counters in shared memory. The process that creates the block
+    owns the shared memory and should unlink it when done, e.g. by using it as a
+    context manager; workers and monitors in other processes attach to it by name.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self._memory = memory
+        self.owner = owner
+        n_rows = memory.size // (_FIELDS * 8)
+        self.counters = np.ndarray(
+            (n_rows, _FIELDS), dtype=np.float64, buffer=memory.buf
+        )
+        """The counters, a view of the shared memory."""
+
+    @classmethod
+    def create(
+        cls,
+        n_sessions: int,
+        n_chunks: int,
+        resumed: int = 0,
+        name: str | None = None,
+    ) -> "ProgressCounters":
+        """New counters for a run.
+
+        Parameters
+        ----------
+        n_sessions
+            Total number of sessions of the run.
+        n_chunks
+            Number of chunks the sessions are split into.
+        resumed
+            Number of sessions done before the run started.
+        name
+            Name of the shared memory, for monitors to attach to. If None, a unique
+            name is chosen.
+
+        Returns
+        -------
+        The ProgressCounters, owning the new shared memory.
+        """
+        memory = shared_memory.SharedMemory(
+            name=name, create=True, size=(1 + n_chunks) * _FIELDS * 8
+        )
+        progress = cls(memory, owner=True)
+        progress.counters[:] = 0
+        progress.counters[0] = (n_sessions, n_chunks, time.time(), 0, resumed)
+        return progress
+
+    @classmethod
+    def attach(cls, name: str) -> "ProgressCounters":
+        """Attach to counters created by another ProgressCounters.
+
+        Parameters
+        ----------
+        name
+            The name of the shared memory of the counters.
+
+        Returns
+        -------
+        The ProgressCounters, not owning the shared memory.
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory, for attach."""
+        return self._memory.name
+
+    def start_chunk(self, chunk: int) -> None:
+        """Mark the chunk as started by the calling worker thread."""
+        now = time.time()
+        self.counters[1 + chunk, 2:] = (now, now, threading.get_native_id())
+
+    def add_session(self, chunk: int, rolls: int) -> None:
+        """Count a finished session of the chunk with the given number of rolls."""
+        row = self.counters[1 + chunk]
+        row[0] += 1
+        row[1] += rolls
+        row[3] = time.time()
+
+    def finish(self) -> None:
+        """Mark the run as over."""
+        self.counters[0, 3] = time.time()
+
+    def snapshot(self) -> ProgressSnapshot:
+        """The progress so far.
+
+        Returns
+        -------
+        The ProgressSnapshot of the counters now.
+        """
+        counters = self.counters.copy()
+        n_sessions, _, started, ended, resumed = counters[0]
+        chunks = counters[1:][counters[1:, 2] > 0]
+        worker_rates = {}
+        for worker in np.unique(chunks[:, 4]):
+            mine = chunks[chunks[:, 4] == worker]
+            busy = (mine[:, 3] - mine[:, 2]).sum()
+            worker_rates[int(worker)] = (
+                float(mine[:, 1].sum() / busy) if busy > 0 else 0.0
+            )
+        return ProgressSnapshot(
+            n_sessions=int(n_sessions),
+            sessions_done=int(resumed + chunks[:, 0].sum()),
+            rolls=int(chunks[:, 1].sum()),
+            elapsed=(ended or time.time()) - started,
+            worker_rates=worker_rates,
+            finished=bool(ended),
+            resumed=int(resumed),
+        )
+
+    def close(self) -> None:
+        """Close this process's view of the shared memory."""
+        self.counters = self.counters[:0].copy()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory, once every process has closed it."""
+        self._memory.unlink()
+
+    def __enter__(self) -> "ProgressCounters":
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+class Progress:
+    """
+    Progress reporting for a Simulation run, e.g.
+
+        simulation.run(progress=Progress(print, interval=5))
+
+    calls print with a ProgressSnapshot every five seconds from a monitor thread, and
+    once more at the end of the run.
+    """
+
+    def __init__(
+        self,
+        callback: typing.Callable[[ProgressSnapshot], typing.Any] | None = None,
+        interval: float = 1.0,
+        name: str | None = None,
+    ):
+        """Set up the progress reporting.
+
+        Parameters
+        ----------
+        callback
+            Called with a ProgressSnapshot every interval seconds during the run and
+            at the end. If None, there is no monitor thread, and the progress can only
+            be read by attaching to the counters by name.
+        interval
+            Seconds between calls of the callback.
+        name
+            Name of the shared memory of the counters, so other processes can watch
+            the run (see main). If None, a unique name is chosen.
+        """
+        self.callback = callback
+        self.interval = interval
+        self.name = name
+        self.last: ProgressSnapshot | None = None
+        """The last snapshot taken, the final progress once the run is over."""
+        self._counters: ProgressCounters | None = None
+        self._stopped = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    @property
+    def counters(self) -> ProgressCounters | None:
+        """The counters of the run in progress."""
+        return self._counters
+
+    def start(self, n_sessions: int, n_chunks: int, resumed: int = 0) -> str:
+        """Create the counters and start the monitor thread.
+
+        Parameters
+        ----------
+        n_sessions
+            Total number of sessions of the run.
+        n_chunks
+            Number of chunks the sessions are split into.
+        resumed
+            Number of sessions done before the run started.
+
+        Returns
+        -------
+        The name of the counters, for the workers to attach to.
+        """
+        self._counters = ProgressCounters.create(
+            n_sessions, n_chunks, resumed, self.name
+        )
+        self._stopped.clear()
+        if self.callback is not None:
+            self._monitor = threading.Thread(target=self._watch, daemon=True)
+            self._monitor.start()
+        return self._counters.name
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.last = self._counters.snapshot()
+            self.callback(self.last)
+
+    def stop(self) -> None:
+        """Mark the run as over, stop the monitor thread, report the final progress
+        and free the counters."""
+        if self._counters is None:
+            return
+        self._counters.finish()
+        self._stopped.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        self.last = self._counters.snapshot()
+        if self.callback is not None:
+            self.callback(self.last)
+        self._counters.close()
+        self._counters.unlink()
+        self._counters = None
+
+
+def _chunk_counter(
+    progress: tuple[str, int] | None,
+) -> tuple[ProgressCounters | None, int]:
+    """Attach to the counters of a worker task's (name, chunk), marking the chunk as
+    started."""
+    if progress is None:
+        return None, 0
+    name, chunk = progress
+    counters = ProgressCounters.attach(name)
+    counters.start_chunk(chunk)
+    return counters, chunk
+
+
+def watch(
+    name: str,
+    interval: float = 1.0,
+    file: typing.TextIO | None = None,
+) -> ProgressSnapshot | None:
+    """
+    Print the progress of the run with the named counters until it's over.
+
+    Parameters
+    ----------
+    name
+        Name of the counters, see Progress.
+    interval
+        Seconds between prints.
+    file
+        Where to print, defaults to standard output.
+
+    Returns
+    -------
+    The last ProgressSnapshot, or None if the run ended (and freed its counters)
+    before the first one.
+    """
+    file = file or sys.stdout
+    counters = ProgressCounters.attach(name)
+    snapshot = None
+    try:
+        while True:
+            snapshot = counters.snapshot()
+            print(snapshot, file=file, flush=True)
+            if snapshot.finished:
+                break
+            time.sleep(interval)
+    finally:
+        counters.close()
+    return snapshot
+
+
+def main(argv: typing.Sequence[str] | None = None) -> None:
+    """Command line interface, see the module docstring."""
+    parser = argparse.ArgumentParser(
+        prog="python -m crapssim.progress",
+        description="Watch the progress of a simulation run in another process.",
+    )
+    parser.add_argument("name", help="name given to Progress in the run")
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+    try:
+        watch(args.name, args.interval)
+    except FileNotFoundError:
+        sys.exit(f"No run in progress named {args.name!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Select the best of many strategy configurations by racing them. Instead of running
+every configuration for the same number of sessions, sessions are run in rounds, and
+after each round configurations whose confidence interval on the chosen metric is
+entirely worse than the best lower bound are dropped. The rest of the budget of
+sessions is spent on the configurations still close to the best.
+
+As in sweep, session i of every configuration uses the same dice, so configurations
+are compared on the same rolls and the results don't depend on the number of
+processes.
+"""
+
+import math
+import statistics
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from crapssim.strategy import Strategy
+from crapssim.sweep import SessionSummary, _completed_chunks, _executor, _expand_grid
+
+__all__ = ["METRICS", "RaceEntry", "RaceResult", "race"]
+
+
+def _mean(summary: SessionSummary, z: float) -> tuple[float, float, float]:
+    error = z * summary.standard_error
+    return summary.mean, summary.mean - error, summary.mean + error
+
+
+def _rate(rate: float, n: int, z: float) -> tuple[float, float]:
+    """The Wilson score interval of a rate, which unlike the normal approximation
+    doesn't shrink to nothing when no session (or every session) is a success."""
+    if n == 0:
+        return 0.0, 1.0
+    z2 = z * z / n
+    center = (rate + z2 / 2) / (1 + z2)
+    half_width = z * math.sqrt(rate * (1 - rate) / n + z2 / (4 * n)) / (1 + z2)
+    return center - half_width, center + half_width
+
+
+def _win_rate(summary: SessionSummary, z: float) -> tuple[float, float, float]:
+    return summary.win_rate, *_rate(summary.win_rate, summary.n_sessions, z)
+
+
+def _ruin_rate(summary: SessionSummary, z: float) -> tuple[float, float, float]:
+    # lower is better, so negate to compare like the other metrics
+    lower, upper = _rate(summary.ruin_rate, summary.n_sessions, z)
+    return -summary.ruin_rate, -upper, -lower
+
+
+METRICS: dict[
+    str, typing.Callable[[SessionSummary, float], tuple[float, float, float]]
+] = {
+    "mean": _mean,
+    "win_rate": _win_rate,
+    "ruin_rate": _ruin_rate,
+}
+"""Metrics configurations can be raced on, as functions returning the estimate (where
+higher is better) and the bounds of its confidence interval from a SessionSummary and
+the z-score of the confidence level."""
+
+
+@dataclass(slots=True, frozen=True)
+class RaceEntry:
+    """The result of one configuration of a race."""
+
+    parameters: dict[str, typing.Any]
+    """The parameters the strategy factory was called with."""
+    summary: SessionSummary
+    """The summary of all the sessions run for the configuration."""
+    eliminated: int | None
+    """The round after which the configuration was dropped, or None if it lasted
+    until the end of the race."""
+
+
+@dataclass(slots=True, frozen=True)
+class RaceResult:
+    """The result of a race, with the entries ordered from best to worst."""
+
+    entries: list[RaceEntry]
+    """The entries of the race, the ones lasting longest first and ordered by the
+    metric within each round."""
+    metric: str
+    """The metric the configurations were raced on."""
+    n_rounds: int
+    """Number of rounds run."""
+
+    @property
+    def best(self) -> RaceEntry:
+        """The best entry of the race."""
+        return self.entries[0]
+
+    @property
+    def n_sessions(self) -> int:
+        """Total number of sessions run over all configurations."""
+        return sum(x.summary.n_sessions for x in self.entries)
+
+
+def race(
+    factory: typing.Callable[..., Strategy],
+    grid: dict[str, typing.Iterable] | typing.Iterable[dict[str, typing.Any]],
+    budget: int,
+    metric: str = "mean",
+    round_size: int = 100,
+    confidence: float = 0.95,
+    min_sessions: int = 30,
+    bankroll: float = 100,
+    max_rolls: float = float("inf"),
+    max_shooter: float = 10,
+    seed: int | None = None,
+    max_workers: int | None = None,
+) -> RaceResult:
+    """
+    Race the configurations of a grid of parameters of a strategy against each other,
+    running sessions in rounds and dropping the configurations which are clearly
+    worse than the best.
+
+    Parameters
+    ----------
+    factory
+        Function or class returning the strategy for the parameters, e.g. HammerLock.
+        Must be importable by the worker processes (not a lambda) unless max_workers
+        is 1.
+    grid
+        Dictionary of the values of each parameter, every combination of which is
+        raced, or an iterable of dictionaries of parameters for each configuration.
+    budget
+        Total number of sessions to run over all configurations. The race stops
+        early if only one configuration is left.
+    metric
+        The metric to pick the best configuration by, one of "mean" (the mean net win
+        per session), "win_rate" (the fraction of winning sessions) or "ruin_rate"
+        (the fraction of sessions where the player runs out of money, lower is better).
+    round_size
+        Number of sessions run for each remaining configuration in each round.
+    confidence
+        Confidence level of the intervals on the metric, adjusted (Bonferroni) for
+        the number of configurations so it holds for all of them at once. A
+        configuration is dropped when the upper bound of its interval is below the
+        highest lower bound.
+    min_sessions
+        Number of sessions each configuration runs before any is dropped, so no
+        configuration is dropped on the intervals of a handful of sessions.
+    bankroll
+        The starting bankroll of the player in each session.
+    max_rolls
+        Maximum number of rolls of each session.
+    max_shooter
+        Maximum number of shooters of each session.
+    seed
+        Root seed of the dice, if None a random seed is used.
+    max_workers
+        Number of processes to use, defaults to the number of CPUs. If 1, the
+        sessions are run in this process.
+
+    Returns
+    -------
+    The RaceResult with the summary of each configuration.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, must be one of {list(METRICS)}")
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    estimate = METRICS[metric]
+
+    configurations = _expand_grid(grid)
+    alpha = (1 - confidence) / len(configurations)
+    z = statistics.NormalDist().inv_cdf(1 - alpha / 2)
+    summaries = [SessionSummary.from_sessions([], [], 0) for _ in configurations]
+    eliminated: list[int | None] = [None] * len(configurations)
+    alive = list(range(len(configurations)))
+    remaining_budget = budget
+    n_rounds = 0
+
+    # one pool of processes for every round, rather than starting one per round
+    executor = _executor(max_workers)
+    try:
+        while len(alive) > 1 or n_rounds == 0:
+            size = min(round_size, remaining_budget // len(alive))
+            if size == 0:
+                break
+            n_rounds += 1
+            remaining_budget -= size * len(alive)
+
+            # every remaining configuration has run the same sessions so far
+            start = summaries[alive[0]].n_sessions
+            settings = (bankroll, max_rolls, max_shooter, seed, start, start + size)
+            tasks = [(i, (factory, configurations[i], *settings)) for i in alive]
+            for (i, _), summary in _completed_chunks(tasks, executor):
+                summaries[i] = summaries[i].merge(summary)
+
+            if start + size < min_sessions:
+                continue
+            bounds = {i: estimate(summaries[i], z)[1:] for i in alive}
+            best_lower = max(lower for lower, _ in bounds.values())
+            for i in alive:
+                if bounds[i][1] < best_lower:
+                    eliminated[i] = n_rounds
+            alive = [i for i in alive if eliminated[i] is None]
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    order = sorted(
+        range(len(configurations)),
+        key=lambda i: (
+            -(eliminated[i] or n_rounds + 1),
+            -estimate(summaries[i], z)[0] if summaries[i].n_sessions > 0 else math.inf,
+        ),
+    )
+    entries = [RaceEntry(configurations[i], summaries[i], eliminated[i]) for i in order]
+    return RaceResult(entries, metric, n_rounds)
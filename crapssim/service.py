@@ -0,0 +1,408 @@
+"""
+Asyncio job layer for running simulations behind a web front end (e.g. FastAPI). A
+JobService accepts simulations (or requests describing them as JSON data), runs them
+on one bounded pool of workers shared by all the jobs, and lets any number of clients
+wait for the result, follow the running summary as chunks of sessions finish, or cancel
+the job, without blocking the event loop.
+
+Submitting a simulation that is identical (same cache key, see crapssim.cache) to one
+still running returns the running job instead of starting another one. With a
+ResultCache, finished summaries are also returned for later identical submissions
+without running anything.
+
+Everything runs in the event loop of the caller, so the service can be tested with
+asyncio.run and no server, e.g.
+
+    async def main():
+        async with JobService(max_workers=4) as service:
+            job = service.submit(Simulation(IronCross(5), 10_000, seed=1))
+            async for summary in job.updates():
+                print(summary.n_sessions, summary.summary.mean)
+            return await job.result()
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import dataclasses
+import enum
+import math
+import os
+import typing
+import uuid
+
+from crapssim.cache import ResultCache, simulation_key
+from crapssim.simulation import (
+    BACKENDS,
+    Simulation,
+    SimulationSummary,
+    _summarize_sessions,
+)
+from crapssim.strategy.spec import strategy_from_spec
+
+__all__ = ["Job", "JobService", "JobStatus", "simulation_from_request"]
+
+
+class JobStatus(enum.Enum):
+    """The state of a Job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+def simulation_from_request(request: typing.Mapping[str, typing.Any]) -> Simulation:
+    """
+    The Simulation described by a request, e.g. the JSON body of an HTTP request.
+
+    Parameters
+    ----------
+    request
+        Dictionary with a "strategy" spec (see crapssim.strategy.spec), "n_sessions",
+        and optionally "bankroll", "max_rolls", "max_shooter" (null for no limit),
+        "seed", "runout" and "table_settings".
+
+    Returns
+    -------
+    The Simulation.
+
+    Raises
+    ------
+    ValueError
+        If the request is missing the strategy or number of sessions, has unknown
+        keys, or has an invalid strategy spec.
+    """
+    known = {
+        "strategy",
+        "n_sessions",
+        "bankroll",
+        "max_rolls",
+        "max_shooter",
+        "seed",
+        "runout",
+        "table_settings",
+    }
+    unknown = set(request) - known
+    if len(unknown) > 0:
+        raise ValueError(f"Unknown keys in simulation request: {sorted(unknown)}")
+    if "strategy" not in request or "n_sessions" not in request:
+        raise ValueError("Simulation request needs a strategy and n_sessions")
+    settings = dict(request)
+    strategy = strategy_from_spec(settings.pop("strategy"))
+    # JSON has no infinity
+    for name in ("max_rolls", "max_shooter"):
+        if name in settings and settings[name] is None:
+            settings[name] = math.inf
+    return Simulation(strategy, **settings)
+
+
+class Job:
+    """
+    A simulation submitted to a JobService. Its summary is updated as the chunks of
+    sessions finish in order, and clients can follow the updates, wait for the result
+    or cancel it. A job is shared by everyone who submitted the same simulation while
+    it was running, so cancelling it cancels it for all of them.
+    """
+
+    def __init__(self, simulation: Simulation, key: str):
+        self.id = uuid.uuid4().hex
+        """Unique id of the job, e.g. for looking it up with JobService.get."""
+        self.simulation = simulation
+        """The simulation run by the job."""
+        self.key = key
+        """Cache key of the simulation's summary, the same for identical
+        simulations."""
+        self.status = JobStatus.PENDING
+        """The state of the job."""
+        self.summary: SimulationSummary | None = None
+        """The summary of the sessions finished so far, None before the first chunk
+        finishes."""
+        self._future: asyncio.Future[SimulationSummary] = (
+            asyncio.get_running_loop().create_future()
+        )
+        # mark failures as retrieved, so jobs nobody waited on don't log warnings
+        self._future.add_done_callback(lambda x: x.cancelled() or x.exception())
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def n_sessions_done(self) -> int:
+        """Number of sessions finished so far."""
+        return 0 if self.summary is None else self.summary.n_sessions
+
+    def done(self) -> bool:
+        """Whether the job is over, finished or not."""
+        return self._future.done()
+
+    def _update(self, summary: SimulationSummary) -> None:
+        self.summary = summary
+        self._notify()
+
+    def _notify(self) -> None:
+        # wake the current waiters, later ones wait on a new event
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _finish(
+        self,
+        status: JobStatus,
+        summary: SimulationSummary | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        self.status = status
+        if status is JobStatus.DONE:
+            self.summary = summary
+            self._future.set_result(summary)
+        elif status is JobStatus.CANCELLED:
+            self._future.cancel()
+        else:
+            self._future.set_exception(error)
+        self._notify()
+
+    async def result(self) -> SimulationSummary:
+        """
+        Wait for the job to finish.
+
+        Returns
+        -------
+        The SimulationSummary of all the sessions.
+
+        Raises
+        ------
+        asyncio.CancelledError
+            If the job was cancelled.
+        Exception
+            Whatever running the sessions raised, if the job failed.
+        """
+        # shielded so a client that stops waiting doesn't cancel the shared job
+        return await asyncio.shield(self._future)
+
+    async def updates(self) -> typing.AsyncIterator[SimulationSummary]:
+        """
+        Follow the summary of the job as its chunks of sessions finish.
+
+        Yields
+        ------
+        The SimulationSummary of the sessions finished so far, each time it changes,
+        ending with the final one when the job is done. Updates that happen while the
+        client is busy with an earlier one are skipped, so slow clients see the latest
+        summary rather than falling behind.
+        """
+        last = None
+        while True:
+            changed = self._changed
+            if self.summary is not None and self.summary is not last:
+                last = self.summary
+                yield last
+            if self.done():
+                return
+            await changed.wait()
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job, stopping its chunks of sessions which haven't started.
+
+        Returns
+        -------
+        False if the job was already over, True otherwise.
+        """
+        if self.done():
+            return False
+        if self._task is not None:
+            self._task.cancel()
+        else:
+            self._finish(JobStatus.CANCELLED)
+        return True
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.id}, {self.status.value}, "
+            f"{self.n_sessions_done}/{self.simulation.n_sessions} sessions)"
+        )
+
+
+class JobService:
+    """
+    Runs submitted simulations as asyncio jobs on a bounded pool of workers. Use it as
+    an async context manager (or call start and shutdown) in the event loop the jobs
+    are submitted from.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        chunk_size: int = 100,
+        backend: str = "process",
+        cache: ResultCache | None = None,
+        max_finished_jobs: int = 1000,
+    ):
+        """Set up the service.
+
+        Parameters
+        ----------
+        max_workers
+            Number of workers shared by all the jobs, defaults to the number of CPUs.
+        chunk_size
+            Number of sessions a worker runs at a time, and so the number of sessions
+            between updates of a job's summary.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see
+            crapssim.simulation.BACKENDS.
+        cache
+            Cache of summaries, checked before running a job and updated after.
+        max_finished_jobs
+            Number of finished jobs kept in jobs for clients to look up. Older finished
+            jobs are forgotten, so a long running service doesn't keep every summary.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend {backend!r}, must be one of {list(BACKENDS)}"
+            )
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.backend = backend
+        self.cache = cache
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: dict[str, Job] = {}
+        """The jobs still running and the last max_finished_jobs finished ones, by id."""
+        self._running: dict[str, Job] = {}
+        self._finished_ids: collections.deque[str] = collections.deque()
+        # a slot for each chunk queued or running on the workers, shared by all the jobs
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._executor: concurrent.futures.Executor | None = None
+
+    def start(self) -> None:
+        """Start the pool of workers."""
+        if self._executor is None:
+            self._executor = BACKENDS[self.backend](self.max_workers)
+
+    async def shutdown(self) -> None:
+        """Cancel the jobs that are still running and stop the pool of workers."""
+        jobs = list(self._running.values())
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(
+            *(x._task for x in jobs if x._task is not None), return_exceptions=True
+        )
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "JobService":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: typing.Any) -> None:
+        await self.shutdown()
+
+    def get(self, job_id: str) -> Job:
+        """The job with the id.
+
+        Raises
+        ------
+        KeyError
+            If there's no job with the id, or it finished long enough ago to have been
+            forgotten (see max_finished_jobs).
+        """
+        return self.jobs[job_id]
+
+    def submit(self, simulation: Simulation) -> Job:
+        """
+        Start running a simulation, or join the job already running an identical one.
+
+        Parameters
+        ----------
+        simulation
+            The simulation, whose strategy must be picklable with the "process"
+            backend.
+
+        Returns
+        -------
+        The Job running the simulation.
+        """
+        self.start()
+        key = simulation_key(simulation, "summary", chunk_size=self.chunk_size)
+        if key in self._running:
+            return self._running[key]
+
+        job = Job(simulation, key)
+        self.jobs[job.id] = job
+        self._running[key] = job
+        job._task = asyncio.get_running_loop().create_task(self._run(job))
+        job._task.add_done_callback(lambda task: self._finished(job, task))
+        return job
+
+    def submit_request(self, request: typing.Mapping[str, typing.Any]) -> Job:
+        """Submit the simulation described by a request, see simulation_from_request
+        and submit."""
+        return self.submit(simulation_from_request(request))
+
+    async def _run(self, job: Job) -> None:
+        simulation = job.simulation
+        if self.cache is not None:
+            cached = await asyncio.to_thread(
+                simulation._load_summary, self.cache, self.chunk_size
+            )
+            if cached is not None:
+                job._finish(JobStatus.DONE, cached)
+                return
+
+        job.status = JobStatus.RUNNING
+        loop = asyncio.get_running_loop()
+        settings, n_sessions = simulation._settings(), simulation.n_sessions
+        summary = simulation._empty_summary()
+
+        def merge(chunk: SimulationSummary) -> None:
+            nonlocal summary
+            summary = dataclasses.replace(summary, summary=summary.summary.merge(chunk))
+            job._update(summary)
+
+        # chunks are submitted as slots free up rather than all at once, so a big job
+        # holds at most max_workers of them and doesn't queue ahead of later jobs
+        window: collections.deque[asyncio.Future] = collections.deque()
+        try:
+            for start in range(0, n_sessions, self.chunk_size):
+                # merged in order, so the results don't depend on the workers
+                while len(window) > 0 and (
+                    window[0].done() or len(window) == self.max_workers
+                ):
+                    merge(await window.popleft())
+                await self._slots.acquire()
+                future = loop.run_in_executor(
+                    self._executor,
+                    _summarize_sessions,
+                    *settings,
+                    start,
+                    min(start + self.chunk_size, n_sessions),
+                )
+                future.add_done_callback(lambda _: self._slots.release())
+                window.append(future)
+            while len(window) > 0:
+                merge(await window.popleft())
+        except BaseException:
+            for future in window:
+                future.cancel()
+            raise
+
+        if self.cache is not None:
+            await asyncio.to_thread(
+                simulation._store_summary, self.cache, summary, self.chunk_size
+            )
+        job._finish(JobStatus.DONE, summary)
+
+    def _finished(self, job: Job, task: asyncio.Task) -> None:
+        """Clean up after the task of the job, which may have been cancelled before
+        it started."""
+        if self._running.get(job.key) is job:
+            del self._running[job.key]
+        self._finished_ids.append(job.id)
+        while len(self._finished_ids) > self.max_finished_jobs:
+            self.jobs.pop(self._finished_ids.popleft(), None)
+        if job.done():
+            return
+        if task.cancelled():
+            job._finish(JobStatus.CANCELLED)
+        else:
+            job._finish(JobStatus.FAILED, error=task.exception())
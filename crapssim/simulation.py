@@ -0,0 +1,945 @@
+"""
+Run many table sessions of one strategy on a pool of processes. The sessions are split
+into chunks which run on separate processes, and the results of each session are put
+back in session order, so a Simulation gives exactly the same results for any number
+of processes or chunk size.
+
+The dice of session i are seeded with child i of the root SeedSequence, the same as
+session i of each configuration of crapssim.sweep.sweep.
+
+Simulation.run_records writes a record of each session (see RECORD_DTYPE) straight
+into a structured NumPy array in shared memory, so the worker processes don't send
+their results back through pickling, and the array can be handed to analysis code
+(in this process or another one attaching to it by name) without copying.
+
+Long runs can be checkpointed: Simulation.run with a checkpoint file saves the results
+of the finished sessions and the number of the next session to run, and running the
+same Simulation again with the file carries on from there, giving the same results as
+a run that wasn't interrupted.
+
+Simulation.summarize keeps only running summary statistics instead of the results of
+each session, along with the number of sessions run so far. Since that's also the
+number of the next child seed, SimulationSummary.extend can run more sessions on
+seeds none of the earlier sessions used and merge them into the statistics.
+"""
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import io
+import math
+import os
+import pathlib
+import time
+import typing
+import uuid
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from crapssim.progress import Progress, _chunk_counter
+from crapssim.strategy import Strategy
+from crapssim.sweep import SessionSummary, _run_session
+from crapssim.table import Table, TableSettings, TableUpdate
+
+if typing.TYPE_CHECKING:
+    from crapssim.cache import ResultCache
+
+__all__ = [
+    "BACKENDS",
+    "RECORD_DTYPE",
+    "SessionRecords",
+    "Simulation",
+    "SimulationResult",
+    "SimulationSummary",
+    "benchmark_backends",
+]
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("session", np.int64),
+        ("final_bankroll", np.float64),
+        ("rolls", np.int64),
+        ("max_bankroll", np.float64),
+        ("min_bankroll", np.float64),
+        ("risked", np.float64),
+        ("shooters", np.int64),
+    ]
+)
+"""Record of one session from Simulation.run_records. Bankrolls include the bets on
+the table, max_bankroll and min_bankroll are over the start of the session and the
+end of each roll, and risked is the total amount of new bets put on the table."""
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class SimulationResult:
+    """
+    The results of each session of a Simulation, in session order.
+    """
+
+    seed: int
+    """Root seed of the dice of the sessions."""
+    bankroll: float
+    """The starting bankroll of the player in each session."""
+    net: np.ndarray
+    """Net win (positive) or loss (negative) of each session."""
+    ruined: np.ndarray
+    """Whether the strategy completed (e.g. the player couldn't afford the next bet)
+    before the end of each session."""
+    rolls: np.ndarray
+    """Number of rolls of each session."""
+
+    @property
+    def n_sessions(self) -> int:
+        """Number of sessions run."""
+        return len(self.net)
+
+    @property
+    def final_bankroll(self) -> np.ndarray:
+        """Bankroll of the player (including bets on the table) at the end of each
+        session."""
+        return self.bankroll + self.net
+
+    @property
+    def summary(self) -> SessionSummary:
+        """Summary statistics of the sessions."""
+        return SessionSummary.from_sessions(
+            self.net.tolist(), self.ruined.tolist(), int(self.rolls.sum())
+        )
+
+
+def _write_atomic(path: str | os.PathLike, data: str | bytes) -> None:
+    """Write the file so other processes see all of it or none of it: write a
+    temporary file next to it and rename it into place."""
+    path = pathlib.Path(path)
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(temporary, "w" if isinstance(data, str) else "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+BACKENDS: dict[str, type[concurrent.futures.Executor]] = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor,
+}
+"""Executors sessions can be run on. Threads avoid starting processes and pickling
+the strategy and results, but only run sessions in parallel on free-threaded Python
+builds (e.g. 3.13t), since the sessions are pure Python."""
+
+
+def _map(
+    tasks: list[tuple], n_workers: int, backend: str = "process"
+) -> typing.Iterator[typing.Any]:
+    """Results of calling each task (a function and its arguments), in order of the
+    tasks."""
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown backend {backend!r}, must be one of {list(BACKENDS)}"
+        )
+    if n_workers == 1 or len(tasks) <= 1:
+        for function, *arguments in tasks:
+            yield function(*arguments)
+        return
+
+    executor = BACKENDS[backend](n_workers)
+    futures = []
+    try:
+        futures = [executor.submit(*x) for x in tasks]
+        for future in futures:
+            yield future.result()
+    finally:
+        # if the consumer stops early, drop the chunks which haven't started. Cancelled
+        # here too, as the process pool ignores cancel_futures once it's collected.
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _track(
+    tasks: list[tuple],
+    progress: Progress | None,
+    n_sessions: int,
+    resumed: int = 0,
+) -> list[tuple]:
+    """Start the progress reporting (if any) of a run of the tasks, one per chunk,
+    giving each task the name of the counters and its chunk as a last argument."""
+    if progress is None:
+        return tasks
+    name = progress.start(n_sessions, len(tasks), resumed)
+    return [(*x, (name, i)) for i, x in enumerate(tasks)]
+
+
+def _summarize_sessions(
+    strategy: Strategy,
+    bankroll: float,
+    max_rolls: float,
+    max_shooter: float,
+    seed: int,
+    runout: bool,
+    table_settings: TableSettings | None,
+    start: int,
+    stop: int,
+    progress: tuple[str, int] | None = None,
+) -> SessionSummary:
+    """Summary of sessions start to stop - 1."""
+    net, ruined, rolls = _run_sessions(
+        strategy,
+        bankroll,
+        max_rolls,
+        max_shooter,
+        seed,
+        runout,
+        table_settings,
+        start,
+        stop,
+        progress,
+    )
+    return SessionSummary.from_sessions(net.tolist(), ruined.tolist(), int(rolls.sum()))
+
+
+def _run_sessions(
+    strategy: Strategy,
+    bankroll: float,
+    max_rolls: float,
+    max_shooter: float,
+    seed: int,
+    runout: bool,
+    table_settings: TableSettings | None,
+    start: int,
+    stop: int,
+    progress: tuple[str, int] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Net win, whether the strategy completed and the number of rolls of sessions
+    start to stop - 1, counting each session in the progress counters (name, chunk)
+    if given."""
+    counters, chunk = _chunk_counter(progress)
+    results = []
+    try:
+        for i in range(start, stop):
+            results.append(
+                _run_session(
+                    strategy,
+                    bankroll,
+                    max_rolls,
+                    max_shooter,
+                    seed,
+                    i,
+                    runout,
+                    table_settings,
+                )
+            )
+            if counters is not None:
+                counters.add_session(chunk, results[-1][2])
+    finally:
+        if counters is not None:
+            counters.close()
+    net, ruined, rolls = zip(*results) if len(results) > 0 else ((), (), ())
+    return (
+        np.array(net, dtype=float),
+        np.array(ruined, dtype=bool),
+        np.array(rolls, dtype=int),
+    )
+
+
+class _RecordingUpdate(TableUpdate):
+    """TableUpdate adding up the amount of new bets the (only) player puts on the
+    table before each roll."""
+
+    def __init__(self) -> None:
+        self.risked = 0.0
+
+    def run_strategies(self, table: Table, verbose: bool = False) -> None:
+        # the bets added are those the strategy didn't find on the table, so taking a
+        # bet down doesn't hide a new one made on the same roll
+        player = table.players[0]
+        before = {id(x): x for x in player.bets}
+        super().run_strategies(table, verbose)
+        after = {id(x) for x in player.bets}
+        # adding to a placed bet replaces it with a bet of the total, of which only
+        # the increase is new
+        replaced: dict[typing.Hashable, float] = {}
+        for key, bet in before.items():
+            if key not in after:
+                replaced[bet._placed_key] = (
+                    replaced.get(bet._placed_key, 0.0) + bet.amount
+                )
+        for bet in player.bets:
+            if id(bet) not in before:
+                increase = bet.amount - replaced.pop(bet._placed_key, 0.0)
+                self.risked += max(increase, 0.0)
+
+
+def _record_session(
+    strategy: Strategy,
+    bankroll: float,
+    max_rolls: float,
+    max_shooter: float,
+    seed: int,
+    runout: bool,
+    table_settings: TableSettings | None,
+    i: int,
+) -> tuple:
+    """Record of session i as a tuple of the fields of RECORD_DTYPE. Runs the session
+    like Table.run, with the same dice and table as _run_session."""
+    table = Table(seed=np.random.SeedSequence(seed, spawn_key=(i,)))
+    if table_settings is not None:
+        table.settings.update(table_settings)
+    table.add_player(bankroll, strategy)
+    player = table.players[0]
+    update = _RecordingUpdate()
+    high = low = float(bankroll)
+    while True:
+        update.run(table)
+        cash = player.total_player_cash
+        high, low = max(high, cash), min(low, cash)
+        if not table.should_keep_rolling(max_rolls, max_shooter, runout):
+            table.n_shooters -= 1  # count was added but this shooter never rolled
+            break
+    return (
+        i,
+        player.total_player_cash,
+        table.dice.n_rolls,
+        high,
+        low,
+        update.risked,
+        table.n_shooters,
+    )
+
+
+class SessionRecords:
+    """
+    Structured array of session records (see RECORD_DTYPE) in shared memory. The
+    process that creates the records owns the shared memory and should unlink it when
+    done, e.g. by using the records as a context manager; other processes can attach
+    to it with SessionRecords.attach.
+    """
+
+    def __init__(
+        self, memory: shared_memory.SharedMemory, n_sessions: int, owner: bool
+    ):
+        self._memory = memory
+        self.owner = owner
+        self.records = np.ndarray((n_sessions,), dtype=RECORD_DTYPE, buffer=memory.buf)
+        """The records of the sessions, a view of the shared memory."""
+
+    @classmethod
+    def create(cls, n_sessions: int) -> "SessionRecords":
+        """New zeroed records for n_sessions sessions.
+
+        Parameters
+        ----------
+        n_sessions
+            Number of sessions.
+
+        Returns
+        -------
+        The SessionRecords, owning the new shared memory.
+        """
+        size = max(n_sessions * RECORD_DTYPE.itemsize, 1)
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        records = cls(memory, n_sessions, owner=True)
+        records.records[:] = 0
+        return records
+
+    @classmethod
+    def attach(cls, name: str, n_sessions: int) -> "SessionRecords":
+        """Attach to records created by another SessionRecords.
+
+        Parameters
+        ----------
+        name
+            The name of the shared memory of the records.
+        n_sessions
+            Number of sessions of the records.
+
+        Returns
+        -------
+        The SessionRecords, not owning the shared memory.
+        """
+        return cls(shared_memory.SharedMemory(name=name), n_sessions, owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory, for attach."""
+        return self._memory.name
+
+    def close(self) -> None:
+        """Close this process's view of the shared memory. The records array can't be
+        used afterwards, copy it first to keep it."""
+        self.records = self.records[:0].copy()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory, once every process has closed it."""
+        self._memory.unlink()
+
+    def __enter__(self) -> "SessionRecords":
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def _record_sessions(
+    name: str,
+    n_sessions: int,
+    settings: tuple,
+    start: int,
+    stop: int,
+    progress: tuple[str, int] | None = None,
+) -> None:
+    """Write the records of sessions start to stop - 1 into shared records."""
+    records = SessionRecords.attach(name, n_sessions)
+    counters, chunk = _chunk_counter(progress)
+    try:
+        for i in range(start, stop):
+            records.records[i] = record = _record_session(*settings, i)
+            if counters is not None:
+                counters.add_session(chunk, record[2])
+    finally:
+        records.close()
+        if counters is not None:
+            counters.close()
+
+
+@dataclass(slots=True, frozen=True)
+class SimulationSummary:
+    """
+    Running summary statistics of the sessions of a Simulation, which can be extended
+    with more sessions.
+    """
+
+    strategy: Strategy
+    """The strategy of the player."""
+    bankroll: float
+    """The starting bankroll of the player in each session."""
+    max_rolls: float
+    """Maximum number of rolls of each session."""
+    max_shooter: float
+    """Maximum number of shooters of each session."""
+    seed: int
+    """Root seed of the dice."""
+    summary: SessionSummary
+    """Summary of the sessions run so far."""
+    runout: bool = False
+    """Whether sessions carry on past max_rolls until the player has no bets left."""
+    table_settings: TableSettings | None = None
+    """Settings replacing the defaults of the Table, if any."""
+
+    @property
+    def n_sessions(self) -> int:
+        """Number of sessions run so far, which is also the number of the child seed
+        of the next session."""
+        return self.summary.n_sessions
+
+    def extend(
+        self,
+        n_sessions: int,
+        max_workers: int | None = None,
+        chunk_size: int = 100,
+        backend: str = "process",
+        progress: Progress | None = None,
+    ) -> "SimulationSummary":
+        """
+        Run more sessions and add them to the summary. The new sessions use the child
+        seeds after the ones already used, so no session is run twice.
+
+        Parameters
+        ----------
+        n_sessions
+            Number of sessions to add.
+        max_workers
+            Number of processes to use, defaults to the number of CPUs. If 1, the
+            sessions are run in this process.
+        chunk_size
+            Number of sessions a process runs at a time. The summaries of the chunks
+            are merged in order, so the results don't depend on max_workers, but
+            different chunk sizes can round differently.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see BACKENDS.
+        progress
+            Report the progress of the run, see crapssim.progress.
+
+        Returns
+        -------
+        A new SimulationSummary with the sessions of this one and the new ones.
+        """
+        extended = self
+        for extended in self.iter_extend(
+            n_sessions, max_workers, chunk_size, backend, progress
+        ):
+            pass
+        return extended
+
+    def iter_extend(
+        self,
+        n_sessions: int,
+        max_workers: int | None = None,
+        chunk_size: int = 100,
+        backend: str = "process",
+        progress: Progress | None = None,
+    ) -> typing.Iterator["SimulationSummary"]:
+        """
+        Run more sessions like extend, yielding the summary so far after each chunk,
+        e.g. to report running results of a long simulation.
+
+        Parameters
+        ----------
+        n_sessions
+            Number of sessions to add.
+        max_workers
+            Number of processes to use, as for extend.
+        chunk_size
+            Number of sessions a process runs at a time, as for extend.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see BACKENDS.
+        progress
+            Report the progress of the run, see crapssim.progress.
+
+        Yields
+        ------
+        A new SimulationSummary with the sessions of this one and the chunks finished
+        so far, in order.
+        """
+        settings = (
+            self.strategy,
+            self.bankroll,
+            self.max_rolls,
+            self.max_shooter,
+            self.seed,
+            self.runout,
+            self.table_settings,
+        )
+        stop = self.n_sessions + n_sessions
+        tasks = [
+            (_summarize_sessions, *settings, x, min(x + chunk_size, stop))
+            for x in range(self.n_sessions, stop, chunk_size)
+        ]
+        n_workers = max_workers or os.cpu_count() or 1
+        summary = self.summary
+        tasks = _track(tasks, progress, stop, resumed=self.n_sessions)
+        try:
+            # closed explicitly, so a consumer stopping early cancels the chunks
+            # which haven't started rather than waiting for them
+            with contextlib.closing(_map(tasks, n_workers, backend)) as chunks:
+                for chunk in chunks:
+                    summary = summary.merge(chunk)
+                    yield dataclasses.replace(self, summary=summary)
+        finally:
+            if progress is not None:
+                progress.stop()
+
+
+class Simulation:
+    """
+    Many table sessions of one strategy, each with one player starting with the same
+    bankroll, run until the maximum number of rolls or shooters is reached.
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        n_sessions: int,
+        bankroll: float = 100,
+        max_rolls: float = float("inf"),
+        max_shooter: float = 10,
+        seed: int | None = None,
+        runout: bool = False,
+        table_settings: TableSettings | None = None,
+    ):
+        """Set up the simulation.
+
+        Parameters
+        ----------
+        strategy
+            The strategy of the player. Each session plays a clone of it, and it's sent
+            to the worker processes so it must be picklable (e.g. not an AddIfTrue
+            with a lambda key) unless run with max_workers of 1.
+        n_sessions
+            Number of table sessions to run.
+        bankroll
+            The starting bankroll of the player in each session.
+        max_rolls
+            Maximum number of rolls of each session.
+        max_shooter
+            Maximum number of shooters of each session.
+        seed
+            Root seed of the dice. If None, a random seed is chosen, so running the
+            same Simulation again gives the same results.
+        runout
+            If True, each session carries on past max_rolls until the player has no
+            bets left on the table, as for Table.run.
+        table_settings
+            Settings (any of the keys of TableSettings) replacing the defaults of the
+            table of each session, e.g. {"max_odds": {4: 10, 5: 10, 6: 10, 8: 10,
+            9: 10, 10: 10}}.
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.strategy = strategy
+        self.n_sessions = n_sessions
+        self.bankroll = bankroll
+        self.max_rolls = max_rolls
+        self.max_shooter = max_shooter
+        self.seed = seed
+        self.runout = runout
+        self.table_settings = table_settings
+
+    def _settings(self) -> tuple:
+        return (
+            self.strategy,
+            self.bankroll,
+            self.max_rolls,
+            self.max_shooter,
+            self.seed,
+            self.runout,
+            self.table_settings,
+        )
+
+    def _chunks(
+        self, max_workers: int | None, chunk_size: int | None, start: int = 0
+    ) -> tuple[int, list[tuple[int, int]]]:
+        """Number of processes to use and the (start, stop) of each chunk of the
+        sessions from start on."""
+        n_workers = max_workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(self.n_sessions / (4 * n_workers)))
+        return n_workers, [
+            (x, min(x + chunk_size, self.n_sessions))
+            for x in range(start, self.n_sessions, chunk_size)
+        ]
+
+    def _load_checkpoint(
+        self, path: pathlib.Path
+    ) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """The next session to run and the results so far from the checkpoint, or
+        from the start if there's no checkpoint yet."""
+        if not path.exists():
+            return (
+                0,
+                np.zeros(self.n_sessions),
+                np.zeros(self.n_sessions, dtype=bool),
+                np.zeros(self.n_sessions, dtype=int),
+            )
+        with np.load(path) as checkpoint:
+            if str(checkpoint["simulation"]) != repr(self):
+                raise ValueError(
+                    f"Checkpoint {path} is for {checkpoint['simulation']}, not {self!r}"
+                )
+            return (
+                int(checkpoint["cursor"]),
+                checkpoint["net"],
+                checkpoint["ruined"],
+                checkpoint["rolls"],
+            )
+
+    def _save_checkpoint(
+        self,
+        path: pathlib.Path,
+        cursor: int,
+        net: np.ndarray,
+        ruined: np.ndarray,
+        rolls: np.ndarray,
+    ) -> None:
+        data = io.BytesIO()
+        np.savez(
+            data,
+            simulation=repr(self),
+            cursor=cursor,
+            net=net,
+            ruined=ruined,
+            rolls=rolls,
+        )
+        _write_atomic(path, data.getvalue())
+
+    def run(
+        self,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+        checkpoint: str | os.PathLike | None = None,
+        checkpoint_interval: float = 60,
+        backend: str = "process",
+        progress: Progress | None = None,
+        cache: "ResultCache | None" = None,
+    ) -> SimulationResult:
+        """
+        Run the sessions.
+
+        Parameters
+        ----------
+        max_workers
+            Number of processes to use, defaults to the number of CPUs. If 1, the
+            sessions are run in this process.
+        chunk_size
+            Number of sessions a process runs at a time. Defaults to enough chunks for
+            each process to get about four, which keeps the processes busy until the
+            end without sending many small chunks. Doesn't change the results.
+        checkpoint
+            File to save the results of the finished sessions in. If it exists, the
+            run carries on from the sessions it has. The file is replaced atomically,
+            so a run killed while saving leaves the previous checkpoint.
+        checkpoint_interval
+            Minimum number of seconds between saves of the checkpoint. It's also
+            saved at the end of the run.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see BACKENDS.
+        progress
+            Report the progress of the run, see crapssim.progress.
+        cache
+            If the results of this simulation are in the cache, they're returned
+            without running any sessions, otherwise they're stored in it after the
+            run. See crapssim.cache.
+
+        Returns
+        -------
+        The SimulationResult with the results of each session.
+
+        Raises
+        ------
+        ValueError
+            If the checkpoint is for a different simulation.
+        """
+        if cache is not None:
+            cached = cache.load(self)
+            if cached is not None:
+                return SimulationResult(
+                    self.seed,
+                    self.bankroll,
+                    cached["net"],
+                    cached["ruined"],
+                    cached["rolls"],
+                )
+
+        if checkpoint is not None:
+            checkpoint = pathlib.Path(checkpoint)
+            cursor, net, ruined, rolls = self._load_checkpoint(checkpoint)
+        else:
+            cursor = 0
+            net = np.zeros(self.n_sessions)
+            ruined = np.zeros(self.n_sessions, dtype=bool)
+            rolls = np.zeros(self.n_sessions, dtype=int)
+        n_workers, chunks = self._chunks(max_workers, chunk_size, start=cursor)
+        tasks = [(_run_sessions, *self._settings(), *x) for x in chunks]
+        tasks = _track(tasks, progress, self.n_sessions, resumed=cursor)
+
+        saved = time.monotonic()
+        try:
+            with contextlib.closing(_map(tasks, n_workers, backend)) as results:
+                for (start, stop), chunk in zip(chunks, results):
+                    net[start:stop], ruined[start:stop], rolls[start:stop] = chunk
+                    if checkpoint is not None and (
+                        stop == self.n_sessions
+                        or time.monotonic() - saved >= checkpoint_interval
+                    ):
+                        # chunks finish in order, so all sessions before stop are done
+                        self._save_checkpoint(checkpoint, stop, net, ruined, rolls)
+                        saved = time.monotonic()
+        finally:
+            if progress is not None:
+                progress.stop()
+        if cache is not None:
+            cache.store(self, {"net": net, "ruined": ruined, "rolls": rolls})
+        return SimulationResult(self.seed, self.bankroll, net, ruined, rolls)
+
+    def run_records(
+        self,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+        backend: str = "process",
+        progress: Progress | None = None,
+    ) -> SessionRecords:
+        """
+        Run the sessions, with each worker process writing the record of its sessions
+        straight into an array in shared memory.
+
+        Parameters
+        ----------
+        max_workers
+            Number of processes to use, defaults to the number of CPUs. If 1, the
+            sessions are run in this process.
+        chunk_size
+            Number of sessions a process runs at a time, as for run.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see BACKENDS.
+        progress
+            Report the progress of the run, see crapssim.progress.
+
+        Returns
+        -------
+        The SessionRecords with the record of each session in session order. Use
+        it as a context manager (or call close and unlink) to free the shared memory.
+        """
+        n_workers, chunks = self._chunks(max_workers, chunk_size)
+        records = SessionRecords.create(self.n_sessions)
+        try:
+            name, settings = records.name, self._settings()
+            tasks = [
+                (_record_sessions, name, self.n_sessions, settings, *x) for x in chunks
+            ]
+            tasks = _track(tasks, progress, self.n_sessions)
+            with contextlib.closing(_map(tasks, n_workers, backend)) as results:
+                for _ in results:
+                    pass
+        except BaseException:
+            records.close()
+            records.unlink()
+            raise
+        finally:
+            if progress is not None:
+                progress.stop()
+        return records
+
+    def summarize(
+        self,
+        max_workers: int | None = None,
+        chunk_size: int = 100,
+        backend: str = "process",
+        progress: Progress | None = None,
+        cache: "ResultCache | None" = None,
+    ) -> SimulationSummary:
+        """
+        Run the sessions, keeping only summary statistics, which can be extended with
+        more sessions later.
+
+        Parameters
+        ----------
+        max_workers
+            Number of processes to use, defaults to the number of CPUs. If 1, the
+            sessions are run in this process.
+        chunk_size
+            Number of sessions a process runs at a time, see SimulationSummary.extend.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see BACKENDS.
+        progress
+            Report the progress of the run, see crapssim.progress.
+        cache
+            If the summary of this simulation (with this chunk size) is in the cache,
+            it's returned without running any sessions, otherwise it's stored in it
+            after the run. See crapssim.cache.
+
+        Returns
+        -------
+        The SimulationSummary of the sessions.
+        """
+        if cache is not None:
+            cached = self._load_summary(cache, chunk_size)
+            if cached is not None:
+                return cached
+
+        result = self._empty_summary().extend(
+            self.n_sessions, max_workers, chunk_size, backend, progress
+        )
+        if cache is not None:
+            self._store_summary(cache, result, chunk_size)
+        return result
+
+    def _load_summary(
+        self, cache: "ResultCache", chunk_size: int
+    ) -> SimulationSummary | None:
+        """The summary of the simulation with the chunk size from the cache, if
+        it's there."""
+        cached = cache.load(self, "summary", chunk_size=chunk_size)
+        if cached is None:
+            return None
+        summary = SessionSummary(**{x: y.item() for x, y in cached.items()})
+        return dataclasses.replace(self._empty_summary(), summary=summary)
+
+    def _store_summary(
+        self, cache: "ResultCache", summary: SimulationSummary, chunk_size: int
+    ) -> None:
+        arrays = {
+            x: np.array(y) for x, y in dataclasses.asdict(summary.summary).items()
+        }
+        cache.store(self, arrays, "summary", chunk_size=chunk_size)
+
+    def iter_summarize(
+        self,
+        max_workers: int | None = None,
+        chunk_size: int = 100,
+        backend: str = "process",
+        progress: Progress | None = None,
+    ) -> typing.Iterator[SimulationSummary]:
+        """
+        Run the sessions like summarize, yielding the summary so far after each chunk.
+
+        Parameters
+        ----------
+        max_workers
+            Number of processes to use, defaults to the number of CPUs. If 1, the
+            sessions are run in this process.
+        chunk_size
+            Number of sessions a process runs at a time, see SimulationSummary.extend.
+        backend
+            Run the chunks on worker "process"es or "thread"s, see BACKENDS.
+        progress
+            Report the progress of the run, see crapssim.progress.
+
+        Yields
+        ------
+        The SimulationSummary of the chunks finished so far, in order.
+        """
+        return self._empty_summary().iter_extend(
+            self.n_sessions, max_workers, chunk_size, backend, progress
+        )
+
+    def _empty_summary(self) -> SimulationSummary:
+        return SimulationSummary(
+            self.strategy,
+            self.bankroll,
+            self.max_rolls,
+            self.max_shooter,
+            self.seed,
+            SessionSummary.from_sessions([], [], 0),
+            self.runout,
+            self.table_settings,
+        )
+
+    def __repr__(self) -> str:
+        # optional settings are only shown when set, so the repr (and checkpoints
+        # keyed by it) of simulations without them stays the same
+        optional = ""
+        if self.runout:
+            optional += ", runout=True"
+        if self.table_settings is not None:
+            optional += f", table_settings={self.table_settings!r}"
+        return (
+            f"{self.__class__.__name__}({self.strategy!r}, "
+            f"n_sessions={self.n_sessions}, bankroll={self.bankroll}, "
+            f"max_rolls={self.max_rolls}, max_shooter={self.max_shooter}, "
+            f"seed={self.seed}{optional})"
+        )
+
+
+def benchmark_backends(
+    simulation: Simulation,
+    max_workers: int | None = None,
+    backends: typing.Iterable[str] = ("thread", "process"),
+) -> dict[str, float]:
+    """
+    Time running the simulation on each backend, to pick the faster one for this
+    machine and Python build.
+
+    Parameters
+    ----------
+    simulation
+        The simulation to run.
+    max_workers
+        Number of workers of each backend, defaults to the number of CPUs.
+    backends
+        The backends to compare, see BACKENDS.
+
+    Returns
+    -------
+    The wall time of the run on each backend, in seconds.
+    """
+    times = {}
+    for backend in backends:
+        start = time.perf_counter()
+        simulation.run(max_workers, backend=backend)
+        times[backend] = time.perf_counter() - start
+    return times
@@ -4,6 +4,8 @@ player should make, remove, or change. Strategies are applied for the player to
 after the previous bets and table have been updated.
 """
 
+from crapssim.strategy.compiler import CompiledStrategy, compile_strategy
+from crapssim.strategy.memo import MemoizedStrategy
 from crapssim.strategy.odds import (
     ComeOddsMultiplier,
     DontComeOddsMultiplier,
@@ -12,7 +14,24 @@ from crapssim.strategy.odds import (
     OddsMultiplier,
     PassLineOddsMultiplier,
 )
+from crapssim.strategy.predicates import (
+    AllOf,
+    AnyOf,
+    BankrollAbove,
+    CountBelow,
+    HasBet,
+    HasBetOfType,
+    IsBetType,
+    MatchesBet,
+    NewShooter,
+    Not,
+    PointIs,
+    PointOff,
+    PointOn,
+    Predicate,
+)
 from crapssim.strategy.single_bet import BetDontPass, BetPassLine, BetPlace
+from crapssim.strategy.spec import load_spec, spec_hash, strategy_from_spec
 from crapssim.strategy.tools import (
     AddIfNewShooter,
     AddIfNotBet,
@@ -0,0 +1,544 @@
+"""
+Compile a strategy into a flat program of rules. AggregateStrategy trees made of the
+strategies in this package (AddIfTrue variants, CountStrategy, RemoveByType,
+RemoveIfPointOff, the single bet strategies, BetPlace and the odds strategies) are
+flattened into one list of rules, which are evaluated in a single pass against an
+index of the player's bets instead of each strategy scanning player.bets on its own.
+AddIfTrue and RemoveIfTrue with a Predicate key are compiled to rules calling the
+compiled predicate. Anything the compiler doesn't recognise, like an AddIfTrue with a
+lambda key or a strategy with its own update_bets, is kept as a rule that calls the
+strategy as usual, so any strategy can be compiled.
+"""
+
+import typing
+
+from crapssim.bet import Bet, Come, HardWay, Hop, Place, get_type_mask
+from crapssim.strategy.odds import OddsAmount, OddsMultiplier
+from crapssim.strategy.predicates import Predicate
+from crapssim.strategy.single_bet import BetPlace, _BaseSingleBet
+from crapssim.strategy.tools import (
+    AddIfNewShooter,
+    AddIfNotBet,
+    AddIfPointOff,
+    AddIfPointOn,
+    AddIfTrue,
+    AggregateStrategy,
+    CountStrategy,
+    Player,
+    RemoveByType,
+    RemoveIfPointOff,
+    RemoveIfTrue,
+    Strategy,
+)
+
+__all__ = ["CompiledStrategy", "compile_strategy"]
+
+
+class _BetIndex:
+    """Index of the table point and the player's bets for one call to update_bets. Counts
+    of bets by type are computed the first time they're needed, and rules that change
+    the bets invalidate the index so they're computed again from the new bets."""
+
+    __slots__ = (
+        "player",
+        "point_status",
+        "point_number",
+        "_keys",
+        "_placed_keys",
+        "_masks",
+        "_numbers",
+        "_counts",
+        "_total",
+    )
+
+    def __init__(self, player: Player):
+        self.player = player
+        self.point_status = player.table.point.status
+        self.point_number = player.table.point.number
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._keys: set[typing.Hashable] | None = None
+        self._placed_keys: set[typing.Hashable] | None = None
+        self._masks: list[int] | None = None
+        self._numbers: dict[int, set[int | None]] = {}
+        self._counts: dict[int, int] = {}
+        self._total: float | None = None
+
+    def contains(self, hash_key: typing.Hashable) -> bool:
+        """True if the player has a bet equal to a bet with the given _hash_key."""
+        if self._keys is None:
+            self._keys = {x._hash_key for x in self.player.bets}
+        return hash_key in self._keys
+
+    def placed(self, placed_key: typing.Hashable) -> bool:
+        """True if the player has a bet with the given _placed_key, like already_placed."""
+        if self._placed_keys is None:
+            self._placed_keys = {x._placed_key for x in self.player.bets}
+        return placed_key in self._placed_keys
+
+    def count(self, type_mask: int) -> int:
+        """Number of the player's bets matching the type mask, like get_bets_by_type."""
+        count = self._counts.get(type_mask)
+        if count is None:
+            if self._masks is None:
+                self._masks = [x.__class__.family_mask for x in self.player.bets]
+            count = sum(1 for x in self._masks if x & type_mask)
+            self._counts[type_mask] = count
+        return count
+
+    def numbers(self, type_mask: int) -> set[int | None]:
+        """Numbers of the player's bets matching the type mask."""
+        numbers = self._numbers.get(type_mask)
+        if numbers is None:
+            numbers = {
+                x.number
+                for x in self.player.bets
+                if x.__class__.family_mask & type_mask
+            }
+            self._numbers[type_mask] = numbers
+        return numbers
+
+    def total(self) -> float:
+        if self._total is None:
+            self._total = sum(x.amount for x in self.player.bets)
+        return self._total
+
+
+class _Rule:
+    """One rule of a compiled program. If skip() is True the rule and the rules for its
+    children (the span - 1 rules after it) are skipped, otherwise apply() is run and the
+    program moves on to the next rule.
+
+    completed() is the completed() of the strategy the rule was compiled from, and
+    guarded rules are skipped when it's True like AggregateStrategy does for its
+    children."""
+
+    __slots__ = ("guarded", "span")
+
+    def __init__(self, guarded: bool):
+        self.guarded = guarded
+        self.span = 1
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return False
+
+    def skip(self, player: Player, index: _BetIndex) -> bool:
+        return self.guarded and self.completed(player, index)
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        pass
+
+
+class _InterpretedRule(_Rule):
+    """Rule that runs a strategy the compiler doesn't know how to flatten."""
+
+    __slots__ = ("strategy",)
+
+    def __init__(self, strategy: Strategy, guarded: bool):
+        super().__init__(guarded)
+        self.strategy = strategy
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return self.strategy.completed(player)
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        self.strategy.update_bets(player)
+        index.invalidate()
+
+
+class _AggregateRule(_Rule):
+    """Head of the rules for an AggregateStrategy, completed when all the children are."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: list[_Rule]):
+        super().__init__(guarded=True)
+        self.children = children
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return all(x.completed(player, index) for x in self.children)
+
+
+class _AddRule(_Rule):
+    """Rule for AddIfNotBet, AddIfPointOff, AddIfPointOn, AddIfNewShooter and
+    CountStrategy."""
+
+    __slots__ = ("bet", "hash_key", "condition", "count_mask", "count")
+
+    def __init__(
+        self,
+        bet: Bet,
+        condition: typing.Type[AddIfTrue],
+        guarded: bool,
+        count_mask: int = 0,
+        count: int = 0,
+    ):
+        super().__init__(guarded)
+        self.bet = bet
+        self.hash_key = bet._hash_key
+        self.condition = condition
+        self.count_mask = count_mask
+        self.count = count
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return self.bet.amount > player.bankroll and index.total() == 0
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        if self.condition is AddIfPointOff:
+            add = index.point_status == "Off"
+        elif self.condition is AddIfPointOn:
+            add = index.point_status == "On"
+        elif self.condition is AddIfNewShooter:
+            add = player.table.new_shooter
+        elif self.condition is CountStrategy:
+            add = index.count(self.count_mask) < self.count
+        else:
+            add = True
+
+        if add and not index.contains(self.hash_key) and self.bet.is_allowed(player):
+            player.add_bet(self.bet)
+            index.invalidate()
+
+
+class _RemoveRule(_Rule):
+    """Rule for RemoveByType and RemoveIfPointOff."""
+
+    __slots__ = ("type_mask", "attribute", "value", "point_off")
+
+    def __init__(
+        self,
+        type_mask: int,
+        guarded: bool,
+        attribute: str | None = None,
+        value: typing.Any = None,
+        point_off: bool = False,
+    ):
+        super().__init__(guarded)
+        self.type_mask = type_mask
+        self.attribute = attribute
+        self.value = value
+        self.point_off = point_off
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return index.total() == 0
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        if self.point_off and index.point_status != "Off":
+            return
+        if index.count(self.type_mask) == 0:
+            return
+        bets_to_remove = [
+            x
+            for x in player.bets
+            if x.__class__.family_mask & self.type_mask
+            and (self.attribute is None or getattr(x, self.attribute) == self.value)
+        ]
+        for bet in bets_to_remove:
+            player.remove_bet(bet)
+        index.invalidate()
+
+
+class _PredicateAddRule(_Rule):
+    """Rule for AddIfTrue with a Predicate key."""
+
+    __slots__ = ("bet", "check")
+
+    def __init__(self, bet: Bet, key: Predicate, guarded: bool):
+        super().__init__(guarded)
+        self.bet = bet
+        self.check = key.compile()
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return self.bet.amount > player.bankroll and index.total() == 0
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        if self.check(player) and self.bet.is_allowed(player):
+            player.add_bet(self.bet)
+            index.invalidate()
+
+
+class _PredicateRemoveRule(_Rule):
+    """Rule for RemoveIfTrue with a Predicate key."""
+
+    __slots__ = ("check",)
+
+    def __init__(self, key: Predicate, guarded: bool):
+        super().__init__(guarded)
+        self.check = key.compile()
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return index.total() == 0
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        bets_to_remove = [x for x in player.bets if self.check(x, player)]
+        for bet in bets_to_remove:
+            player.remove_bet(bet)
+        if len(bets_to_remove) > 0:
+            index.invalidate()
+
+
+class _SingleBetRule(_Rule):
+    """Head of the rules for a _BaseSingleBet, which are skipped if the bet isn't
+    allowed."""
+
+    __slots__ = ("bet",)
+
+    def __init__(self, bet: Bet, guarded: bool):
+        super().__init__(guarded)
+        self.bet = bet
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return player.bankroll < self.bet.amount and len(player.bets) == 0
+
+    def skip(self, player: Player, index: _BetIndex) -> bool:
+        return super().skip(player, index) or not self.bet.is_allowed(player)
+
+
+class _BetPlaceRule(_Rule):
+    """Head of the rules for a BetPlace, which removes the Place bet on the point if
+    skip_point is True."""
+
+    __slots__ = ("min_amount", "skip_point")
+
+    def __init__(self, strategy: BetPlace, guarded: bool):
+        super().__init__(guarded)
+        self.min_amount = min(x for x in strategy.place_bet_amounts.values())
+        self.skip_point = strategy.skip_point
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return player.bankroll < self.min_amount and index.count(Place.type_mask) == 0
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        if not self.skip_point or index.count(Place.type_mask) == 0:
+            return
+        point = index.point_number
+        for bet in player.get_bets_by_type(Place):
+            if bet.number == point:
+                player.remove_bet(bet)
+                index.invalidate()
+
+
+class _PlaceNumberRule(_Rule):
+    """Head of the rules for the Place bet on one number of a BetPlace, skipped for the
+    point or a number with a Come bet depending on skip_point and skip_come."""
+
+    __slots__ = ("number", "skip_point", "skip_come")
+
+    def __init__(self, number: int, skip_point: bool, skip_come: bool):
+        super().__init__(guarded=False)
+        self.number = number
+        self.skip_point = skip_point
+        self.skip_come = skip_come
+
+    def skip(self, player: Player, index: _BetIndex) -> bool:
+        if self.skip_point and self.number == index.point_number:
+            return True
+        if self.skip_come:
+            return self.number in index.numbers(Come.type_mask)
+        return False
+
+
+class _OddsRule(_Rule):
+    """Rule for OddsAmount and OddsMultiplier, which make their (cached) Odds bets
+    themselves once the index shows there are base bets to add odds to."""
+
+    __slots__ = ("strategy", "base_mask")
+
+    def __init__(self, strategy: OddsAmount | OddsMultiplier, guarded: bool):
+        super().__init__(guarded)
+        self.strategy = strategy
+        self.base_mask = get_type_mask(strategy.base_type)
+
+    def completed(self, player: Player, index: _BetIndex) -> bool:
+        return index.count(self.base_mask) == 0
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        self.strategy.update_bets(player)
+        index.invalidate()
+
+
+class _OddsMultiplierRule(_OddsRule):
+    """Rule for OddsMultiplier, which uses the index to skip the Odds bets that are
+    already placed."""
+
+    __slots__ = ()
+
+    def apply(self, player: Player, index: _BetIndex) -> None:
+        strategy = self.strategy
+        for bet in player.get_bets_by_type(strategy.base_type):
+            point = strategy.get_point_number(bet, player.table)
+            if point not in strategy._odds_multiplier:
+                return
+            odds_bet = strategy.get_odds_bet(
+                point, bet.amount * strategy._odds_multiplier[point]
+            )
+            if not index.placed(odds_bet._placed_key) and odds_bet.is_allowed(player):
+                player.add_bet(odds_bet)
+                index.invalidate()
+
+
+def _inherits(strategy: Strategy, base: type, *methods: str) -> bool:
+    """True if the strategy is a base and uses the base's version of the methods, so the
+    compiler knows what it does."""
+    return isinstance(strategy, base) and all(
+        getattr(type(strategy), x) is getattr(base, x) for x in methods
+    )
+
+
+def _with_children(head: _Rule, children: list[_Rule]) -> list[_Rule]:
+    head.span = 1 + len(children)
+    return [head] + children
+
+
+def _compile(strategy: Strategy, guarded: bool) -> list[_Rule]:
+    """The rules for the strategy. Apart from an unguarded AggregateStrategy, the first
+    rule is the head rule for the strategy with the rules of its children after it."""
+    strategy_type = type(strategy)
+
+    if _inherits(strategy, AggregateStrategy, "update_bets", "completed"):
+        programs = [_compile(x, guarded=True) for x in strategy.strategies]
+        children = [rule for x in programs for rule in x]
+        if not guarded:
+            # the head of an unguarded aggregate is never skipped and does nothing
+            return children
+        return _with_children(_AggregateRule([x[0] for x in programs]), children)
+
+    if strategy_type in (AddIfNotBet, AddIfPointOff, AddIfPointOn, AddIfNewShooter):
+        return [_AddRule(strategy.bet, strategy_type, guarded)]
+
+    if strategy_type is CountStrategy:
+        mask = get_type_mask(strategy.bet_type)
+        return [_AddRule(strategy.bet, CountStrategy, guarded, mask, strategy.count)]
+
+    if strategy_type is RemoveByType:
+        return [_RemoveRule(get_type_mask(strategy.bet_type), guarded)]
+
+    if strategy_type is RemoveIfPointOff:
+        bet = strategy.bet
+        if bet.family_mask & Place.type_mask:
+            return [_RemoveRule(Place.type_mask, guarded, "number", bet.number, True)]
+        if bet.family_mask & HardWay.type_mask:
+            return [_RemoveRule(HardWay.type_mask, guarded, "number", bet.number, True)]
+        if bet.family_mask & Hop.type_mask:
+            return [_RemoveRule(Hop.type_mask, guarded, "result", bet.result, True)]
+        return [_RemoveRule(bet.type_mask, guarded, point_off=True)]
+
+    if (
+        _inherits(strategy, AddIfTrue, "update_bets", "completed")
+        and isinstance(strategy.key, Predicate)
+        and not strategy.key.on_bets
+    ):
+        return [_PredicateAddRule(strategy.bet, strategy.key, guarded)]
+
+    if (
+        _inherits(strategy, RemoveIfTrue, "update_bets", "completed")
+        and isinstance(strategy.key, Predicate)
+        and strategy.key.on_bets
+    ):
+        return [_PredicateRemoveRule(strategy.key, guarded)]
+
+    if _inherits(strategy, _BaseSingleBet, "update_bets", "completed"):
+        if len(strategy._mode_strategies) == 0:
+            return [_InterpretedRule(strategy, guarded)]
+        children = [
+            rule
+            for x in strategy._mode_strategies
+            for rule in _compile(x, guarded=False)
+        ]
+        return _with_children(_SingleBetRule(strategy.bet, guarded), children)
+
+    if _inherits(strategy, BetPlace, "update_bets", "completed", "remove_point_bet"):
+        children = []
+        for number, single_bet in strategy._place_strategies.items():
+            children += _with_children(
+                _PlaceNumberRule(number, strategy.skip_point, strategy.skip_come),
+                _compile(single_bet, guarded=False),
+            )
+        return _with_children(_BetPlaceRule(strategy, guarded), children)
+
+    if _inherits(strategy, OddsMultiplier, "update_bets", "completed"):
+        return [_OddsMultiplierRule(strategy, guarded)]
+
+    if _inherits(strategy, OddsAmount, "update_bets", "completed"):
+        return [_OddsRule(strategy, guarded)]
+
+    return [_InterpretedRule(strategy, guarded)]
+
+
+class CompiledStrategy(Strategy):
+    """A strategy compiled into a flat program of rules by compile_strategy. Makes the same
+    bets as the strategy it was compiled from."""
+
+    _shared_attributes = frozenset({"rules", "_program"})
+    memoizable = True
+
+    def __init__(self, strategy: Strategy):
+        """Compile the given strategy.
+
+        Parameters
+        ----------
+        strategy
+            The strategy to compile.
+        """
+        self.strategy = strategy
+        self.rules: tuple[_Rule, ...] = tuple(_compile(strategy, guarded=False))
+        self._program = tuple((x.skip, x.apply, x.span) for x in self.rules)
+
+    def clone(self) -> "CompiledStrategy":
+        # the rules refer to the sub-strategies, so compile the clone of the strategy
+        return CompiledStrategy(self.strategy.clone())
+
+    @property
+    def n_interpreted(self) -> int:
+        """Number of rules that call back into a strategy's own update_bets."""
+        return sum(isinstance(x, _InterpretedRule) for x in self.rules)
+
+    def after_roll(self, player: Player) -> None:
+        self.strategy.after_roll(player)
+
+    def completed(self, player: Player) -> bool:
+        return self.strategy.completed(player)
+
+    def update_bets(self, player: Player) -> None:
+        """Run the rules of the program in order, skipping the rules of any strategies that
+        are completed.
+
+        Parameters
+        ----------
+        player
+            The player to update the bets for.
+        """
+        index = _BetIndex(player)
+        program = self._program
+        n_rules = len(program)
+        i = 0
+        while i < n_rules:
+            skip, apply, span = program[i]
+            if skip(player, index):
+                i += span
+            else:
+                apply(player, index)
+                i += 1
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.strategy!r})"
+
+
+def compile_strategy(strategy: Strategy) -> CompiledStrategy:
+    """Compile a strategy into a flat program of rules evaluated against an index of the
+    player's bets.
+
+    Parameters
+    ----------
+    strategy
+        The strategy to compile. Parts of the strategy the compiler can't flatten are
+        run through their own update_bets, so any strategy can be compiled.
+
+    Returns
+    -------
+    A CompiledStrategy that makes the same bets as the given strategy.
+    """
+    if isinstance(strategy, CompiledStrategy):
+        return strategy
+    return CompiledStrategy(strategy)
@@ -17,6 +17,7 @@ from crapssim.strategy.single_bet import (
     BetPlace,
     StrategyMode,
 )
+from crapssim.strategy.predicates import HasBetOfType
 from crapssim.strategy.tools import (
     AddIfNotBet,
     AddIfPointOff,
@@ -29,6 +30,7 @@ from crapssim.strategy.tools import (
     RemoveIfTrue,
     Strategy,
     WinProgression,
+    _Setting,
 )
 
 
@@ -135,6 +137,18 @@ class Place68Move59(Strategy):
     """Strategy that makes place bets on the six and eight, and then if a PassLine or Come bet with
     that point comes up, moves the place bet to 5 or 9."""
 
+    _shared_attributes = frozenset(
+        {
+            "_pass_come_amount",
+            "_six_eight_amount",
+            "_five_nine_amount",
+            "_pass_line_bet",
+            "_come_bets",
+            "_place_strategies",
+        }
+    )
+    memoizable = True
+
     def __init__(
         self,
         pass_come_amount: float = 5,
@@ -155,9 +169,35 @@ class Place68Move59(Strategy):
             The amount of the Place5 and Place9 bets.
         """
         super().__init__()
-        self.pass_come_amount = float(pass_come_amount)
-        self.six_eight_amount = float(six_eight_amount)
-        self.five_nine_amount = float(five_nine_amount)
+        self._pass_come_amount = float(pass_come_amount)
+        self._six_eight_amount = float(six_eight_amount)
+        self._five_nine_amount = float(five_nine_amount)
+        self._build_strategies()
+
+    pass_come_amount = _Setting(float)
+    """The amount of the PassLine and Come bets."""
+    six_eight_amount = _Setting(float)
+    """The amount of the Place6 and Place8 bets."""
+    five_nine_amount = _Setting(float)
+    """The amount of the Place5 and Place9 bets."""
+
+    def _build_strategies(self) -> None:
+        """Build the bets and strategies for the amounts, once rather than on every call to
+        update_bets."""
+        self._pass_line_bet = PassLine(self._pass_come_amount)
+        self._come_bets = {
+            number: Come(self._pass_come_amount, number) for number in (6, 8, 9, 10)
+        }
+        place_amounts = {
+            6: self._six_eight_amount,
+            8: self._six_eight_amount,
+            5: self._five_nine_amount,
+            9: self._five_nine_amount,
+        }
+        self._place_strategies = {
+            number: AddIfNotBet(Place(number, amount))
+            for number, amount in place_amounts.items()
+        }
 
     def completed(self, player: Player) -> bool:
         """The strategy is completed if the player has no bets on the table, and the players
@@ -174,9 +214,9 @@ class Place68Move59(Strategy):
         """
         return (
             len(player.bets) == 0
-            and player.bankroll < self.pass_come_amount
-            and player.bankroll < self.six_eight_amount
-            and player.bankroll < self.five_nine_amount
+            and player.bankroll < self._pass_come_amount
+            and player.bankroll < self._six_eight_amount
+            and player.bankroll < self._five_nine_amount
         )
 
     def get_pass_line_come_points(self, player: Player) -> list[int]:
@@ -196,10 +236,10 @@ class Place68Move59(Strategy):
         for number in (6, 8, 9, 10):
             if (
                 player.table.point.number == number
-                and PassLine(self.pass_come_amount) in player.bets
+                and self._pass_line_bet in player.bets
             ):
                 pass_line_come_points.append(number)
-            elif Come(self.pass_come_amount, number) in player.bets:
+            elif self._come_bets[number] in player.bets:
                 pass_line_come_points.append(number)
         return pass_line_come_points
 
@@ -215,26 +255,18 @@ class Place68Move59(Strategy):
         player
             The player to check on bets and add bets for.
         """
-        place_amounts = {
-            5: self.five_nine_amount,
-            6: self.six_eight_amount,
-            8: self.six_eight_amount,
-            9: self.five_nine_amount,
-        }
-
         if player.table.point.status == "Off":
             return
 
-        for number in (6, 8, 5, 9):
-            bet = Place(number, place_amounts[number])
-
-            if number in self.get_pass_line_come_points(player):
-                if bet in player.bets:
-                    player.remove_bet(bet)
+        pass_line_come_points = self.get_pass_line_come_points(player)
+        for number, strategy in self._place_strategies.items():
+            if number in pass_line_come_points:
+                if strategy.bet in player.bets:
+                    player.remove_bet(strategy.bet)
                 continue
 
-            if len([x for x in player.bets if isinstance(x, Place)]) < 2:
-                AddIfNotBet(bet).update_bets(player)
+            if len(player.get_bets_by_type(Place)) < 2:
+                strategy.update_bets(player)
 
     def __repr__(self) -> str:
         return (
@@ -291,6 +323,8 @@ class Place682Come(AggregateStrategy):
     table. If the point is On, places the 6 and 8 and if there are less than 2 Come bets on the
     table and less than 4 bets overall places a Come bet."""
 
+    memoizable = True
+
     def __init__(
         self,
         pass_come_amount: float = 5,
@@ -312,9 +346,26 @@ class Place682Come(AggregateStrategy):
             The amount of the Place5 and Place9 bets.
         """
         super().__init__(*strategies)
-        self.pass_come_amount = float(pass_come_amount)
-        self.six_eight_amount = float(six_eight_amount)
-        self.five_nine_amount = float(five_nine_amount)
+        self._pass_come_amount = float(pass_come_amount)
+        self._six_eight_amount = float(six_eight_amount)
+        self._five_nine_amount = float(five_nine_amount)
+        self._build_strategies()
+
+    pass_come_amount = _Setting(float)
+    """The amount of the PassLine and Come bets."""
+    six_eight_amount = _Setting(float)
+    """The amount of the Place6 and Place8 bets."""
+    five_nine_amount = _Setting(float)
+    """The amount of the Place5 and Place9 bets."""
+
+    def _build_strategies(self) -> None:
+        """Build the strategies for the amounts, once rather than on every call to
+        update_bets."""
+        self._pass_line_strategy = BetPassLine(self._pass_come_amount)
+        self._come_strategy = BetCome(self._pass_come_amount)
+        self._place_strategy = Place68Move59(
+            self._pass_come_amount, self._six_eight_amount, self._five_nine_amount
+        )
 
     def update_bets(self, player: Player) -> None:
         """If the player has less than 2 PassLine and Come bets, make the bet (depending on whether
@@ -327,16 +378,12 @@ class Place682Come(AggregateStrategy):
             The player to check on and make the bets for.
         """
 
-        pass_come_count = len(
-            [x for x in player.bets if isinstance(x, (PassLine, Come))]
-        )
+        pass_come_count = len(player.get_bets_by_type((PassLine, Come)))
         if pass_come_count < 2:
-            BetPassLine(self.pass_come_amount).update_bets(player)  # if point off
-            BetCome(self.pass_come_amount).update_bets(player)  # if point on
+            self._pass_line_strategy.update_bets(player)  # if point off
+            self._come_strategy.update_bets(player)  # if point on
 
-        Place68Move59(
-            self.pass_come_amount, self.six_eight_amount, self.five_nine_amount
-        ).update_bets(player)
+        self._place_strategy.update_bets(player)
 
     def __repr__(self) -> str:
         return (
@@ -388,6 +435,22 @@ class HammerLock(Strategy):
     taken down.
     """
 
+    _shared_attributes = frozenset(
+        {
+            "_base_amount",
+            "_start_six_eight_amount",
+            "_end_six_eight_amount",
+            "_five_nine_amount",
+            "_odds_multiplier",
+            "_remove_place_strategy",
+            "_pass_line_strategy",
+            "_dont_pass_strategy",
+            "_place68_strategy",
+            "_place5689_strategy",
+        }
+    )
+    memoizable = True
+
     def __init__(self, base_amount: float):
         """Creates the HammerLock strategy with all bet amounts being created from the given
         base_amount.
@@ -398,14 +461,52 @@ class HammerLock(Strategy):
             the base amount for PassLine and DontPass Bets, and Place5 and Place9 bets. Place6 and
             Place8 starts at (6/5) * 2 * this amount and if it wins moves to (6 / 5) * this amount.
         """
-        self.base_amount = float(base_amount)
-        self.start_six_eight_amount = (6 / 5) * base_amount * 2
-        self.end_six_eight_amount = (6 / 5) * base_amount
-        self.five_nine_amount = base_amount
-        self.odds_multiplier = 6
+        self._base_amount = float(base_amount)
+        self._start_six_eight_amount = (6 / 5) * base_amount * 2
+        self._end_six_eight_amount = (6 / 5) * base_amount
+        self._five_nine_amount = base_amount
+        self._odds_multiplier = 6
 
         self.place_win_count: int = 0
 
+        self._remove_place_strategy = RemoveByType(Place)
+        self._build_strategies()
+
+    base_amount = _Setting(float)
+    """The amount of the PassLine and DontPass bets."""
+    start_six_eight_amount = _Setting(float)
+    """The amount of the Place6 and Place8 bets until one of them wins."""
+    end_six_eight_amount = _Setting(float)
+    """The amount of the Place6 and Place8 bets after one of them wins."""
+    five_nine_amount = _Setting(float)
+    """The amount of the Place5 and Place9 bets."""
+    odds_multiplier = _Setting()
+    """The multiplier of the LayOdds on the DontPass bet."""
+
+    def _build_strategies(self) -> None:
+        """Build the strategies for the amounts, once rather than on every call to
+        update_bets."""
+        self._pass_line_strategy = BetPassLine(
+            self._base_amount, StrategyMode.ADD_IF_NOT_BET
+        )
+        self._dont_pass_strategy = BetDontPass(
+            self._base_amount, StrategyMode.ADD_IF_NOT_BET
+        )
+        self._place68_strategy = BetPlace(
+            {6: self._start_six_eight_amount, 8: self._start_six_eight_amount},
+            skip_point=False,
+        )
+        self._place5689_strategy = BetPlace(
+            {
+                5: self._five_nine_amount,
+                6: self._end_six_eight_amount,
+                8: self._end_six_eight_amount,
+                9: self._five_nine_amount,
+            },
+            skip_point=False,
+        )
+        self._dont_pass_odds_strategy = DontPassOddsMultiplier(self._odds_multiplier)
+
     def completed(self, player: Player) -> bool:
         """The strategy is completed if the player can no longer make the initial PassLine bet
         because their bankroll is too low, and they have no more bets on the table.
@@ -418,7 +519,7 @@ class HammerLock(Strategy):
         -------
 
         """
-        return player.bankroll < self.base_amount and len(player.bets) == 0
+        return player.bankroll < self._base_amount and len(player.bets) == 0
 
     def after_roll(self, player: Player) -> None:
         """Update the place_win_count based on how many Place bets are won. If table.point.status is
@@ -430,7 +531,7 @@ class HammerLock(Strategy):
         """
         place_bets = player.get_bets_by_type((Place,))
         winning_place_bets = [
-            bet for bet in place_bets if bet.get_result(player.table).won
+            bet for bet in place_bets if player.get_bet_result(bet).won
         ]
         self.place_win_count += len(winning_place_bets)
         if player.table.point.status == "On" and player.table.dice.total == 7:
@@ -453,33 +554,23 @@ class HammerLock(Strategy):
         elif self.place_win_count == 1:
             self.place5689(player)
         elif self.place_win_count == 2:
-            RemoveByType(Place).update_bets(player)
-        DontPassOddsMultiplier(self.odds_multiplier).update_bets(player)
+            self._remove_place_strategy.update_bets(player)
+        self._dont_pass_odds_strategy.update_bets(player)
 
     def pass_and_dontpass(self, player: Player) -> None:
         """Update bets when point is Off: add a PassLine and a DontPass bet if they don't already exist."""
-        RemoveByType(Place).update_bets(player)
-        BetPassLine(self.base_amount, StrategyMode.ADD_IF_NOT_BET).update_bets(player)
-        BetDontPass(self.base_amount, StrategyMode.ADD_IF_NOT_BET).update_bets(player)
+        self._remove_place_strategy.update_bets(player)
+        self._pass_line_strategy.update_bets(player)
+        self._dont_pass_strategy.update_bets(player)
 
     def place68(self, player: Player) -> None:
         """Update bets to Place the 6 and 8 (regardless of the point) and then lay odds on DontPass bets."""
-        place_amounts = {
-            6: self.start_six_eight_amount,
-            8: self.start_six_eight_amount,
-        }
-        BetPlace(place_amounts, skip_point=False).update_bets(player)
+        self._place68_strategy.update_bets(player)
 
     def place5689(self, player: Player) -> None:
         """Update bets to Place the 5, 6, 8 and 9."""
-        RemoveByType(Place).update_bets(player)
-        place_amounts = {
-            5: self.five_nine_amount,
-            6: self.end_six_eight_amount,
-            8: self.end_six_eight_amount,
-            9: self.five_nine_amount,
-        }
-        BetPlace(place_amounts, skip_point=False).update_bets(player)
+        self._remove_place_strategy.update_bets(player)
+        self._place5689_strategy.update_bets(player)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(base_amount={self.base_amount})"
@@ -490,6 +581,17 @@ class Risk12(Strategy):
     is established, places either the 6 the 8, or both depending on if the player won enough
     pre-point to cover those bets."""
 
+    _shared_attributes = frozenset(
+        {
+            "_pass_line_strategy",
+            "_field_strategy",
+            "_place6_strategy",
+            "_place8_strategy",
+            "_place68_strategy",
+        }
+    )
+    memoizable = True
+
     def __init__(self) -> None:
         """Pass line and field bet before the point is established. Once the point is established
         place the 6 and 8.
@@ -497,6 +599,12 @@ class Risk12(Strategy):
         super().__init__()
         self.pre_point_winnings: float = 0.0
 
+        self._pass_line_strategy = AddIfNotBet(PassLine(5))
+        self._field_strategy = AddIfNotBet(Field(5))
+        self._place6_strategy = AddIfNotBet(Place(6, 6))
+        self._place8_strategy = AddIfNotBet(Place(8, 6))
+        self._place68_strategy = BetPlace({6: 6, 8: 6})
+
     def completed(self, player: Player) -> bool:
         """The strategy is completed if the Player can no longer make the initial PassLine bet, and
         the player has no bets on the table.
@@ -512,6 +620,10 @@ class Risk12(Strategy):
         """
         return player.bankroll < 5 and len(player.bets) == 0
 
+    def state_key(self) -> typing.Hashable:
+        # the bets only depend on whether the winnings cover 5 or 10
+        return type(self), min(self.pre_point_winnings, 12 - 2)
+
     def after_roll(self, player: Player) -> None:
         """Determine the pre-point winnings which is used to determine which bets to place when the
         point is on.
@@ -521,7 +633,7 @@ class Risk12(Strategy):
         player
             The player to check the bets for.
         """
-        bet_results = [x.get_result(player.table) for x in player.bets]
+        bet_results = [player.get_bet_result(x) for x in player.bets]
         if player.table.point.status == "Off" and any(x.won for x in bet_results):
             self.pre_point_winnings += sum(x.bankroll_change for x in bet_results)
         elif player.table.point.status == "On" and player.table.dice.total == 7:
@@ -550,11 +662,11 @@ class Risk12(Strategy):
         """
         if self.pre_point_winnings >= 6 - 1:
             if player.table.point.number != 6:
-                AddIfNotBet(Place(6, 6)).update_bets(player)
+                self._place6_strategy.update_bets(player)
             else:
-                AddIfNotBet(Place(8, 6)).update_bets(player)
+                self._place8_strategy.update_bets(player)
         if self.pre_point_winnings >= 12 - 2:
-            BetPlace({6: 6, 8: 6}).update_bets(player)
+            self._place68_strategy.update_bets(player)
 
     def update_bets(self, player: Player) -> None:
         """If the point is off make a Field and PassLine bet. If the point is on
@@ -566,7 +678,8 @@ class Risk12(Strategy):
             The player to make the bets for.
         """
         if player.table.point.status == "Off":
-            self.point_off(player)
+            self._pass_line_strategy.update_bets(player)
+            self._field_strategy.update_bets(player)
         elif player.table.point.status == "On":
             self.point_on(player)
 
@@ -614,6 +727,11 @@ class Place68PR(Strategy):
     it is reduced to the original bet amount.
     """
 
+    _shared_attributes = frozenset(
+        {"_starting_amount", "_press_amount", "_starting_bets", "_pressed_bets"}
+    )
+    memoizable = True
+
     def __init__(self, base_amount: float = 6) -> None:
         """If point is on place the 6 & 8 of the amount. If you win press the bet to double. If you win
         again reduce the bet back to starting amount.
@@ -624,14 +742,30 @@ class Place68PR(Strategy):
             The starting amount of bet to place.
         """
         self.base_amount = float(base_amount)
-        self.starting_amount = float(base_amount)
-        self.press_amount = 2 * self.starting_amount
+        self._starting_amount = float(base_amount)
+        self._press_amount = 2 * self._starting_amount
 
         self.win_one_amount = base_amount * (7 / 6)
         self.win_two_amount = base_amount * 2 * (7 / 6)
 
         self.six_winnings = 0.0
         self.eight_winnings = 0.0
+        self._build_strategies()
+
+    starting_amount = _Setting(float)
+    """The amount of the Place bets before they're pressed."""
+    press_amount = _Setting(float)
+    """The amount of the pressed Place bets."""
+
+    def _build_strategies(self) -> None:
+        """Build the Place bets for the amounts, once rather than on every call to
+        update_bets."""
+        self._starting_bets = {
+            number: Place(number, self._starting_amount) for number in (6, 8)
+        }
+        self._pressed_bets = {
+            number: Place(number, self._press_amount) for number in (6, 8)
+        }
 
     def completed(self, player: Player) -> bool:
         """Returns True if the players bankroll is below the bet amount and the player no longer
@@ -645,7 +779,7 @@ class Place68PR(Strategy):
         -------
 
         """
-        return player.bankroll < self.starting_amount and len(player.bets) == 0
+        return player.bankroll < self._starting_amount and len(player.bets) == 0
 
     def after_roll(self, player: Player) -> None:
         """Get the winnings on the Place 6 and 8 bets to determine whether to press or regress.
@@ -658,16 +792,16 @@ class Place68PR(Strategy):
         place_bets = player.get_bets_by_type((Place,))
         place_six_bets = [x for x in place_bets if x.number == 6]
         place_six_win_amounts = [
-            x.get_result(player.table).amount - x.amount
+            player.get_bet_result(x).amount - x.amount
             for x in place_six_bets
-            if x.get_result(player.table).won
+            if player.get_bet_result(x).won
         ]
         self.six_winnings = sum(place_six_win_amounts)
         place_eight_bets = [x for x in place_bets if x.number == 8]
         place_eight_win_amounts = [
-            x.get_result(player.table).amount - x.amount
+            player.get_bet_result(x).amount - x.amount
             for x in place_eight_bets
-            if x.get_result(player.table).won
+            if player.get_bet_result(x).won
         ]
         self.eight_winnings = sum(place_eight_win_amounts)
 
@@ -681,12 +815,9 @@ class Place68PR(Strategy):
         """
         if player.table.point.status == "Off":
             return
-        for number in (6, 8):
-            if (
-                Place(number, self.starting_amount) not in player.bets
-                and Place(number, self.press_amount) not in player.bets
-            ):
-                player.add_bet(Place(number, self.starting_amount))
+        for number, bet in self._starting_bets.items():
+            if bet not in player.bets and self._pressed_bets[number] not in player.bets:
+                player.add_bet(bet)
 
     def press(self, player: Player) -> None:
         """Double the bet amount of the place bets.
@@ -697,9 +828,9 @@ class Place68PR(Strategy):
             The player to make the bets for.
         """
         if self.six_winnings == self.win_one_amount:
-            player.add_bet(Place(6, self.starting_amount))
+            player.add_bet(self._starting_bets[6])
         if self.eight_winnings == self.win_one_amount:
-            player.add_bet(Place(8, self.starting_amount))
+            player.add_bet(self._starting_bets[8])
 
     def update_bets(self, player: Player) -> None:
         """Ensure that a Place6 and Place8 bet always exist for the player of base amount.
@@ -737,10 +868,7 @@ class Place68DontCome2Odds(AggregateStrategy):
         self.dont_come_amount = float(dont_come_amount)
         super().__init__(
             BetPlace({6: six_eight_amount, 8: six_eight_amount}, skip_point=False),
-            AddIfTrue(
-                DontCome(dont_come_amount),
-                lambda p: len(p.get_bets_by_type((DontCome,))) == 0,
-            ),
+            AddIfTrue(DontCome(dont_come_amount), ~HasBetOfType(DontCome)),
             OddsMultiplier(DontCome, 2),
         )
 
@@ -0,0 +1,261 @@
+"""
+Memoize the decisions of a strategy. Most strategies make the same bets every time
+they see the same table point, bets, bankroll and strategy state, so MemoizedStrategy
+records the changes update_bets makes to the player's bets for each Strategy.memo_key
+(and bankroll) and replays them the next time the key comes up instead of running the
+strategy again.
+"""
+
+import collections
+import copy
+import math
+import threading
+import time
+import typing
+
+from crapssim.bet import Bet
+from crapssim.strategy.tools import Player, Strategy
+
+__all__ = ["MemoizedStrategy", "benchmark_memoization"]
+
+
+def _is_memoizable(value: typing.Any) -> bool:
+    """Whether the strategy, and every sub-strategy it has, is memoizable."""
+    if isinstance(value, Strategy):
+        return value.memoizable and all(_is_memoizable(x) for x in vars(value).values())
+    if isinstance(value, (list, tuple)):
+        return all(_is_memoizable(x) for x in value)
+    if isinstance(value, dict):
+        return all(_is_memoizable(x) for x in value.values())
+    return True
+
+
+class _Decision(typing.NamedTuple):
+    """The changes update_bets made for one memo_key."""
+
+    bets: tuple[tuple[int | None, Bet | None], ...]
+    """The bets after update_bets, as the index of a bet the player already had, or
+    None and the new bet to place a copy of."""
+    bankroll_change: float
+    """The change of the player's bankroll."""
+    strategy: Strategy | None
+    """A copy of the strategy after update_bets if its state_key changed, else None."""
+
+
+class _MemoCache:
+    """Least recently used cache of decisions, shared by the clones of a
+    MemoizedStrategy (which may be playing on different threads)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.decisions: collections.OrderedDict[typing.Hashable, _Decision] = (
+            collections.OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: typing.Hashable) -> _Decision | None:
+        with self._lock:
+            decision = self.decisions.get(key)
+            if decision is not None:
+                self.decisions.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return decision
+
+    def put(self, key: typing.Hashable, decision: _Decision) -> None:
+        with self._lock:
+            self.decisions[key] = decision
+            if len(self.decisions) > self.maxsize:
+                self.decisions.popitem(last=False)
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        # locks can't be pickled, e.g. to send the strategy to another process
+        return {x: y for x, y in vars(self).items() if x != "_lock"}
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        vars(self).update(state)
+        self._lock = threading.Lock()
+
+
+class MemoizedStrategy(Strategy):
+    """A strategy that replays the bets it made the last time it saw the same
+    Strategy.memo_key and bankroll instead of running update_bets again. Makes the same
+    bets as the strategy it wraps.
+
+    The cache is shared by the clones of the strategy (e.g. the players of a table, or
+    of many tables with the same settings), since the decision for a key doesn't depend
+    on the player. Strategies which aren't memoizable (those which haven't opted in with
+    Strategy.memoizable, or AddIfTrue with a lambda key, which could read anything) are
+    run as usual, as are calls where update_bets changes a bet in place rather than
+    adding or removing it.
+
+    Replaying only pays off when update_bets costs more than building the memo_key, see
+    benchmark_memoization.
+    """
+
+    _shared_attributes = frozenset({"_cache", "_memoizable"})
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        maxsize: int = 100_000,
+        bankroll_cap: float = float("inf"),
+    ):
+        """Memoize the given strategy.
+
+        Parameters
+        ----------
+        strategy
+            The strategy to memoize.
+        maxsize
+            Maximum number of decisions to keep, the least recently used are dropped
+            first.
+        bankroll_cap
+            Bankrolls of at least bankroll_cap are treated as the same in the key. By
+            default the exact bankroll is part of the key, which is always safe but
+            means decisions are only reused at the same bankroll. If the strategy never
+            needs more than some amount to make all of its bets in one update (e.g. the
+            total amount of all the bets it can make), set bankroll_cap to that amount
+            so the decisions are reused for any bankroll above it.
+        """
+        self.strategy = strategy
+        self.bankroll_cap = bankroll_cap
+        self._cache = _MemoCache(maxsize)
+        self._memoizable = _is_memoizable(strategy)
+
+    @property
+    def memoizable(self) -> bool:
+        """Whether the wrapped strategy is memoizable."""
+        return self._memoizable
+
+    @property
+    def hits(self) -> int:
+        """Number of calls to update_bets replayed from the cache."""
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of calls to update_bets that ran the strategy."""
+        return self._cache.misses
+
+    def after_roll(self, player: Player) -> None:
+        self.strategy.after_roll(player)
+
+    def completed(self, player: Player) -> bool:
+        return self.strategy.completed(player)
+
+    def state_key(self) -> typing.Hashable:
+        return self.strategy.state_key()
+
+    def memo_key(self, player: Player) -> typing.Hashable:
+        return self.strategy.memo_key(player)
+
+    def update_bets(self, player: Player) -> None:
+        """Replay the bets for the memo_key of the strategy if they're in the cache,
+        otherwise run the strategy and record the bets it made.
+
+        Parameters
+        ----------
+        player
+            The player to update the bets for.
+        """
+        if not self._memoizable:
+            self.strategy.update_bets(player)
+            return
+
+        key = min(player.bankroll, self.bankroll_cap), self.strategy.memo_key(player)
+        decision = self._cache.get(key)
+        if decision is not None:
+            bets = player.bets
+            player.bets = [
+                bets[i] if i is not None else copy.copy(bet) for i, bet in decision.bets
+            ]
+            player.bankroll += decision.bankroll_change
+            if decision.strategy is not None:
+                self.strategy = decision.strategy.clone()
+            return
+
+        before = list(player.bets)
+        before_state = [dict(vars(x)) for x in before]
+        bankroll = player.bankroll
+        state = self.strategy.state_key()
+        self.strategy.update_bets(player)
+
+        index = {id(x): i for i, x in enumerate(before)}
+        bets = []
+        for bet in player.bets:
+            i = index.get(id(bet))
+            if i is None:
+                bets.append((None, copy.copy(bet)))
+            elif vars(bet) != before_state[i]:
+                return
+            else:
+                bets.append((i, None))
+        self._cache.put(
+            key,
+            _Decision(
+                bets=tuple(bets),
+                bankroll_change=player.bankroll - bankroll,
+                strategy=(
+                    self.strategy.clone()
+                    if self.strategy.state_key() != state
+                    else None
+                ),
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.strategy!r})"
+
+
+def benchmark_memoization(
+    strategy: Strategy,
+    n_rolls: int = 10_000,
+    bankroll: float = 1_000_000,
+    seed: int = 0,
+    repeat: int = 3,
+    **kwargs: typing.Any,
+) -> dict[str, float]:
+    """
+    Time playing a strategy with and without MemoizedStrategy on the same dice, to see
+    whether memoizing it is worth it.
+
+    Parameters
+    ----------
+    strategy
+        The strategy to play.
+    n_rolls
+        Number of rolls to play.
+    bankroll
+        Bankroll of the player, large enough by default that the player doesn't run
+        out.
+    seed
+        Seed of the dice.
+    repeat
+        Number of times to play each, the fastest time is kept.
+    **kwargs
+        Arguments of MemoizedStrategy, e.g. bankroll_cap.
+
+    Returns
+    -------
+    The fastest wall time in seconds of playing the "plain" and the "memoized"
+    strategy.
+    """
+    # imported here, since crapssim.table imports the strategies
+    from crapssim.table import Table
+
+    times = {"plain": math.inf, "memoized": math.inf}
+    for _ in range(repeat):
+        for name in times:
+            played = strategy.clone()
+            if name == "memoized":
+                played = MemoizedStrategy(played, **kwargs)
+            table = Table(seed=seed)
+            table.add_player(bankroll, played)
+            start = time.perf_counter()
+            table.run(n_rolls, verbose=False)
+            times[name] = min(times[name], time.perf_counter() - start)
+    return times
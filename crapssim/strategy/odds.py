@@ -1,19 +1,38 @@
 import typing
 
-from crapssim.bet import Bet, Come, DontCome, DontPass, Odds, PassLine
-from crapssim.strategy.tools import Player, Strategy, Table
+from crapssim.bet import Bet, Come, DontCome, DontPass, Odds, PassLine, get_type_mask
+from crapssim.strategy.tools import Player, Strategy, Table, _Setting
+
+_PASS_LINE_DONT_PASS_MASK = get_type_mask((PassLine, DontPass))
+_COME_DONT_COME_MASK = get_type_mask((Come, DontCome))
 
 
 class OddsAmount(Strategy):
     """Strategy that takes places odds on a given number for a given bet type."""
 
+    _shared_attributes = frozenset({"_odds_amounts", "_odds_bets"})
+    memoizable = True
+
     def __init__(
         self,
         base_type: typing.Type[PassLine | DontPass | Come | DontCome],
         odds_amounts: dict[int, typing.SupportsFloat],
     ):
-        self.base_type = base_type
-        self.odds_amounts = odds_amounts
+        self._base_type = base_type
+        self._odds_amounts = dict(odds_amounts)
+        self._build_strategies()
+
+    base_type = _Setting()
+    """The type of bet the odds are placed on."""
+    odds_amounts = _Setting(dict)
+    """The amounts of the odds by point."""
+
+    def _build_strategies(self) -> None:
+        """Build the Odds bets, once rather than on every call to update_bets."""
+        self._odds_bets = [
+            Odds(self._base_type, number, float(amount))
+            for number, amount in self._odds_amounts.items()
+        ]
 
     def completed(self, player: Player) -> bool:
         """Return True if there are no bets of base_type on the table.
@@ -27,12 +46,11 @@ class OddsAmount(Strategy):
         -------
         True if there are no base type bets on the table, otherwise False.
         """
-        return len([x for x in player.bets if isinstance(x, self.base_type)]) == 0
+        return len(player.get_bets_by_type(self._base_type)) == 0
 
     def update_bets(self, player: Player) -> None:
-        for number, amount in self.odds_amounts.items():
-            bet = Odds(self.base_type, number, float(amount))
-            if bet.is_allowed(player) and not player.already_placed(bet):
+        for bet in self._odds_bets:
+            if not player.already_placed(bet) and bet.is_allowed(player):
                 player.add_bet(bet)
 
 
@@ -72,10 +90,21 @@ class DontComeOddsAmount(OddsAmount):
         super().__init__(DontCome, {x: bet_amount for x in numbers})
 
 
+def _multiplier_dict(odds_multiplier: dict[int, int] | int) -> dict[int, int]:
+    """The odds multipliers by point, the same for every point if given an integer."""
+    if isinstance(odds_multiplier, int):
+        return {x: odds_multiplier for x in (4, 5, 6, 8, 9, 10)}
+    return dict(odds_multiplier)
+
+
 class OddsMultiplier(Strategy):
     """Strategy that takes an AllowsOdds object and places Odds on it given either a multiplier,
     or a dictionary of points and multipliers."""
 
+    _shared_attributes = frozenset({"_odds_multiplier"})
+    _cache_attributes = frozenset({"_odds_bets"})
+    memoizable = True
+
     def __init__(
         self,
         base_type: typing.Type[PassLine | DontPass | Come | DontCome],
@@ -93,18 +122,25 @@ class OddsMultiplier(Strategy):
             If the odds multiplier is a dictionary of integers, looks at the dictionary to
             determine what odds multiplier to use depending on the given point.
         """
-        self.base_type = base_type
+        self._base_type = base_type
+        self._odds_multiplier = _multiplier_dict(odds_multiplier)
+        self._build_strategies()
 
-        if isinstance(odds_multiplier, int):
-            self.odds_multiplier = {x: odds_multiplier for x in (4, 5, 6, 8, 9, 10)}
-        else:
-            self.odds_multiplier = odds_multiplier
+    base_type = _Setting()
+    """The type of bet the odds are placed on."""
+    odds_multiplier = _Setting(_multiplier_dict)
+    """The multipliers of the odds by point. Assigning an integer uses it for every
+    point."""
+
+    def _build_strategies(self) -> None:
+        """Start a new cache of Odds bets, for the base_type."""
+        self._odds_bets: dict[int, Odds] = {}
 
     @staticmethod
     def get_point_number(bet: Bet, table: "Table"):
-        if isinstance(bet, (PassLine, DontPass)):
+        if bet.__class__.family_mask & _PASS_LINE_DONT_PASS_MASK:
             return table.point.number
-        elif isinstance(bet, (Come, DontCome)):
+        elif bet.__class__.family_mask & _COME_DONT_COME_MASK:
             return bet.number
         else:
             raise NotImplementedError
@@ -117,16 +153,39 @@ class OddsMultiplier(Strategy):
         player
             The player to add the odds bet to.
         """
-        for bet in [x for x in player.bets if isinstance(x, self.base_type)]:
+        for bet in player.get_bets_by_type(self._base_type):
             point = self.get_point_number(bet, player.table)
 
-            if point in self.odds_multiplier:
-                multiplier = self.odds_multiplier[point]
+            if point in self._odds_multiplier:
+                multiplier = self._odds_multiplier[point]
             else:
                 return
 
-            amount = bet.amount * multiplier
-            OddsAmount(self.base_type, {point: amount}).update_bets(player)
+            odds_bet = self.get_odds_bet(point, bet.amount * multiplier)
+            if not player.already_placed(odds_bet) and odds_bet.is_allowed(player):
+                player.add_bet(odds_bet)
+
+    def get_odds_bet(self, point: int, amount: float) -> Odds:
+        """The Odds bet for the point and amount. The last one made for each point is kept
+        and reused while the amount stays the same, since the same few bets are made roll
+        after roll, so each copy of the strategy keeps at most one bet per point.
+
+        Parameters
+        ----------
+        point
+            The number of the Odds bet.
+        amount
+            The amount of the Odds bet.
+
+        Returns
+        -------
+        The Odds bet on the base_type for the point and amount.
+        """
+        odds_bet = self._odds_bets.get(point)
+        if odds_bet is None or odds_bet.amount != amount:
+            odds_bet = Odds(self._base_type, point, float(amount))
+            self._odds_bets[point] = odds_bet
+        return odds_bet
 
     def completed(self, player: Player) -> bool:
         """Return True if there are no bets of base_type on the table.
@@ -140,13 +199,13 @@ class OddsMultiplier(Strategy):
         -------
         True if there are no base type bets on the table, otherwise False.
         """
-        return len([x for x in player.bets if isinstance(x, self.base_type)]) == 0
+        return len(player.get_bets_by_type(self._base_type)) == 0
 
     def get_odds_multiplier_repr(self) -> int | dict[int, int]:
         """If the odds_multiplier has multiple values return a dictionary with the values,
         if all the multipliers are the same return an integer of the multiplier."""
-        if all([x == self.odds_multiplier[4] for x in self.odds_multiplier.values()]):
-            odds_multiplier: int | dict[int, int] = self.odds_multiplier[4]
+        if all([x == self._odds_multiplier[4] for x in self._odds_multiplier.values()]):
+            odds_multiplier: int | dict[int, int] = self._odds_multiplier[4]
         else:
             odds_multiplier = self.odds_multiplier
         return odds_multiplier
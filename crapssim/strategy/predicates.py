@@ -0,0 +1,352 @@
+"""
+Predicates for the keys of AddIfTrue, RemoveIfTrue and ReplaceIfTrue. Unlike a lambda,
+a predicate knows what it reads (its dependencies, e.g. the table point or the
+player's bets), so tools like MemoizedStrategy and compile_strategy can tell what a
+strategy with a predicate key depends on. Predicates combine with &, | and ~, and
+compile() turns a predicate into a plain function without the overhead of the
+predicate objects, e.g.
+
+    AddIfTrue(PassLine(5), PointOff() & ~HasBet(PassLine(5)))
+
+Player predicates take the player, and bet predicates (IsBetType, MatchesBet, and any
+combination including them) take the bet and the player like a RemoveIfTrue key.
+"""
+
+import functools
+import typing
+
+from crapssim.bet import Bet, HardWay, Hop, Place, get_type_mask
+
+if typing.TYPE_CHECKING:
+    from crapssim.strategy.tools import Player
+
+__all__ = [
+    "AllOf",
+    "AnyOf",
+    "BankrollAbove",
+    "CountBelow",
+    "HasBet",
+    "HasBetOfType",
+    "IsBetType",
+    "MatchesBet",
+    "NewShooter",
+    "Not",
+    "PointIs",
+    "PointOff",
+    "PointOn",
+    "Predicate",
+]
+
+DEPENDENCIES = frozenset({"point", "new_shooter", "bets", "bankroll", "bet"})
+"""The inputs a predicate can depend on: the table point, whether there's a new
+shooter, the player's bets, the player's bankroll and the bet being checked."""
+
+
+class Predicate:
+    """A condition on the player (or on a bet and the player, if on_bets is True)."""
+
+    dependencies: frozenset[str] = frozenset()
+    """The inputs the predicate reads, a subset of DEPENDENCIES."""
+    on_bets: bool = False
+    """Whether the predicate takes the bet and the player rather than just the
+    player."""
+
+    _check: typing.Callable[..., bool] | None = None
+
+    def compile(self) -> typing.Callable[..., bool]:
+        """The predicate as a plain function of the player (or of the bet and the
+        player, if on_bets is True).
+
+        Returns
+        -------
+        The function returning whether the predicate is True.
+        """
+        raise NotImplementedError
+
+    def __call__(self, *args: typing.Any) -> bool:
+        if self._check is None:
+            self._check = self.compile()
+        return self._check(*args)
+
+    def _arguments(self) -> tuple:
+        return ()
+
+    def __and__(self, other: "Predicate") -> "AllOf":
+        return AllOf(self, other)
+
+    def __or__(self, other: "Predicate") -> "AnyOf":
+        return AnyOf(self, other)
+
+    def __invert__(self) -> "Not":
+        return Not(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Predicate):
+            return type(self) is type(other) and self._arguments() == other._arguments()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._arguments()))
+
+    def __getstate__(self) -> dict[str, typing.Any]:
+        # compiled functions are closures, which can't be pickled
+        return {x: y for x, y in vars(self).items() if x != "_check"}
+
+    def __setstate__(self, state: dict[str, typing.Any]) -> None:
+        vars(self).update(state)
+
+    def __repr__(self) -> str:
+        arguments = ", ".join(repr(x) for x in self._arguments())
+        return f"{self.__class__.__name__}({arguments})"
+
+
+class PointOn(Predicate):
+    """True if the table point is On."""
+
+    dependencies = frozenset({"point"})
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        return lambda p: p.table.point.number is not None
+
+
+class PointOff(Predicate):
+    """True if the table point is Off."""
+
+    dependencies = frozenset({"point"})
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        return lambda p: p.table.point.number is None
+
+
+class PointIs(Predicate):
+    """True if the table point is the given number."""
+
+    dependencies = frozenset({"point"})
+
+    def __init__(self, number: int):
+        self.number = number
+
+    def _arguments(self) -> tuple:
+        return (self.number,)
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        number = self.number
+        return lambda p: p.table.point.number == number
+
+
+class NewShooter(Predicate):
+    """True if there is a new shooter at the table."""
+
+    dependencies = frozenset({"new_shooter"})
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        return lambda p: bool(p.table.new_shooter)
+
+
+class HasBet(Predicate):
+    """True if the player has a bet equal to the given bet (same type, placement and
+    amount)."""
+
+    dependencies = frozenset({"bets"})
+
+    def __init__(self, bet: Bet):
+        self.bet = bet
+
+    def _arguments(self) -> tuple:
+        return (self.bet,)
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        bet = self.bet
+        return lambda p: bet in p.bets
+
+
+class HasBetOfType(Predicate):
+    """True if the player has any bet of the given type(s)."""
+
+    dependencies = frozenset({"bets"})
+
+    def __init__(self, bet_type: typing.Type[Bet] | tuple[typing.Type[Bet], ...]):
+        self.bet_type = bet_type
+
+    def _arguments(self) -> tuple:
+        return (self.bet_type,)
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        mask = get_type_mask(self.bet_type)
+        return lambda p: any(x.__class__.family_mask & mask for x in p.bets)
+
+
+class CountBelow(Predicate):
+    """True if the player has fewer than count bets of the given type(s)."""
+
+    dependencies = frozenset({"bets"})
+
+    def __init__(
+        self, bet_type: typing.Type[Bet] | tuple[typing.Type[Bet], ...], count: int
+    ):
+        self.bet_type = bet_type
+        self.count = count
+
+    def _arguments(self) -> tuple:
+        return self.bet_type, self.count
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        mask, count = get_type_mask(self.bet_type), self.count
+        return (
+            lambda p: sum(1 for x in p.bets if x.__class__.family_mask & mask) < count
+        )
+
+
+class BankrollAbove(Predicate):
+    """True if the player's bankroll is more than the given amount."""
+
+    dependencies = frozenset({"bankroll"})
+
+    def __init__(self, amount: float):
+        self.amount = amount
+
+    def _arguments(self) -> tuple:
+        return (self.amount,)
+
+    def compile(self) -> typing.Callable[["Player"], bool]:
+        amount = self.amount
+        return lambda p: p.bankroll > amount
+
+
+class IsBetType(Predicate):
+    """True for bets of the given type(s)."""
+
+    dependencies = frozenset({"bet"})
+    on_bets = True
+
+    def __init__(self, bet_type: typing.Type[Bet] | tuple[typing.Type[Bet], ...]):
+        self.bet_type = bet_type
+
+    def _arguments(self) -> tuple:
+        return (self.bet_type,)
+
+    def compile(self) -> typing.Callable[[Bet, "Player"], bool]:
+        mask = get_type_mask(self.bet_type)
+        return lambda b, p: bool(b.__class__.family_mask & mask)
+
+
+class MatchesBet(Predicate):
+    """True for bets of the same type as the given bet, and the same number for Place
+    and HardWay bets or the same result for Hop bets. Bet amounts aren't compared."""
+
+    dependencies = frozenset({"bet"})
+    on_bets = True
+
+    def __init__(self, bet: Bet):
+        self.bet = bet
+
+    def _arguments(self) -> tuple:
+        return (self.bet,)
+
+    def compile(self) -> typing.Callable[[Bet, "Player"], bool]:
+        bet = self.bet
+        if bet.family_mask & Place.type_mask:
+            mask, number = Place.type_mask, bet.number
+            return (
+                lambda b, p: bool(b.__class__.family_mask & mask) and b.number == number
+            )
+        if bet.family_mask & HardWay.type_mask:
+            mask, number = HardWay.type_mask, bet.number
+            return (
+                lambda b, p: bool(b.__class__.family_mask & mask) and b.number == number
+            )
+        if bet.family_mask & Hop.type_mask:
+            mask, result = Hop.type_mask, bet.result
+            return (
+                lambda b, p: bool(b.__class__.family_mask & mask) and b.result == result
+            )
+        mask = bet.type_mask
+        return lambda b, p: bool(b.__class__.family_mask & mask)
+
+
+def _lift(predicate: Predicate, on_bets: bool) -> typing.Callable[..., bool]:
+    """The compiled predicate, taking the bet and the player if on_bets is True."""
+    check = predicate.compile()
+    if on_bets and not predicate.on_bets:
+        return lambda b, p: check(p)
+    return check
+
+
+class _Combination(Predicate):
+    def __init__(self, *predicates: Predicate):
+        self.predicates = predicates
+        self.dependencies = frozenset().union(*(x.dependencies for x in predicates))
+        self.on_bets = any(x.on_bets for x in predicates)
+
+    def _arguments(self) -> tuple:
+        return self.predicates
+
+
+class AllOf(_Combination):
+    """True if all of the given predicates are True, same as joining them with &."""
+
+    def __and__(self, other: Predicate) -> "AllOf":
+        return AllOf(*self.predicates, other)
+
+    def compile(self) -> typing.Callable[..., bool]:
+        checks = [_lift(x, self.on_bets) for x in self.predicates]
+        if len(checks) == 0:
+            return (lambda b, p: True) if self.on_bets else (lambda p: True)
+        if self.on_bets:
+            return functools.reduce(
+                lambda f, g: lambda b, p: f(b, p) and g(b, p), checks
+            )
+        return functools.reduce(lambda f, g: lambda p: f(p) and g(p), checks)
+
+    def __repr__(self) -> str:
+        return " & ".join(_operand(x) for x in self.predicates) or "AllOf()"
+
+
+class AnyOf(_Combination):
+    """True if any of the given predicates is True, same as joining them with |."""
+
+    def __or__(self, other: Predicate) -> "AnyOf":
+        return AnyOf(*self.predicates, other)
+
+    def compile(self) -> typing.Callable[..., bool]:
+        checks = [_lift(x, self.on_bets) for x in self.predicates]
+        if len(checks) == 0:
+            return (lambda b, p: False) if self.on_bets else (lambda p: False)
+        if self.on_bets:
+            return functools.reduce(
+                lambda f, g: lambda b, p: f(b, p) or g(b, p), checks
+            )
+        return functools.reduce(lambda f, g: lambda p: f(p) or g(p), checks)
+
+    def __repr__(self) -> str:
+        return " | ".join(_operand(x) for x in self.predicates) or "AnyOf()"
+
+
+class Not(Predicate):
+    """True if the given predicate is False, same as ~predicate."""
+
+    def __init__(self, predicate: Predicate):
+        self.predicate = predicate
+        self.dependencies = predicate.dependencies
+        self.on_bets = predicate.on_bets
+
+    def _arguments(self) -> tuple:
+        return (self.predicate,)
+
+    def __invert__(self) -> Predicate:
+        return self.predicate
+
+    def compile(self) -> typing.Callable[..., bool]:
+        check = self.predicate.compile()
+        if self.on_bets:
+            return lambda b, p: not check(b, p)
+        return lambda p: not check(p)
+
+    def __repr__(self) -> str:
+        return f"~{_operand(self.predicate)}"
+
+
+def _operand(predicate: Predicate) -> str:
+    if isinstance(predicate, _Combination) and len(predicate.predicates) > 1:
+        return f"({predicate!r})"
+    return repr(predicate)
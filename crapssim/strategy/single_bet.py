@@ -32,8 +32,8 @@ from crapssim.strategy.tools import (
     AddIfTrue,
     Player,
     RemoveIfPointOff,
-    RemoveIfTrue,
     Strategy,
+    _Setting,
 )
 
 
@@ -48,42 +48,63 @@ class StrategyMode(enum.Enum):
 
 
 class _BaseSingleBet(Strategy):
+    _shared_attributes = frozenset({"_bet", "_mode_strategies"})
+    memoizable = True
+
     def __init__(
         self,
         bet: Bet,
         mode: StrategyMode = StrategyMode.ADD_IF_NOT_BET,
     ):
         super().__init__()
-        self.bet = bet
-        self.mode = mode
+        self._bet = bet
+        self._mode = mode
+        self._build_strategies()
+
+    bet = _Setting(copied=False)
+    """The bet to place, which the strategies for the mode hold too."""
+    mode = _Setting()
+    """How the bet is placed."""
+
+    def _build_strategies(self) -> None:
+        """Build the strategies that place (and remove) the bet for the mode, once rather
+        than on every call to update_bets."""
+        match self._mode:
+            case StrategyMode.ADD_IF_NOT_BET:
+                self._mode_strategies = (AddIfNotBet(self._bet),)
+            case StrategyMode.ADD_IF_POINT_ON:
+                self._mode_strategies = (AddIfPointOn(self._bet),)
+            case StrategyMode.ADD_IF_POINT_OFF:
+                self._mode_strategies = (AddIfPointOff(self._bet),)
+            case StrategyMode.ADD_IF_NEW_SHOOTER:
+                self._mode_strategies = (AddIfNewShooter(self._bet),)
+            case StrategyMode.BET_IF_POINT_ON:
+                # If only betting when point on, also need to turn off when point off
+                self._mode_strategies = (
+                    AddIfPointOn(self._bet),
+                    RemoveIfPointOff(self._bet),
+                )
+            case _:
+                self._mode_strategies = ()
 
     def completed(self, player: Player) -> bool:
-        return player.bankroll < self.bet.amount and len(player.bets) == 0
+        return player.bankroll < self._bet.amount and len(player.bets) == 0
 
     def update_bets(self, player: Player) -> None:
-        if not self.bet.is_allowed(player):
+        if not self._bet.is_allowed(player):
             return
 
-        match self.mode:
-            case StrategyMode.ADD_IF_NOT_BET:
-                AddIfNotBet(self.bet).update_bets(player)
-            case StrategyMode.ADD_IF_POINT_ON:
-                AddIfPointOn(self.bet).update_bets(player)
-            case StrategyMode.ADD_IF_POINT_OFF:
-                AddIfPointOff(self.bet).update_bets(player)
-            case StrategyMode.ADD_IF_NEW_SHOOTER:
-                AddIfNewShooter(self.bet).update_bets(player)
+        match self._mode:
             case StrategyMode.ADD_OR_INCREASE:
-                player.add_bet(self.bet)
-            case StrategyMode.BET_IF_POINT_ON:
-                AddIfPointOn(self.bet).update_bets(player)
-                # If only betting when point on, also need to turn off when point off
-                RemoveIfPointOff(self.bet).update_bets(player)
+                player.add_bet(self._bet)
             case StrategyMode.REPLACE:
-                existing_bets = player.already_placed_bets(self.bet)
+                existing_bets = player.already_placed_bets(self._bet)
                 for bet in existing_bets:
                     player.remove_bet(bet)
-                player.add_bet(self.bet)
+                player.add_bet(self._bet)
+            case _:
+                for strategy in self._mode_strategies:
+                    strategy.update_bets(player)
 
     def __repr__(self) -> str:
         return (
@@ -96,6 +117,9 @@ class BetPlace(Strategy):
     """Strategy that makes multiple Place bets of given amounts. It can also skip making the bet
     if the point is the same as the given bet number."""
 
+    _shared_attributes = frozenset({"_place_bet_amounts", "_place_strategies"})
+    memoizable = True
+
     def __init__(
         self,
         place_bet_amounts: dict[int, float],
@@ -118,10 +142,24 @@ class BetPlace(Strategy):
             already on that number.
         """
         super().__init__()
-        self.place_bet_amounts = place_bet_amounts
-        self.mode = mode
+        self._place_bet_amounts = dict(place_bet_amounts)
+        self._mode = mode
         self.skip_point = skip_point
         self.skip_come = skip_come
+        self._build_strategies()
+
+    place_bet_amounts = _Setting(dict)
+    """The amounts of the Place bets by number."""
+    mode = _Setting()
+    """How the Place bets are made."""
+
+    def _build_strategies(self) -> None:
+        """Build the strategy making the Place bet on each number, once rather than on
+        every call to update_bets."""
+        self._place_strategies = {
+            number: _BaseSingleBet(Place(number, amount), mode=self._mode)
+            for number, amount in self._place_bet_amounts.items()
+        }
 
     def completed(self, player: Player) -> bool:
         """The strategy is completed if the player can no longer make any of the place bets in the
@@ -138,8 +176,8 @@ class BetPlace(Strategy):
         because their bankroll is too low.
         """
         return (
-            player.bankroll < min(x for x in self.place_bet_amounts.values())
-            and len([x for x in player.bets if isinstance(x, Place)]) == 0
+            player.bankroll < min(x for x in self._place_bet_amounts.values())
+            and len(player.get_bets_by_type(Place)) == 0
         )
 
     def update_bets(self, player: Player) -> None:
@@ -153,16 +191,16 @@ class BetPlace(Strategy):
         if self.skip_point:
             self.remove_point_bet(player)
 
-        for number, amount in self.place_bet_amounts.items():
+        come_numbers = ()
+        if self.skip_come:
+            come_numbers = [x.number for x in player.get_bets_by_type(Come)]
+
+        for number, strategy in self._place_strategies.items():
             if self.skip_point and number == player.table.point.number:
                 continue
-            if self.skip_come:
-                come_numbers = [
-                    x.point.number for x in player.bets if isinstance(x, Come)
-                ]
-                if number in come_numbers:
-                    continue
-            _BaseSingleBet(Place(number, amount), mode=self.mode).update_bets(player)
+            if number in come_numbers:
+                continue
+            strategy.update_bets(player)
 
     @staticmethod
     def remove_point_bet(player: Player) -> None:
@@ -175,9 +213,9 @@ class BetPlace(Strategy):
             The player to check and see if they have the given bet.
         """
         point = player.table.point.number
-        RemoveIfTrue(
-            lambda b, p: isinstance(b, Place) and b.number == point
-        ).update_bets(player)
+        for bet in player.get_bets_by_type(Place):
+            if bet.number == point:
+                player.remove_bet(bet)
 
     def __repr__(self) -> str:
         return (
@@ -0,0 +1,323 @@
+"""
+Declarative strategy specifications. A spec is plain JSON (or YAML) data describing a
+strategy, so strategy variants can be stored in files, diffed, hashed and generated in
+bulk without writing Python. A spec is one of:
+
+* a dictionary with a ``"type"`` naming a strategy in this package (a primitive from
+  tools, single_bet or odds, or a preset from examples) and its parameters, e.g.
+  ``{"type": "BetPlace", "place_bet_amounts": {"6": 6, "8": 6}, "skip_point": false}``,
+* a list of specs, which are combined into an AggregateStrategy, or
+* a string naming a strategy that takes no parameters, e.g. ``"Risk12"``.
+
+Bets are given the same way with the name of the bet class, e.g.
+``{"type": "Place", "number": 6, "amount": 6}``, bet types (the ``bet_type`` of
+CountStrategy or the ``base_type`` of odds) are the names of the bet classes, and
+strategy modes are the names of the StrategyMode members. Strategies that need a Python
+callable (AddIfTrue, RemoveIfTrue and ReplaceIfTrue) can't be written as a spec.
+"""
+
+import hashlib
+import inspect
+import json
+import pathlib
+import typing
+
+from crapssim.bet import (
+    All,
+    Any7,
+    AnyCraps,
+    Bet,
+    Boxcars,
+    CAndE,
+    Come,
+    DontCome,
+    DontPass,
+    Field,
+    Fire,
+    HardWay,
+    Hop,
+    Odds,
+    PassLine,
+    Place,
+    Small,
+    Tall,
+    Three,
+    Two,
+    Yo,
+)
+from crapssim.strategy import examples, odds, single_bet
+from crapssim.strategy.compiler import compile_strategy
+from crapssim.strategy.single_bet import StrategyMode
+from crapssim.strategy.tools import (
+    AddIfNewShooter,
+    AddIfNotBet,
+    AddIfPointOff,
+    AddIfPointOn,
+    AggregateStrategy,
+    CountStrategy,
+    NullStrategy,
+    RemoveByType,
+    RemoveIfPointOff,
+    Strategy,
+    WinProgression,
+)
+
+__all__ = [
+    "BET_TYPES",
+    "PRESETS",
+    "STRATEGY_TYPES",
+    "load_spec",
+    "spec_hash",
+    "strategy_from_spec",
+]
+
+BET_TYPES: dict[str, type[Bet]] = {
+    x.__name__: x
+    for x in (
+        PassLine,
+        Come,
+        DontPass,
+        DontCome,
+        Odds,
+        Place,
+        Field,
+        CAndE,
+        Any7,
+        Two,
+        Three,
+        Yo,
+        Boxcars,
+        AnyCraps,
+        HardWay,
+        Hop,
+        Fire,
+        All,
+        Tall,
+        Small,
+    )
+}
+"""Bet classes by the name used for them in a spec."""
+
+PRESETS: dict[str, type[Strategy]] = {
+    x.__name__: x
+    for x in (
+        examples.Pass2Come,
+        examples.PassLinePlace68,
+        examples.PlaceInside,
+        examples.Place68Move59,
+        examples.PassLinePlace68Move59,
+        examples.Place682Come,
+        examples.IronCross,
+        examples.HammerLock,
+        examples.Risk12,
+        examples.Knockout,
+        examples.DiceDoctor,
+        examples.Place68PR,
+        examples.Place68DontCome2Odds,
+    )
+}
+"""The complete strategies from crapssim.strategy.examples by name."""
+
+STRATEGY_TYPES: dict[str, type[Strategy]] = {
+    x.__name__: x
+    for x in (
+        AggregateStrategy,
+        NullStrategy,
+        AddIfNotBet,
+        AddIfPointOff,
+        AddIfPointOn,
+        AddIfNewShooter,
+        CountStrategy,
+        RemoveIfPointOff,
+        RemoveByType,
+        WinProgression,
+        single_bet.BetPlace,
+        single_bet.BetPassLine,
+        single_bet.BetDontPass,
+        single_bet.BetCome,
+        single_bet.BetDontCome,
+        single_bet.BetHardWay,
+        single_bet.BetHop,
+        single_bet.BetField,
+        single_bet.BetAny7,
+        single_bet.BetTwo,
+        single_bet.BetThree,
+        single_bet.BetYo,
+        single_bet.BetBoxcars,
+        single_bet.BetFire,
+        single_bet.BetAll,
+        single_bet.BetTall,
+        single_bet.BetSmall,
+        odds.OddsAmount,
+        odds.PassLineOddsAmount,
+        odds.DontPassOddsAmount,
+        odds.ComeOddsAmount,
+        odds.DontComeOddsAmount,
+        odds.OddsMultiplier,
+        odds.PassLineOddsMultiplier,
+        odds.DontPassOddsMultiplier,
+        odds.ComeOddsMultiplier,
+        odds.DontComeOddsMultiplier,
+    )
+} | PRESETS
+"""Strategy classes by the name used for them in a spec, including the presets."""
+
+
+def _bet_type(name: typing.Any) -> type[Bet]:
+    if name not in BET_TYPES:
+        raise ValueError(f"Unknown bet type in strategy spec: {name!r}")
+    return BET_TYPES[name]
+
+
+def _convert(name: str, value: typing.Any) -> typing.Any:
+    """Convert the JSON value of the parameter with the given name to the Python value
+    the strategy or bet expects."""
+    if name in ("bet", "first_bet"):
+        return _bet_from_spec(value)
+    if name in ("bet_type", "base_type"):
+        if isinstance(value, list):
+            return tuple(_bet_type(x) for x in value)
+        return _bet_type(value)
+    if name == "mode":
+        if value not in StrategyMode.__members__:
+            raise ValueError(f"Unknown strategy mode in strategy spec: {value!r}")
+        return StrategyMode[value]
+    if name in ("result", "numbers"):
+        return tuple(value)
+    if isinstance(value, dict):
+        # JSON objects only have string keys, but the numbers of the table are ints
+        return {int(k): v for k, v in value.items()}
+    return value
+
+
+def _build(cls: type, spec: dict[str, typing.Any], kind: str) -> typing.Any:
+    """Instance of cls (a bet or strategy class) with the parameters of the spec."""
+    parameters = {k: _convert(k, v) for k, v in spec.items() if k != "type"}
+    args: list[typing.Any] = []
+    signature = inspect.signature(cls)
+    for parameter in signature.parameters.values():
+        if parameter.kind is parameter.VAR_POSITIONAL and parameter.name in parameters:
+            args = parameters.pop(parameter.name)
+    try:
+        signature.bind(*args, **parameters)
+        return cls(*args, **parameters)
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid parameters for {kind} {cls.__name__}: {e}") from e
+
+
+def _bet_from_spec(spec: typing.Any) -> Bet:
+    if not isinstance(spec, dict) or "type" not in spec:
+        raise ValueError(f"Bet spec must be a dictionary with a 'type': {spec!r}")
+    return _build(_bet_type(spec["type"]), spec, "bet")
+
+
+def _strategy_from_spec(spec: typing.Any) -> Strategy:
+    if isinstance(spec, list):
+        return AggregateStrategy(*(_strategy_from_spec(x) for x in spec))
+    if isinstance(spec, str):
+        spec = {"type": spec}
+    if not isinstance(spec, dict) or "type" not in spec:
+        raise ValueError(
+            f"Strategy spec must be a list, a string or a dictionary with a "
+            f"'type': {spec!r}"
+        )
+    if spec["type"] not in STRATEGY_TYPES:
+        raise ValueError(f"Unknown strategy type in strategy spec: {spec['type']!r}")
+    cls = STRATEGY_TYPES[spec["type"]]
+    if "strategies" in spec:
+        strategies = [_strategy_from_spec(x) for x in spec["strategies"]]
+        spec = spec | {"strategies": strategies}
+    return _build(cls, spec, "strategy")
+
+
+def strategy_from_spec(spec: typing.Any, compile: bool = True) -> Strategy:
+    """
+    Build the strategy described by a spec.
+
+    Parameters
+    ----------
+    spec
+        The strategy spec, as loaded from JSON or YAML (see the module docstring).
+    compile
+        If True, the strategy is compiled with compile_strategy so the whole spec runs
+        as one flat program of rules. Otherwise the strategy objects are returned as
+        they are.
+
+    Returns
+    -------
+    The strategy, a CompiledStrategy if compile is True.
+
+    Raises
+    ------
+    ValueError
+        If the spec names an unknown strategy, bet, bet type or strategy mode, or has
+        parameters the strategy or bet doesn't take.
+    """
+    strategy = _strategy_from_spec(spec)
+    if compile:
+        return compile_strategy(strategy)
+    return strategy
+
+
+def _canonical(value: typing.Any) -> typing.Any:
+    """Canonical form of a spec for hashing. The parameters of a strategy or bet are
+    sorted since their order doesn't matter, but other dictionaries (like the amounts
+    of BetPlace, which are placed in order) keep their order. Numbers are compared by
+    value, so 6 and 6.0 are the same."""
+    if isinstance(value, dict):
+        items = [(str(k), _canonical(v)) for k, v in value.items()]
+        if "type" in value:
+            return {"spec": dict(sorted(items))}
+        return {"map": items}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(x) for x in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def spec_hash(spec: typing.Any) -> str:
+    """
+    Stable hash of a strategy spec, the same for specs that only differ in the order
+    of the parameters of a strategy or bet, in whitespace, or in writing a number as an
+    int or a float. Useful as a key for storing results of a sweep of strategy specs.
+
+    Parameters
+    ----------
+    spec
+        The strategy spec.
+
+    Returns
+    -------
+    The hex digest of the SHA-256 hash of the canonical JSON of the spec.
+    """
+    text = json.dumps(_canonical(spec), separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def load_spec(path: str | pathlib.Path) -> typing.Any:
+    """
+    Load a strategy spec from a JSON file, or from a YAML file (ending in .yaml or .yml)
+    if PyYAML is installed.
+
+    Parameters
+    ----------
+    path
+        The path to the file.
+
+    Returns
+    -------
+    The spec, which can be passed to strategy_from_spec.
+    """
+    path = pathlib.Path(path)
+    with path.open() as f:
+        if path.suffix.lower() not in (".yaml", ".yml"):
+            return json.load(f)
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError(
+                "Loading YAML strategy specs requires PyYAML, install it with "
+                "pip install pyyaml"
+            ) from e
+        return yaml.safe_load(f)
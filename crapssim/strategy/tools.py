@@ -3,13 +3,24 @@ strategies with the intended usage. Each of the strategies included in this pack
 to be used as building blocks when creating strategies."""
 
 import copy
+import enum
 import typing
 from abc import ABC, abstractmethod
 from typing import Protocol
 
-from crapssim.bet import Bet, HardWay, Hop, Place
+from crapssim.bet import Bet, BetResult
 from crapssim.dice import Dice
 from crapssim.point import Point
+from crapssim.strategy.predicates import (
+    CountBelow,
+    HasBet,
+    IsBetType,
+    MatchesBet,
+    NewShooter,
+    PointOff,
+    PointOn,
+    Predicate,
+)
 
 __all__ = [
     "Strategy",
@@ -56,12 +67,99 @@ class Player(Protocol):
 
     def remove_bet(self, bet: Bet) -> None: ...
 
+    def get_bet_result(self, bet: Bet) -> BetResult: ...
+
 
 class Strategy(ABC):
     """A Strategy is assigned to a player and determines what bets the player
     is going to make, remove, or change.
     """
 
+    _shared_attributes: typing.ClassVar[frozenset[str]] = frozenset()
+    """Attributes holding configuration that doesn't change while the strategy is played
+    (e.g. template bets and keys), which clone() shares instead of copying."""
+    _cache_attributes: typing.ClassVar[frozenset[str]] = frozenset()
+    """Attributes holding caches that fill up while the strategy is played (e.g. bets
+    reused roll after roll), which clone() gives each copy its own empty one of, and
+    which aren't part of the state_key."""
+    memoizable: typing.ClassVar[bool] = False
+    """Whether update_bets only depends on the inputs in memo_key, so MemoizedStrategy
+    can replay its bets. Strategies opt in by setting it to True once their inputs have
+    been checked, and a subclass overriding update_bets doesn't inherit it (see
+    __init_subclass__). The built-in strategies opt in, except for those with arbitrary
+    keys, like AddIfTrue with a lambda key."""
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        """Reset memoizable to False for a subclass with its own update_bets, unless the
+        subclass sets it too, since the new update_bets may read anything."""
+        super().__init_subclass__(**kwargs)
+        if "update_bets" in vars(cls) and "memoizable" not in vars(cls):
+            cls.memoizable = False
+
+    def clone(self) -> "Strategy":
+        """Copy of the strategy for a new Player. Attributes in _shared_attributes are
+        shared with the copy, those in _cache_attributes start empty, sub-strategies are
+        cloned, and all other attributes (the mutable state of the strategy, like
+        counters) are deep copied, so a new player only copies the small mutable part of
+        the strategy.
+
+        Returns
+        -------
+        A new strategy with the same configuration and its own state.
+        """
+        new_strategy = copy.copy(self)
+        memo: dict[int, typing.Any] = {}
+        for name, value in vars(self).items():
+            if name in self._cache_attributes:
+                setattr(new_strategy, name, type(value)())
+            elif name not in self._shared_attributes:
+                setattr(new_strategy, name, _clone_attribute(value, memo))
+        return new_strategy
+
+    def state_key(self) -> typing.Hashable:
+        """Hashable key of the state of the strategy, equal for two copies of the strategy
+        that will make the same bets from the same table and bets. By default it's the type
+        of the strategy and the attributes not in _shared_attributes or _cache_attributes.
+        Strategies with counters that only matter up to some value can leave the rest out,
+        so tools like crapssim.markov.explore_strategy see fewer distinct states.
+
+        Returns
+        -------
+        The key of the state of the strategy.
+        """
+        shared, cached = self._shared_attributes, self._cache_attributes
+        return type(self), tuple(
+            [
+                (name, _state_key_attribute(value))
+                for name, value in vars(self).items()
+                if name not in shared and name not in cached
+            ]
+        )
+
+    def memo_key(self, player: Player) -> typing.Hashable:
+        """Hashable key of everything update_bets depends on, used by MemoizedStrategy to
+        replay the bets made the last time the key was seen (MemoizedStrategy adds the
+        player's bankroll to it). By default it's the table point, whether there's a new
+        shooter, the player's bets and the state_key of the strategy. Strategies reading
+        anything else in update_bets should add it to the key before setting memoizable to
+        True.
+
+        Parameters
+        ----------
+        player
+            The player the bets would be updated for.
+
+        Returns
+        -------
+        The key of the inputs of update_bets.
+        """
+        return (
+            player.table.point.number,
+            player.table.new_shooter,
+            tuple([(type(x), _state_key_attribute(vars(x))) for x in player.bets]),
+            self.state_key(),
+        )
+
     def after_roll(self, player: Player) -> None:
         """Method that can update the Strategy from the table/player after the dice are rolled but
         before the bets and the table are updated. For example, if you wanted to know whether the
@@ -69,6 +167,9 @@ class Strategy(ABC):
         table.dice.roll.total == 7. You couldn't do this in update_bets since the table has already
         been updated setting the point's status to Off.
 
+        Results of the player's bets for the roll are available through
+        player.get_bet_result(bet), which resolves each bet only once per roll.
+
         Parameters
         ----------
         player
@@ -99,9 +200,125 @@ class Strategy(ABC):
         return f"{self.__class__.__name__}()"
 
 
+def _clone_attribute(value: typing.Any, memo: dict[int, typing.Any]) -> typing.Any:
+    """Copy of a strategy attribute for Strategy.clone, cloning strategies (including
+    strategies in a list, tuple or dict) and deep copying everything else."""
+    if id(value) in memo:
+        return memo[id(value)]
+    if isinstance(value, Strategy):
+        new_value = value.clone()
+    elif type(value) in (list, tuple) and any(isinstance(x, Strategy) for x in value):
+        new_value = type(value)(_clone_attribute(x, memo) for x in value)
+    elif type(value) is dict and any(isinstance(x, Strategy) for x in value.values()):
+        new_value = {k: _clone_attribute(v, memo) for k, v in value.items()}
+    else:
+        return copy.deepcopy(value, memo)
+    memo[id(value)] = new_value
+    return new_value
+
+
+class _Setting:
+    """
+    A setting of a strategy that its sub-strategies or template bets are built from,
+    like the amount of a bet. The value is stored in the instance under the name with a
+    leading underscore, and assigning it calls the strategy's _build_strategies to
+    rebuild them.
+    """
+
+    def __init__(
+        self,
+        convert: typing.Callable[[typing.Any], typing.Any] | None = None,
+        copied: bool = True,
+    ):
+        """Set up the setting.
+
+        Parameters
+        ----------
+        convert
+            Function applied to assigned values, e.g. float for amounts.
+        copied
+            Whether reading the setting gives a copy of the value, so editing it in
+            place (e.g. a dictionary of amounts) can't leave the built strategies
+            behind. Values the built strategies hold themselves needn't be copied.
+        """
+        self.convert = convert
+        self.copied = copied
+        self.attribute = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attribute = f"_{name}"
+
+    def __get__(self, instance: typing.Any, owner: type | None = None) -> typing.Any:
+        if instance is None:
+            return self
+        value = getattr(instance, self.attribute)
+        return copy.copy(value) if self.copied else value
+
+    def __set__(self, instance: typing.Any, value: typing.Any) -> None:
+        if self.convert is not None:
+            value = self.convert(value)
+        setattr(instance, self.attribute, value)
+        instance._build_strategies()
+
+
+_ATOMIC_TYPES = frozenset({int, float, str, bool, type(None)})
+"""Types of attributes which are their own state key, checked first since most
+attributes are simple values."""
+
+
+_MEMO_DEPENDENCIES = frozenset({"point", "new_shooter", "bets", "bet"})
+"""Predicate dependencies covered by Strategy.memo_key. The bankroll isn't, since
+MemoizedStrategy can treat bankrolls above its bankroll_cap as the same."""
+
+
+def _is_memoizable_key(key: typing.Any) -> bool:
+    """Whether the key is a predicate that only depends on the inputs in memo_key."""
+    return isinstance(key, Predicate) and key.dependencies <= _MEMO_DEPENDENCIES
+
+
+def _state_key_attribute(value: typing.Any) -> typing.Hashable:
+    """Hashable version of a strategy attribute for Strategy.state_key."""
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    # plain containers first, without the (slower) abstract base class checks, since
+    # memo_key builds keys of the bets' attributes on every roll
+    if value_type is dict:
+        return tuple(
+            [
+                (k, v if type(v) in _ATOMIC_TYPES else _state_key_attribute(v))
+                for k, v in value.items()
+            ]
+        )
+    if value_type is tuple or value_type is list:
+        return tuple(
+            [x if type(x) in _ATOMIC_TYPES else _state_key_attribute(x) for x in value]
+        )
+    if isinstance(value, (enum.Enum, type)):
+        return value
+    if isinstance(value, Strategy):
+        return value.state_key()
+    if isinstance(value, Bet):
+        return type(value), _state_key_attribute(vars(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_state_key_attribute(x) for x in value)
+    if isinstance(value, dict):
+        return tuple((k, _state_key_attribute(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_state_key_attribute(x) for x in value)
+    if hasattr(value, "__dict__") and not callable(value):
+        return value_type, _state_key_attribute(vars(value))
+    raise TypeError(
+        f"Can't make a state key from an attribute of type {value_type.__name__}, so "
+        f"the strategy isn't memoizable. Set memoizable to False or override state_key."
+    )
+
+
 class AggregateStrategy(Strategy):
     """A combination of multiple strategies."""
 
+    memoizable = True
+
     def __init__(self, *strategies: Strategy):
         """A combination of multiple strategies. Strategies are applied in the order that is given.
 
@@ -148,6 +365,8 @@ class AggregateStrategy(Strategy):
 class NullStrategy(Strategy):
     """Strategy that bets nothing."""
 
+    memoizable = True
+
     def update_bets(self, player: Player) -> None:
         pass
 
@@ -161,6 +380,8 @@ class NullStrategy(Strategy):
 class AddIfTrue(Strategy):
     """Strategy that places a bet if a given key taking Player as a parameter is True."""
 
+    _shared_attributes = frozenset({"bet", "key"})
+
     def __init__(self, bet: Bet, key: typing.Callable[[Player], bool]):
         """The strategy will place the given bet if the given key is True.
 
@@ -170,13 +391,20 @@ class AddIfTrue(Strategy):
             The Bet to place if key is True.
         key
             Callable with parameters of player and table
-            returning a boolean to decide whether to place the bet.
+            returning a boolean to decide whether to place the bet. Use a Predicate
+            from crapssim.strategy.predicates (e.g. PointOff() & ~HasBet(bet)) so the
+            strategy can be memoized and compiled.
         """
 
         super().__init__()
         self.bet = bet
         self.key = key
 
+    @property
+    def memoizable(self) -> bool:
+        """Whether the key is a predicate only depending on the inputs of memo_key."""
+        return _is_memoizable_key(self.key)
+
     def update_bets(self, player: Player) -> None:
         """If the key is True add the bet to the player and table.
 
@@ -219,6 +447,8 @@ class RemoveIfTrue(Strategy):
     """Strategy that removes all bets that are True for a given key. The key takes the Bet and the
     Player as parameters."""
 
+    _shared_attributes = frozenset({"key"})
+
     def __init__(self, key: typing.Callable[["Bet", Player], bool]):
         """The strategy will remove all bets that are true for the given key.
 
@@ -226,11 +456,18 @@ class RemoveIfTrue(Strategy):
         ----------
         key
             Callable with parameters of bet and player return True if the bet should be removed
-            otherwise returning False.
+            otherwise returning False. Use a Predicate from crapssim.strategy.predicates
+            (e.g. IsBetType(Place) & PointOff()) so the strategy can be memoized and
+            compiled.
         """
         super().__init__()
         self.key = key
 
+    @property
+    def memoizable(self) -> bool:
+        """Whether the key is a predicate only depending on the inputs of memo_key."""
+        return _is_memoizable_key(self.key)
+
     def update_bets(self, player: Player) -> None:
         """For each of the players bets if the key is True remove the bet from the table.
 
@@ -268,10 +505,17 @@ class ReplaceIfTrue(Strategy):
     """Strategy that iterates through the bets on the table and if the given key is true, replaces
     the bet with the given bet."""
 
+    _shared_attributes = frozenset({"bet", "key"})
+
     def __init__(self, bet: Bet, key: typing.Callable[[Bet, Player], bool]):
         self.key = key
         self.bet = bet
 
+    @property
+    def memoizable(self) -> bool:
+        """Whether the key is a predicate only depending on the inputs of memo_key."""
+        return _is_memoizable_key(self.key)
+
     def update_bets(self, player: Player) -> None:
         """Iterate through each bet for the player and if the self.key(bet, player) is True, remove
         the bet and replace it with self.bet.
@@ -307,7 +551,7 @@ class ReplaceIfTrue(Strategy):
 
 class AddIfNotBet(AddIfTrue):
     """Strategy that adds a bet if it isn't on the table for that player. Equivalent of
-    AddIfTrue(bet, lambda p: bet not in p.bets)"""
+    AddIfTrue(bet, ~HasBet(bet))"""
 
     def __init__(self, bet: Bet):
         """The strategy adds the given bet object to the table if it is not already on the table.
@@ -317,7 +561,7 @@ class AddIfNotBet(AddIfTrue):
         bet
             The bet to add if it isn't already on the table.
         """
-        super().__init__(bet, lambda p: bet not in p.bets)
+        super().__init__(bet, ~HasBet(bet))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(bet={self.bet})"
@@ -325,8 +569,7 @@ class AddIfNotBet(AddIfTrue):
 
 class AddIfPointOff(AddIfTrue):
     """Strategy that adds a bet if the table point is Off, and the Player doesn't have a bet on the
-    table. Equivalent to AddIfTrue(bet, lambda p: p.table.point.status == "Off"
-                                        and bet not in p.bets)"""
+    table. Equivalent to AddIfTrue(bet, PointOff() & ~HasBet(bet))"""
 
     def __init__(self, bet: Bet):
         """Adds the given bet if the table point is Off and the player doesn't have that bet on the
@@ -337,9 +580,7 @@ class AddIfPointOff(AddIfTrue):
         bet
             The bet to add if the point is Off.
         """
-        super().__init__(
-            bet, lambda p: p.table.point.status == "Off" and bet not in p.bets
-        )
+        super().__init__(bet, PointOff() & ~HasBet(bet))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(bet={self.bet})"
@@ -347,8 +588,7 @@ class AddIfPointOff(AddIfTrue):
 
 class AddIfPointOn(AddIfTrue):
     """Strategy that adds a bet if the table point is On, and the Player doesn't have a bet on the
-    table. Equivalent to AddIfTrue(bet, lambda p: p.table.point.status == "On"
-                                        and bet not in p.bets)"""
+    table. Equivalent to AddIfTrue(bet, PointOn() & ~HasBet(bet))"""
 
     def __init__(self, bet: Bet):
         """Add a bet if the point is On.
@@ -358,9 +598,7 @@ class AddIfPointOn(AddIfTrue):
         bet
             The bet to add if the point is On.
         """
-        super().__init__(
-            bet, lambda p: p.table.point.status == "On" and bet not in p.bets
-        )
+        super().__init__(bet, PointOn() & ~HasBet(bet))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(bet={self.bet})"
@@ -368,7 +606,7 @@ class AddIfPointOn(AddIfTrue):
 
 class AddIfNewShooter(AddIfTrue):
     """Strategy that adds a bet if there is a new shooter at the table, and the Player doesn't have a bet on the
-    table. Equivalent to AddIfTrue(bet, lambda p: p.table.new_shooter and bet not in p.bets)
+    table. Equivalent to AddIfTrue(bet, NewShooter() & ~HasBet(bet))
     """
 
     def __init__(self, bet: Bet):
@@ -379,7 +617,7 @@ class AddIfNewShooter(AddIfTrue):
         bet
             The bet to add if the point is On.
         """
-        super().__init__(bet, lambda p: p.table.new_shooter and bet not in p.bets)
+        super().__init__(bet, NewShooter() & ~HasBet(bet))
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(bet={self.bet})"
@@ -388,8 +626,11 @@ class AddIfNewShooter(AddIfTrue):
 class CountStrategy(AddIfTrue):
     """Strategy that checks how many bets exist of a certain type. If the number of bets of that
     type is less than the given count, it places the bet (if the bet isn't already on the table.)
+    Equivalent to AddIfTrue(bet, CountBelow(bet_type, count) & ~HasBet(bet))
     """
 
+    _shared_attributes = AddIfTrue._shared_attributes | {"bet_type"}
+
     def __init__(
         self,
         bet_type: typing.Type[Bet] | tuple[typing.Type[Bet], ...],
@@ -411,26 +652,7 @@ class CountStrategy(AddIfTrue):
         self.bet_type = bet_type
         self.count = count
 
-        super().__init__(bet, key=self.key)
-
-    def key(self, player: Player) -> bool:
-        """Return True if the player has less than count number of bets for a given type and the
-        bet that is intended to be placed isn't already on the table.
-
-        Parameters
-        ----------
-        player
-            The player to count the bets for.
-
-        Returns
-        -------
-        Returns True if the player has less than count number of bets for a given type and the
-        bet that is intended to be placed isn't already on the table, otherwise returns False.
-        """
-        count_of_bets_with_type = len(player.get_bets_by_type(bet_type=self.bet_type))
-        identical_bet_is_not_on_table = self.bet not in player.bets
-
-        return count_of_bets_with_type < self.count and identical_bet_is_not_on_table
+        super().__init__(bet, CountBelow(bet_type, count) & ~HasBet(bet))
 
     def __repr__(self) -> str:
         return (
@@ -445,33 +667,10 @@ class RemoveIfPointOff(RemoveIfTrue):
     This will match bets based on type, and number for Place and Hardway bets.
     It will not consider bet amounts when matching."""
 
+    _shared_attributes = RemoveIfTrue._shared_attributes | {"bet"}
+
     def __init__(self, bet: Bet):
-        if not any([isinstance(bet, x) for x in [Place, HardWay, Hop]]):
-            key = (
-                lambda b, p: isinstance(b, type(self.bet))
-                and p.table.point.status == "Off"
-            )
-
-        if isinstance(bet, Place):
-            key = (
-                lambda b, p: isinstance(b, Place)
-                and b.number == self.bet.number
-                and p.table.point.status == "Off"
-            )
-        if isinstance(bet, HardWay):
-            key = (
-                lambda b, p: isinstance(b, HardWay)
-                and b.number == self.bet.number
-                and p.table.point.status == "Off"
-            )
-        if isinstance(bet, Hop):
-            key = (
-                lambda b, p: isinstance(b, Hop)
-                and b.result == self.bet.result
-                and p.table.point.status == "Off"
-            )
-
-        super().__init__(key)
+        super().__init__(MatchesBet(bet) & PointOff())
         self.bet = bet
 
     def __repr__(self) -> str:
@@ -481,14 +680,20 @@ class RemoveIfPointOff(RemoveIfTrue):
 class RemoveByType(RemoveIfTrue):
     """Remove any bets that are of the given type(s)."""
 
+    _shared_attributes = RemoveIfTrue._shared_attributes | {"bet_type"}
+
     def __init__(self, bet_type: typing.Type[Bet] | tuple[typing.Type[Bet], ...]):
-        super().__init__(lambda b, p: isinstance(b, bet_type))
+        self.bet_type = bet_type
+        super().__init__(IsBetType(bet_type))
 
 
 class WinProgression(Strategy):
     """Strategy that every time a bet is won, moves to the next amount in the progression and
     places a Field bet for that amount."""
 
+    _shared_attributes = frozenset({"_bet", "_multipliers", "_progression_strategies"})
+    memoizable = True
+
     def __init__(self, first_bet: Bet, multipliers: list[typing.SupportsFloat]) -> None:
         """Creates the given the progression.
 
@@ -499,9 +704,24 @@ class WinProgression(Strategy):
         progression
             A list of multipliers on the bet amounts to make. As you win, progresses farther up list.
         """
-        self.bet = first_bet
-        self.multipliers = multipliers
+        self._bet = copy.copy(first_bet)
+        self._multipliers = list(multipliers)
         self.current_progression = 0
+        self._build_strategies()
+
+    bet = _Setting(copy.copy)
+    """The first bet, including the starting amount."""
+    multipliers = _Setting(list)
+    """The multipliers of the bet amount for each step of the progression."""
+
+    def _build_strategies(self) -> None:
+        """Build the strategies placing the bet of each step of the progression, once
+        rather than on every call to update_bets."""
+        self._progression_strategies = []
+        for multiplier in self._multipliers:
+            new_bet = copy.copy(self._bet)
+            new_bet.amount = self._bet.amount * multiplier
+            self._progression_strategies.append(AddIfNotBet(new_bet))
 
     def completed(self, player: Player) -> bool:
         """If the players bankroll is below the minimum amount in the progression and if they
@@ -517,10 +737,14 @@ class WinProgression(Strategy):
         True if the
         """
         return (
-            player.bankroll < min(float(x) for x in self.multipliers)
+            player.bankroll < min(float(x) for x in self._multipliers)
             and len(player.bets) == 0
         )
 
+    def state_key(self) -> typing.Hashable:
+        # wins past the end of the progression stay at the last amount
+        return type(self), min(self.current_progression, len(self._multipliers) - 1)
+
     def after_roll(self, player: Player) -> None:
         """If the field bet wins, increase the progression by 1, if it loses reset the progression
         to 0.
@@ -531,7 +755,7 @@ class WinProgression(Strategy):
             The player to check the winning bets for.
         """
 
-        win = all(x.get_result(player.table).won for x in player.bets)
+        win = all(player.get_bet_result(x).won for x in player.bets)
 
         if win:
             self.current_progression += 1
@@ -546,14 +770,8 @@ class WinProgression(Strategy):
         player
             The player to place the bet for.
         """
-        new_bet = copy.copy(self.bet)
-        if self.current_progression >= len(self.multipliers):
-            new_bet.amount = self.bet.amount * self.multipliers[-1]
-        else:
-            new_bet.amount = (
-                self.bet.amount * self.multipliers[self.current_progression]
-            )
-        AddIfNotBet(new_bet).update_bets(player)
+        progression = min(self.current_progression, len(self._multipliers) - 1)
+        self._progression_strategies[progression].update_bets(player)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(first_bet={self.bet}, multipliers={self.multipliers})"
+        return f"{self.__class__.__name__}(first_bet={self._bet}, multipliers={self._multipliers})"
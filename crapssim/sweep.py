@@ -0,0 +1,353 @@
+"""
+Parameter sweeps of strategies. A strategy factory (e.g. HammerLock, or any function
+returning a Strategy) is run for every combination of a grid of parameters, each for
+many table sessions. The sessions are split into chunks which run on a pool of
+processes, and the summary of each configuration is yielded as soon as all of its
+chunks are done.
+
+Session i of every configuration uses the same dice (seeded from the root seed and i),
+so differences between configurations aren't hidden by the luck of the dice, and the
+results don't depend on the number of processes or the order the chunks finish in.
+Summaries of finished chunks can be stored in a cache, so running a grid again with
+more configurations (or more sessions) only runs the chunks which are new.
+"""
+
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import math
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+import crapssim
+from crapssim.strategy import Strategy
+from crapssim.table import Table, TableSettings
+
+__all__ = ["SessionSummary", "SweepResult", "sweep"]
+
+
+@dataclass(slots=True, frozen=True)
+class SessionSummary:
+    """
+    Summary statistics of the net win or loss of a player over a number of table
+    sessions. Summaries of separate sessions can be combined with merge().
+    """
+
+    n_sessions: int
+    """Number of sessions summarized."""
+    mean: float
+    """Mean net win (positive) or loss (negative) per session."""
+    sum_squares: float
+    """Sum of squared differences of the net wins from the mean."""
+    n_wins: int
+    """Number of sessions ending with more money than the player started with."""
+    n_ruined: int
+    """Number of sessions where the strategy completed (e.g. the player couldn't
+    afford the next bet) before the session ended."""
+    total_rolls: int
+    """Total number of rolls over all the sessions."""
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the net win per session."""
+        if self.n_sessions < 2:
+            return math.nan
+        return self.sum_squares / (self.n_sessions - 1)
+
+    @property
+    def standard_deviation(self) -> float:
+        """Sample standard deviation of the net win per session."""
+        return math.sqrt(self.variance)
+
+    @property
+    def standard_error(self) -> float:
+        """Standard error of the mean net win per session."""
+        return math.sqrt(self.variance / self.n_sessions)
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of sessions ending with more money than the player started with."""
+        return self.n_wins / self.n_sessions
+
+    @property
+    def ruin_rate(self) -> float:
+        """Fraction of sessions where the strategy completed before the session
+        ended."""
+        return self.n_ruined / self.n_sessions
+
+    @property
+    def mean_rolls(self) -> float:
+        """Mean number of rolls per session."""
+        return self.total_rolls / self.n_sessions
+
+    @classmethod
+    def from_sessions(
+        cls, net: typing.Sequence[float], ruined: typing.Sequence[bool], rolls: int
+    ) -> "SessionSummary":
+        """
+        Summary of the given sessions.
+
+        Parameters
+        ----------
+        net
+            The net win or loss of each session.
+        ruined
+            Whether the strategy completed before the end of each session.
+        rolls
+            Total number of rolls of the sessions.
+
+        Returns
+        -------
+        The SessionSummary of the sessions.
+        """
+        n = len(net)
+        mean = sum(net) / n if n > 0 else 0.0
+        return cls(
+            n_sessions=n,
+            mean=mean,
+            sum_squares=sum((x - mean) ** 2 for x in net),
+            n_wins=sum(x > 0 for x in net),
+            n_ruined=sum(ruined),
+            total_rolls=rolls,
+        )
+
+    def merge(self, other: "SessionSummary") -> "SessionSummary":
+        """
+        Summary of the sessions of both summaries.
+
+        Parameters
+        ----------
+        other
+            The summary to combine with this one.
+
+        Returns
+        -------
+        A new SessionSummary of all of the sessions.
+        """
+        n = self.n_sessions + other.n_sessions
+        if self.n_sessions == 0 or other.n_sessions == 0:
+            return self if other.n_sessions == 0 else other
+        delta = other.mean - self.mean
+        return SessionSummary(
+            n_sessions=n,
+            mean=self.mean + delta * other.n_sessions / n,
+            sum_squares=self.sum_squares
+            + other.sum_squares
+            + delta**2 * self.n_sessions * other.n_sessions / n,
+            n_wins=self.n_wins + other.n_wins,
+            n_ruined=self.n_ruined + other.n_ruined,
+            total_rolls=self.total_rolls + other.total_rolls,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SweepResult:
+    """The summary of the sessions of one configuration of a sweep."""
+
+    parameters: dict[str, typing.Any]
+    """The parameters the strategy factory was called with."""
+    summary: SessionSummary
+    """The summary of the sessions of the strategy."""
+
+
+def _run_session(
+    strategy: Strategy,
+    bankroll: float,
+    max_rolls: float,
+    max_shooter: float,
+    seed: int,
+    i: int,
+    runout: bool = False,
+    table_settings: TableSettings | None = None,
+) -> tuple[float, bool, int]:
+    """Net win, whether the strategy completed and the number of rolls of session i.
+    The dice of session i are seeded with child i of the root seed, and the table
+    settings replace the defaults of the Table."""
+    table = Table(seed=np.random.SeedSequence(seed, spawn_key=(i,)))
+    if table_settings is not None:
+        table.settings.update(table_settings)
+    table.add_player(bankroll, strategy)
+    table.run(max_rolls, max_shooter, verbose=False, runout=runout)
+    player = table.players[0]
+    return (
+        player.total_player_cash - bankroll,
+        player.strategy.completed(player),
+        table.dice.n_rolls,
+    )
+
+
+def _run_chunk(
+    factory: typing.Callable[..., Strategy],
+    parameters: dict[str, typing.Any],
+    bankroll: float,
+    max_rolls: float,
+    max_shooter: float,
+    seed: int,
+    start: int,
+    stop: int,
+) -> SessionSummary:
+    """Summary of sessions start to stop - 1 of one configuration."""
+    strategy = factory(**parameters)
+    net, ruined, rolls = [], [], 0
+    for i in range(start, stop):
+        session_net, session_ruined, session_rolls = _run_session(
+            strategy, bankroll, max_rolls, max_shooter, seed, i
+        )
+        net.append(session_net)
+        ruined.append(session_ruined)
+        rolls += session_rolls
+    return SessionSummary.from_sessions(net, ruined, rolls)
+
+
+def _expand_grid(
+    grid: dict[str, typing.Iterable] | typing.Iterable[dict[str, typing.Any]],
+) -> list[dict[str, typing.Any]]:
+    if isinstance(grid, dict):
+        names = list(grid)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(grid[x] for x in names))
+        ]
+    return [dict(x) for x in grid]
+
+
+def _chunk_key(factory: typing.Callable, parameters: dict, *settings) -> str:
+    """Cache key of a chunk of sessions, from the crapssim version (so a cache kept
+    between runs never returns summaries of an older simulator), the name of the
+    factory, the parameters and the settings of the sessions."""
+    name = f"{factory.__module__}.{factory.__qualname__}"
+    text = json.dumps(
+        [crapssim.__version__, name, parameters, *settings],
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _executor(max_workers: int | None) -> concurrent.futures.Executor | None:
+    """Pool of processes to run the chunks on, or None to run them in this process."""
+    if max_workers == 1:
+        return None
+    return concurrent.futures.ProcessPoolExecutor(max_workers)
+
+
+def _completed_chunks(
+    tasks: list[tuple], executor: concurrent.futures.Executor | None
+) -> typing.Iterator[tuple[tuple, SessionSummary]]:
+    """Run _run_chunk for each task on the executor (or in this process if it's None),
+    yielding (task, summary) as they finish."""
+    if executor is None:
+        for task in tasks:
+            yield task, _run_chunk(*task[1])
+        return
+
+    futures = {executor.submit(_run_chunk, *x[1]): x for x in tasks}
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # the executor may be used for more tasks, so only cancel the ones left here
+        for future in futures:
+            future.cancel()
+
+
+def sweep(
+    factory: typing.Callable[..., Strategy],
+    grid: dict[str, typing.Iterable] | typing.Iterable[dict[str, typing.Any]],
+    n_sessions: int,
+    bankroll: float = 100,
+    max_rolls: float = float("inf"),
+    max_shooter: float = 10,
+    seed: int | None = None,
+    chunk_size: int = 100,
+    max_workers: int | None = None,
+    cache: typing.MutableMapping[str, SessionSummary] | None = None,
+) -> typing.Iterator[SweepResult]:
+    """
+    Run a strategy for each configuration of a grid of parameters, yielding the
+    summary of each configuration as soon as its sessions are done.
+
+    Parameters
+    ----------
+    factory
+        Function or class returning the strategy for the parameters, e.g. HammerLock.
+        Must be importable by the worker processes (not a lambda) unless max_workers
+        is 1.
+    grid
+        Dictionary of the values of each parameter, every combination of which is run,
+        e.g. {"base_amount": [5, 10, 25]}, or an iterable of dictionaries of
+        parameters for each configuration.
+    n_sessions
+        Number of table sessions to run for each configuration.
+    bankroll
+        The starting bankroll of the player in each session.
+    max_rolls
+        Maximum number of rolls of each session.
+    max_shooter
+        Maximum number of shooters of each session.
+    seed
+        Root seed of the dice. The same seed gives the same results, regardless of
+        max_workers and chunk_size. If None, a random seed is used.
+    chunk_size
+        Number of sessions run by a process at a time.
+    max_workers
+        Number of processes to use, defaults to the number of CPUs. If 1, the
+        sessions are run in this process.
+    cache
+        Mapping to store the summary of each chunk of sessions in, like a dictionary
+        or a shelve.Shelf to keep it between runs. Chunks already in the cache aren't
+        run again.
+
+    Yields
+    ------
+    A SweepResult for each configuration, in the order they finish.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    configurations = _expand_grid(grid)
+    bounds = [
+        (start, min(start + chunk_size, n_sessions))
+        for start in range(0, n_sessions, chunk_size)
+    ]
+
+    chunks: list[list[SessionSummary | None]] = [
+        [None] * len(bounds) for _ in configurations
+    ]
+    tasks = []
+    for i, parameters in enumerate(configurations):
+        for j, (start, stop) in enumerate(bounds):
+            key = _chunk_key(
+                factory, parameters, bankroll, max_rolls, max_shooter, seed, start, stop
+            )
+            if cache is not None and key in cache:
+                chunks[i][j] = cache[key]
+            else:
+                settings = (bankroll, max_rolls, max_shooter, seed, start, stop)
+                tasks.append(((i, j, key), (factory, parameters, *settings)))
+
+    def result(i: int) -> SweepResult:
+        summary = SessionSummary.from_sessions([], [], 0)
+        for x in chunks[i]:
+            summary = summary.merge(x)
+        return SweepResult(configurations[i], summary)
+
+    remaining = [sum(x is None for x in c) for c in chunks]
+    for i, n in enumerate(remaining):
+        if n == 0:
+            yield result(i)
+
+    executor = _executor(max_workers)
+    try:
+        for ((i, j, key), _), summary in _completed_chunks(tasks, executor):
+            chunks[i][j] = summary
+            if cache is not None:
+                cache[key] = summary
+            remaining[i] -= 1
+            if remaining[i] == 0:
+                yield result(i)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
@@ -1,9 +1,8 @@
-import copy
 import typing
 
 from crapssim.dice import Dice
 
-from .bet import Bet, BetResult
+from .bet import Bet, BetResult, get_type_mask
 from .point import Point
 from .strategy import BetPassLine, Strategy
 
@@ -25,6 +24,7 @@ class TableUpdate:
         self.before_roll(table)
         self.update_table_stats(table)
         self.roll(table, dice_outcome, verbose)
+        self.resolve_bets(table)
         self.after_roll(table)
         self.update_bets(table, verbose)
         self.set_new_shooter(table)
@@ -71,6 +71,11 @@ class TableUpdate:
             print("Dice out!")
             print(f"Shooter rolled {table.dice.total} {table.dice.result}")
 
+    @staticmethod
+    def resolve_bets(table: "Table"):
+        for player in table.players:
+            player.resolve_bets()
+
     @staticmethod
     def after_roll(table: "Table"):
         for player in table.players:
@@ -362,10 +367,11 @@ class Player:
         name: str = "Player",
     ):
         self.bankroll: float = float(bankroll)
-        self.strategy: Strategy = copy.deepcopy(bet_strategy)
+        self.strategy: Strategy = bet_strategy.clone()
         self.name: str = name
         self.bets: list[Bet] = []
         self._table: Table = table
+        self._bet_results: dict[int, BetResult] = {}
 
     @property
     def total_bet_amount(self) -> float:
@@ -409,7 +415,8 @@ class Player:
 
         Notably, bets like Place(4, 1.0) will match to Place(6, 1.0).
         """
-        return [x for x in self.bets if isinstance(x, bet_type)]
+        mask = get_type_mask(bet_type)
+        return [x for x in self.bets if x.__class__.family_mask & mask]
 
     def has_bets(self, bet_type: typing.Type[Bet] | tuple[typing.Type[Bet], ...]):
         return len(self.get_bets_by_type(bet_type)) > 0
@@ -424,9 +431,32 @@ class Player:
         if self.strategy is not None:
             self.strategy.update_bets(self)
 
+    def resolve_bets(self) -> None:
+        """
+        Resolve each of the player's bets against the current roll.
+
+        Every bet is resolved exactly once per roll, and the results are kept
+        until the bets are updated so that Strategy.after_roll and update_bet
+        share them (some bets, like Fire, change state when resolved).
+        """
+        self._bet_results = {id(bet): bet.get_result(self.table) for bet in self.bets}
+
+    def get_bet_result(self, bet: Bet) -> BetResult:
+        """
+        Returns the result of the given bet for the current roll.
+
+        Uses the result from resolve_bets if available, otherwise resolves the
+        bet and keeps the result for the rest of the roll.
+        """
+        result = self._bet_results.get(id(bet))
+        if result is None:
+            result = bet.get_result(self.table)
+            self._bet_results[id(bet)] = result
+        return result
+
     def update_bet(self, verbose: bool = False) -> None:
         for bet in self.bets[:]:
-            result: BetResult = bet.get_result(self.table)
+            result: BetResult = self.get_bet_result(bet)
             self.bankroll += result.bankroll_change
 
             if verbose:
@@ -434,6 +464,7 @@ class Player:
 
             if result.remove:
                 self.bets.remove(bet)
+        self._bet_results = {}
 
     def print_bet_update(self, bet: Bet, result: BetResult) -> None:
         if result.won:
@@ -258,3 +258,134 @@ def test_hop_inequality():
 
     assert hop_one != hop_two
     assert hop_one != hop_three
+
+
+def _fire_with_points(points_made):
+    bet = crapssim.bet.Fire(1)
+    bet.points_made = set(points_made)
+    return bet
+
+
+def _ats_with_rolled(bet, rolled_numbers):
+    bet.rolled_numbers = set(rolled_numbers)
+    return bet
+
+
+@pytest.mark.parametrize("point", [None, 4, 6, 9])
+@pytest.mark.parametrize(
+    "bet",
+    [
+        PassLine(5),
+        Come(5),
+        Come(5, 8),
+        crapssim.bet.DontPass(5),
+        DontCome(5),
+        DontCome(5, 10),
+        Odds(PassLine, 6, 5),
+        Odds(crapssim.bet.DontPass, 4, 5),
+        crapssim.bet.Place(5, 5),
+        crapssim.bet.Field(5),
+        CAndE(5),
+        crapssim.bet.Any7(5),
+        crapssim.bet.Boxcars(5),
+        crapssim.bet.AnyCraps(5),
+        crapssim.bet.HardWay(8, 5),
+        Hop((1, 4), 5),
+        Hop((5, 5), 5),
+        _fire_with_points([]),
+        _fire_with_points([4, 5, 6, 8, 9]),
+        crapssim.bet.All(5),
+        _ats_with_rolled(crapssim.bet.Tall(5), [8, 9, 10, 11]),
+        _ats_with_rolled(crapssim.bet.Small(5), [2, 3, 4, 5, 6]),
+    ],
+)
+def test_payoff_vector_matches_get_result(bet, point):
+    table = Table()
+    table.point.number = point
+    expected = Bet.get_payoff_vector(bet, table)
+    payoff = bet.get_payoff_vector(table)
+    assert np.allclose(payoff.net, expected.net)
+    assert np.array_equal(payoff.resolves, expected.resolves)
+
+
+def test_payoff_vector_doesnt_change_bet():
+    table = Table()
+    table.point.number = 10
+    bet = crapssim.bet.Fire(1)
+    Bet.get_payoff_vector(bet, table)
+    bet.get_payoff_vector(table)
+    assert bet.points_made == set()
+
+
+@pytest.mark.parametrize(
+    "bet, attribute",
+    [
+        (crapssim.bet.Fire(1), "points_made"),
+        (crapssim.bet.All(1), "rolled_numbers"),
+        (crapssim.bet.Tall(1), "rolled_numbers"),
+    ],
+)
+def test_placed_copy_doesnt_share_state(bet, attribute):
+    table = Table()
+    table.point.number = 8
+    table.dice.result = (4, 4)
+    placed_bet = bet + 0
+    placed_bet.get_result(table)
+    assert getattr(bet, attribute) == set()
+    assert getattr(placed_bet, attribute) != set()
+
+
+def test_payoff_vector_expected_value():
+    table = Table()
+    payoff = crapssim.bet.Field(1).get_payoff_vector(table)
+    assert (round(payoff.expected_value, 4), payoff.resolve_probability) == (-0.0556, 1)
+
+
+def test_type_codes_unique():
+    codes = [x.type_code for x in (PassLine, Come, Odds, CAndE, Hop, Bet)]
+    assert len(set(codes)) == len(codes)
+
+
+def test_type_codes_stable():
+    assert (Bet.type_code, PassLine.type_code, crapssim.bet.Small.type_code) == (
+        0,
+        3,
+        23,
+    )
+
+    class Lay(crapssim.bet._SimpleBet):
+        pass
+
+    assert Lay.type_code >= len(crapssim.bet._BUILTIN_TYPE_CODES)
+    assert crapssim.bet._BET_TYPES[Lay.type_code] is Lay
+    assert Lay.family_mask & crapssim.bet.get_type_mask(crapssim.bet._SimpleBet)
+
+
+@pytest.mark.parametrize(
+    "bet, bet_type",
+    [
+        (PassLine(5), PassLine),
+        (PassLine(5), Bet),
+        (crapssim.bet.Place(6, 5), crapssim.bet._SimpleBet),
+        (crapssim.bet.Place(6, 5), (Come, crapssim.bet.Place)),
+        (crapssim.bet.Tall(5), crapssim.bet._ATSBet),
+        (crapssim.bet.Field(5), crapssim.bet._WinningLosingNumbersBet),
+        (Come(5), PassLine),
+        (DontCome(5), Come),
+        (crapssim.bet.Any7(5), (Come, crapssim.bet.Place)),
+        (Hop((1, 2), 5), crapssim.bet._WinningLosingNumbersBet),
+    ],
+)
+def test_type_mask_matches_isinstance(bet, bet_type):
+    mask = crapssim.bet.get_type_mask(bet_type)
+    assert bool(bet.family_mask & mask) == isinstance(bet, bet_type)
+
+
+@pytest.mark.parametrize(
+    "bet_type", crapssim.bet._BET_TYPES.values(), ids=lambda x: x.__name__
+)
+def test_no_mutable_class_attributes(bet_type):
+    # bets of tables on different threads share their class attributes
+    for name, value in vars(bet_type).items():
+        if not name.startswith("__"):
+            assert not isinstance(value, (list, dict, set)), name
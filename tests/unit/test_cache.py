@@ -0,0 +1,102 @@
+import concurrent.futures
+import os
+
+import numpy as np
+import pytest
+
+import crapssim.simulation as simulation_module
+from crapssim.cache import ResultCache, simulation_key
+from crapssim.simulation import Simulation
+from crapssim.strategy.examples import IronCross
+
+
+def test_key_canonical():
+    simulation = Simulation(IronCross(5), 4, max_shooter=2, seed=1)
+    assert simulation_key(simulation) == simulation_key(
+        Simulation(IronCross(5.0), 4, max_shooter=2.0, seed=1, table_settings={})
+    )
+    assert simulation_key(simulation) != simulation_key(simulation, "summary")
+    assert simulation_key(simulation) != simulation_key(
+        Simulation(IronCross(5), 4, max_shooter=2, seed=2)
+    )
+    assert simulation_key(simulation) != simulation_key(
+        Simulation(IronCross(5), 4, max_shooter=2, seed=1, runout=True)
+    )
+    assert simulation_key(simulation) != simulation_key(
+        Simulation(
+            IronCross(5), 4, max_shooter=2, seed=1, table_settings={"max_odds": {}}
+        )
+    )
+
+
+def test_run_uses_cache(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    simulation = Simulation(IronCross(5), 6, max_shooter=2, seed=1)
+    result = simulation.run(max_workers=1, cache=cache)
+    assert simulation in cache and len(cache) == 1
+
+    def fail(*args):
+        raise AssertionError("sessions run")
+
+    monkeypatch.setattr(simulation_module, "_run_sessions", fail)
+    monkeypatch.setattr(simulation_module, "_summarize_sessions", fail)
+    cached = simulation.run(max_workers=1, cache=ResultCache(tmp_path))
+    np.testing.assert_array_equal(cached.net, result.net)
+    np.testing.assert_array_equal(cached.ruined, result.ruined)
+    np.testing.assert_array_equal(cached.rolls, result.rolls)
+    with pytest.raises(AssertionError):
+        simulation.summarize(max_workers=1, cache=cache)
+
+
+def test_summarize_uses_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    simulation = Simulation(IronCross(5), 6, max_shooter=2, seed=1)
+    summary = simulation.summarize(max_workers=1, chunk_size=4, cache=cache)
+    assert simulation.summarize(max_workers=1, chunk_size=4, cache=cache) == summary
+    assert len(cache) == 1
+    simulation.summarize(max_workers=1, chunk_size=3, cache=cache)
+    assert len(cache) == 2
+
+
+def test_evicts_least_recently_used(tmp_path):
+    simulations = [
+        Simulation(IronCross(5), 50, max_shooter=1, seed=x) for x in range(3)
+    ]
+    cache = ResultCache(tmp_path)
+    for i, simulation in enumerate(simulations[:2]):
+        simulation.run(max_workers=1, cache=cache)
+        os.utime(tmp_path / f"{simulation_key(simulation)}.npz", (i, i))
+    cache.load(simulations[0])  # now the most recently used
+
+    cache.max_bytes = cache.size
+    simulations[2].run(max_workers=1, cache=cache)
+    assert simulations[0] in cache
+    assert simulations[1] not in cache
+    assert simulations[2] in cache
+    assert cache.size <= cache.max_bytes
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_damaged_entry_is_a_miss(tmp_path):
+    cache = ResultCache(tmp_path)
+    simulation = Simulation(IronCross(5), 3, max_shooter=1, seed=1)
+    simulation.run(max_workers=1, cache=cache)
+    (tmp_path / f"{simulation_key(simulation)}.npz").write_bytes(b"not a zip")
+    assert cache.load(simulation) is None
+    assert simulation not in cache
+
+
+def _run_cached(directory, seed):
+    simulation = Simulation(IronCross(5), 20, max_shooter=1, seed=seed % 3)
+    return simulation.run(max_workers=1, cache=ResultCache(directory, 20_000)).net
+
+
+def test_concurrent_processes(tmp_path):
+    with concurrent.futures.ProcessPoolExecutor(3) as executor:
+        results = list(executor.map(_run_cached, [tmp_path] * 12, range(12)))
+    for i, net in enumerate(results):
+        np.testing.assert_array_equal(net, results[i % 3])
+    assert ResultCache(tmp_path).size <= 20_000
+    assert not any(x.suffix == ".tmp" for x in tmp_path.iterdir())
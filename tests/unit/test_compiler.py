@@ -0,0 +1,116 @@
+import pytest
+
+import crapssim.strategy.examples as examples
+from crapssim.bet import Come, DontCome, Field, HardWay, PassLine, Place
+from crapssim.strategy import (
+    AddIfNewShooter,
+    AddIfTrue,
+    AggregateStrategy,
+    BetDontPass,
+    BetPassLine,
+    BetPlace,
+    ComeOddsMultiplier,
+    CountStrategy,
+    DontComeOddsMultiplier,
+    DontPassOddsMultiplier,
+    OddsAmount,
+    PassLineOddsMultiplier,
+    RemoveIfPointOff,
+)
+from crapssim.strategy.compiler import CompiledStrategy, compile_strategy
+from crapssim.strategy.single_bet import (
+    BetCome,
+    BetDontCome,
+    BetFire,
+    BetHardWay,
+    BetHop,
+    StrategyMode,
+)
+from crapssim.strategy.tools import RemoveByType
+from crapssim.table import Table, TableUpdate
+
+STRATEGIES = [
+    examples.Pass2Come(5),
+    examples.PassLinePlace68(),
+    examples.PlaceInside(5),
+    examples.Place68Move59(),
+    examples.PassLinePlace68Move59(),
+    examples.Place682Come(),
+    examples.IronCross(5),
+    examples.HammerLock(5),
+    examples.Risk12(),
+    examples.Knockout(5),
+    examples.DiceDoctor(),
+    examples.Place68PR(),
+    examples.Place68DontCome2Odds(),
+    BetPlace({4: 10, 5: 10, 6: 12, 8: 12, 9: 10, 10: 10}, skip_come=True)
+    + BetPassLine(5)
+    + BetCome(5)
+    + ComeOddsMultiplier(2),
+    BetPlace({5: 5, 6: 6}, mode=StrategyMode.ADD_IF_NOT_BET, skip_point=False)
+    + CountStrategy((PassLine, Come), 3, Come(5))
+    + RemoveByType(Place),
+    AddIfNewShooter(Field(5))
+    + RemoveIfPointOff(Field(5))
+    + AddIfTrue(Place(4, 10), lambda p: p.bankroll > 80)
+    + BetHardWay(4, 1)
+    + BetHop((1, 2), 1, StrategyMode.REPLACE)
+    + BetDontCome(5)
+    + DontComeOddsMultiplier(2),
+    AggregateStrategy(
+        BetPassLine(5) + PassLineOddsMultiplier(2),
+        BetDontPass(5, StrategyMode.ADD_OR_INCREASE) + DontPassOddsMultiplier(6),
+        BetFire(1),
+        BetPlace({6: 6}, mode=StrategyMode.BET_IF_POINT_ON),
+        OddsAmount(DontCome, {4: 10, 10: 10}),
+    ),
+]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=repr)
+@pytest.mark.parametrize("bankroll", [30, 500])
+def test_compiled_strategy_makes_same_bets(strategy, bankroll):
+    table = Table(seed=12)
+    table.add_player(bankroll, strategy)
+    table.add_player(bankroll, compile_strategy(strategy))
+    player, compiled_player = table.players
+
+    for _ in range(500):
+        TableUpdate().run(table, verbose=False)
+        assert compiled_player.bets == player.bets
+        assert compiled_player.bankroll == player.bankroll
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        examples.IronCross(5),
+        examples.Knockout(5),
+        examples.PlaceInside(5),
+        BetPlace({6: 6, 8: 6}) + CountStrategy(Come, 2, Come(5)) + RemoveByType(Place),
+    ],
+    ids=repr,
+)
+def test_compile_strategy_flattens_tree(strategy):
+    compiled = compile_strategy(strategy)
+    assert compiled.n_interpreted == 0
+
+
+def test_compile_strategy_lambda_key_interpreted():
+    compiled = compile_strategy(
+        BetPassLine(5) + AddIfTrue(Place(6, 6), lambda p: p.bankroll > 100)
+    )
+    assert compiled.n_interpreted == 1
+
+
+def test_compile_strategy_already_compiled():
+    compiled = compile_strategy(BetPassLine(5))
+    assert compile_strategy(compiled) is compiled
+
+
+def test_compiled_strategy_repr():
+    compiled = CompiledStrategy(BetHardWay(6, 1))
+    assert repr(compiled) == (
+        "CompiledStrategy(BetHardWay(6, bet_amount=1.0, mode=StrategyMode.ADD_IF_NOT_BET))"
+    )
+    assert compiled.strategy.bet == HardWay(6, 1)
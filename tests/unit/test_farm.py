@@ -0,0 +1,117 @@
+import concurrent.futures
+import json
+import os
+import time
+
+import pytest
+
+import crapssim.farm
+from crapssim.farm import Manifest, main, merge, plan, work
+from crapssim.simulation import Simulation
+from crapssim.strategy.examples import IronCross
+
+SPEC = {"type": "IronCross", "base_amount": 5}
+
+
+def run_plan(directory, **kwargs):
+    settings = {"n_sessions": 10, "shard_size": 3, "max_shooter": 2, "seed": 6}
+    return plan(directory, SPEC, **(settings | kwargs))
+
+
+def test_plan_manifest(tmp_path):
+    manifest = run_plan(tmp_path)
+    assert [(x.start, x.stop) for x in manifest.shards] == [
+        (0, 3),
+        (3, 6),
+        (6, 9),
+        (9, 10),
+    ]
+    assert Manifest.load(tmp_path) == manifest
+    with pytest.raises(FileExistsError):
+        run_plan(tmp_path)
+
+
+def test_work_and_merge(tmp_path):
+    run_plan(tmp_path)
+    assert work(tmp_path, max_shards=1) == [0]
+    with pytest.raises(ValueError):
+        merge(tmp_path)
+    assert work(tmp_path) == [1, 2, 3]
+    assert work(tmp_path) == []
+
+    summary = merge(tmp_path)
+    expected = Simulation(IronCross(5), 10, max_shooter=2, seed=6).run(max_workers=1)
+    assert summary.n_sessions == 10
+    assert summary.total_rolls == expected.summary.total_rolls
+    assert summary.mean == pytest.approx(expected.summary.mean)
+
+
+def test_workers_share_directory(tmp_path):
+    run_plan(tmp_path / "one")
+    work(tmp_path / "one")
+
+    run_plan(tmp_path / "many")
+    with concurrent.futures.ProcessPoolExecutor(3) as executor:
+        done = list(executor.map(work, [tmp_path / "many"] * 3))
+    assert sorted(x for shards in done for x in shards) == [0, 1, 2, 3]
+    assert merge(tmp_path / "many") == merge(tmp_path / "one")
+
+
+def test_work_skips_locked_shards(tmp_path):
+    run_plan(tmp_path)
+    (tmp_path / "shard-000000.lock").write_text("other worker\n")
+    assert work(tmp_path) == [1, 2, 3]
+
+    old = time.time() - 100
+    os.utime(tmp_path / "shard-000000.lock", (old, old))
+    assert work(tmp_path, stale_after=1000) == []
+    assert work(tmp_path, stale_after=10) == [0]
+    assert merge(tmp_path).n_sessions == 10
+
+
+def test_stale_lock_changed_before_take_over(tmp_path):
+    lock = tmp_path / "shard-000000.lock"
+    lock.write_text("dead worker\n")
+    old = time.time() - 100
+    os.utime(lock, (old, old))
+    state = crapssim.farm._lock_state(lock)
+
+    # another worker takes the lock over first
+    lock.unlink()
+    lock.write_text("other worker\n")
+    assert not crapssim.farm._take_over(lock, state)
+    assert lock.read_text() == "other worker\n"
+    assert list(tmp_path.iterdir()) == [lock]
+
+    assert crapssim.farm._take_over(lock, crapssim.farm._lock_state(lock))
+    assert not lock.exists()
+
+
+def test_work_touches_lock(tmp_path, monkeypatch):
+    run_plan(tmp_path, n_sessions=3)
+    lock = tmp_path / "shard-000000.lock"
+    summarize_sessions = crapssim.farm._summarize_sessions
+    ages = []
+
+    def slow_chunk(*args):
+        old = time.time() - 100
+        os.utime(lock, (old, old))
+        time.sleep(0.2)
+        ages.append(time.time() - lock.stat().st_mtime)
+        return summarize_sessions(*args)
+
+    monkeypatch.setattr(crapssim.farm, "_summarize_sessions", slow_chunk)
+    assert work(tmp_path, heartbeat=0.01) == [0]
+    assert ages[0] < 1
+
+
+def test_cli(tmp_path, capsys):
+    spec = tmp_path / "strategy.json"
+    spec.write_text(json.dumps(SPEC))
+    directory = str(tmp_path / "run")
+    main(["plan", directory, "--strategy", str(spec), "--sessions", "4"])
+    main(["work", directory])
+    main(["merge", directory])
+    output = capsys.readouterr().out
+    summary = json.loads(output[output.index("{") :])
+    assert summary["n_sessions"] == 4
@@ -0,0 +1,115 @@
+import copy
+
+import numpy as np
+import pytest
+
+from crapssim.bet import (
+    All,
+    Any7,
+    AnyCraps,
+    Boxcars,
+    CAndE,
+    Come,
+    DontCome,
+    DontPass,
+    Field,
+    Fire,
+    HardWay,
+    Hop,
+    Odds,
+    PassLine,
+    Place,
+    Small,
+    Tall,
+    Three,
+    Two,
+    Yo,
+)
+from crapssim.kernel import BetArrays, resolve_bets
+from crapssim.table import Table
+
+POINTS = (4, 5, 6, 8, 9, 10)
+
+
+def random_bet(rng: np.random.Generator):
+    amount = float(rng.choice([1, 5, 6, 7.5, 10, 12, 25, 33.3]))
+    number = int(rng.choice(POINTS))
+    base = [PassLine, Come, DontPass, DontCome][rng.integers(4)]
+    fire = Fire(amount)
+    fire.points_made = set(rng.choice(POINTS, size=rng.integers(6), replace=False))
+    ats = [All(amount), Tall(amount), Small(amount)][rng.integers(3)]
+    ats.rolled_numbers = {x for x in ats.numbers if rng.random() < 0.6}
+    bets = [
+        PassLine(amount),
+        Come(amount),
+        Come(amount, number),
+        DontPass(amount),
+        DontCome(amount),
+        DontCome(amount, number),
+        Odds(base, number, amount),
+        Place(number, amount),
+        Field(amount),
+        CAndE(amount),
+        Any7(amount),
+        Two(amount),
+        Three(amount),
+        Yo(amount),
+        Boxcars(amount),
+        AnyCraps(amount),
+        HardWay(int(rng.choice([4, 6, 8, 10])), amount),
+        Hop(tuple(int(x) for x in rng.integers(1, 7, size=2)), amount),
+        fire,
+        ats,
+    ]
+    return bets[rng.integers(len(bets))]
+
+
+def bet_state(bet):
+    if isinstance(bet, Fire):
+        return sum(1 << x for x in bet.points_made)
+    if isinstance(bet, (All, Tall, Small)):
+        return sum(1 << x for x in bet.rolled_numbers)
+    return 0
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_kernel_matches_get_result(seed):
+    rng = np.random.default_rng(seed)
+    n_tables = 50
+    dice = rng.integers(1, 7, size=(n_tables, 2))
+    point = np.where(rng.random(n_tables) < 0.3, 0, rng.choice(POINTS, n_tables))
+    bets = [random_bet(rng) for _ in range(2000)]
+    table_index = rng.integers(n_tables, size=len(bets))
+
+    result = resolve_bets(
+        BetArrays.from_bets(bets, table_index), dice, point, Table().settings
+    )
+
+    table = Table()
+    for i, bet in enumerate(bets):
+        bet = copy.deepcopy(bet)
+        t = table_index[i]
+        table.point.number = int(point[t]) if point[t] != 0 else None
+        table.dice.result = tuple(int(x) for x in dice[t])
+        expected = bet.get_result(table)
+        assert (result.amount[i], result.remove[i], result.state[i]) == (
+            expected.amount,
+            expected.remove,
+            bet_state(bet),
+        ), bet
+
+
+def test_kernel_uses_table_settings():
+    settings = Table().settings
+    settings["field_payouts"] = {2: 3, 3: 1, 4: 1, 9: 1, 10: 1, 11: 1, 12: 3}
+    bets = BetArrays.from_bets([Field(5)])
+    result = resolve_bets(bets, np.array([[6, 6]]), np.array([0]), settings)
+    assert result.amount[0] == 20
+
+
+def test_kernel_unsupported_bet():
+    class MyPlace(Place):
+        pass
+
+    with pytest.raises(NotImplementedError):
+        BetArrays.from_bets([MyPlace(6, 6)])
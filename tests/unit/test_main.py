@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+
+from crapssim.__main__ import main
+from crapssim.simulation import Simulation
+from crapssim.strategy.spec import strategy_from_spec
+
+
+def test_simulate_preset(capsys):
+    main(
+        [
+            "simulate",
+            "--strategy",
+            "IronCross",
+            "--param",
+            "base_amount=5",
+            "--sessions",
+            "12",
+            "--max-shooter",
+            "2",
+            "--seed",
+            "3",
+            "--workers",
+            "2",
+            "--chunk-size",
+            "5",
+        ]
+    )
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [int(x["sessions"]) for x in rows] == [5, 10, 12]
+
+    expected = Simulation(
+        strategy_from_spec({"type": "IronCross", "base_amount": 5}),
+        12,
+        max_shooter=2,
+        seed=3,
+    ).summarize(1, 5)
+    assert float(rows[-1]["mean"]) == pytest.approx(expected.summary.mean)
+    assert float(rows[-1]["mean_rolls"]) == pytest.approx(expected.summary.mean_rolls)
+
+
+def test_simulate_spec_file_to_jsonl(tmp_path):
+    spec = tmp_path / "strategy.json"
+    spec.write_text(json.dumps([{"type": "BetPassLine", "bet_amount": 5}]))
+    output = tmp_path / "rows.jsonl"
+    main(
+        [
+            "simulate",
+            "--strategy",
+            str(spec),
+            "--sessions",
+            "4",
+            "--max-rolls",
+            "10",
+            "--runout",
+            "--table-settings",
+            '{"field_payouts": {"2": 3, "12": 3}}',
+            "--workers",
+            "1",
+            "--output",
+            str(output),
+            "--format",
+            "jsonl",
+        ]
+    )
+    rows = [json.loads(x) for x in output.read_text().splitlines()]
+    assert rows[-1]["sessions"] == 4
+    assert rows[-1]["mean_rolls"] >= 10
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        ["--strategy", "NoSuchStrategy"],
+        ["--strategy", "IronCross", "--param", "no_such_parameter=1"],
+        ["--strategy", "IronCross", "--table-settings", '{"no_such_setting": 1}'],
+    ],
+)
+def test_simulate_invalid_arguments(arguments):
+    with pytest.raises(SystemExit):
+        main(["simulate", "--sessions", "1", *arguments])
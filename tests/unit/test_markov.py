@@ -0,0 +1,124 @@
+import pytest
+
+from crapssim.bet import (
+    All,
+    Come,
+    DontPass,
+    Field,
+    Fire,
+    HardWay,
+    PassLine,
+    Place,
+    Small,
+)
+import crapssim.strategy.examples as examples
+from crapssim.markov import analyze_bet, explore_strategy
+from crapssim.strategy import BetPassLine
+from crapssim.strategy.single_bet import BetField
+from crapssim.table import Table
+
+
+@pytest.mark.parametrize(
+    "bet, house_edge",
+    [
+        (PassLine(1), 7 / 495),
+        (Come(1), 7 / 495),
+        (DontPass(1), 0.0140),
+        (Place(4, 1), 1 / 15),
+        (Place(6, 1), 1 / 66),
+        (HardWay(8, 1), 1 / 11),
+        (Field(1), 1 / 18),
+        (Fire(1), 0.2076),
+        (Small(1), 0.1830),
+        (All(1), 0.2061),
+    ],
+)
+def test_house_edge(bet, house_edge):
+    assert round(analyze_bet(bet).house_edge, 4) == round(house_edge, 4)
+
+
+def test_pass_line_odds_house_edge():
+    analysis = analyze_bet(PassLine(5), odds_multiplier=2)
+    assert (round(analysis.expected_value, 6), round(analysis.house_edge, 6)) == (
+        round(-5 * 7 / 495, 6),
+        round(7 / 495 / (1 + 2 * 2 / 3), 6),
+    )
+
+
+def test_pass_line_variance():
+    analysis = analyze_bet(PassLine(1))
+    assert analysis.variance == pytest.approx(1 - (7 / 495) ** 2)
+
+
+def test_pass_line_expected_rolls():
+    analysis = analyze_bet(PassLine(1))
+    assert analysis.expected_rolls == pytest.approx(557 / 165)
+
+
+@pytest.mark.parametrize("bet", [PassLine(1), Place(5, 1), Fire(1), Small(1)])
+def test_resolution_time_sums_to_one(bet):
+    analysis = analyze_bet(bet)
+    assert analysis.resolution_time.sum() == pytest.approx(1)
+
+
+def test_come_with_number_has_no_come_out():
+    analysis = analyze_bet(Come(1, 4))
+    assert analysis.expected_value == pytest.approx(-1 / 3)
+
+
+def test_field_matches_payoff_vector():
+    table = Table()
+    analysis = analyze_bet(Field(1))
+    assert analysis.expected_value == pytest.approx(
+        Field(1).get_payoff_vector(table).expected_value
+    )
+
+
+def test_table_settings_used():
+    settings = Table().settings
+    settings["field_payouts"] = {2: 3, 3: 1, 4: 1, 9: 1, 10: 1, 11: 1, 12: 3}
+    analysis = analyze_bet(Field(1), settings=settings)
+    assert analysis.expected_value == pytest.approx(0)
+
+
+def test_bet_not_changed():
+    bet = Fire(1)
+    analyze_bet(bet, point=4)
+    assert bet.points_made == set()
+
+
+def test_explore_pass_line_ev_per_roll():
+    chain = explore_strategy(BetPassLine(1))
+    assert chain.expected_value_per_roll == pytest.approx(-(7 / 495) / (557 / 165))
+
+
+def test_explore_field_session():
+    chain = explore_strategy(BetField(1))
+    assert chain.expected_value_per_roll == pytest.approx(-1 / 18)
+    assert chain.expected_session_net(10) == pytest.approx(-10 / 18)
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [examples.Risk12(), examples.DiceDoctor(), examples.HammerLock(5)],
+    ids=repr,
+)
+def test_explore_matches_enumeration(strategy):
+    chain = explore_strategy(strategy)
+    rows = chain.transition_matrix().sum(axis=1)
+    assert rows == pytest.approx(1)
+
+    outcomes = [(d1, d2) for d1 in range(1, 7) for d2 in range(1, 7)]
+    expected = 0.0
+    for first in outcomes:
+        for second in outcomes:
+            table = Table()
+            table.add_player(1e6, strategy)
+            table.fixed_run([first, second])
+            expected += (table.players[0].total_player_cash - 1e6) / 36**2
+    assert chain.expected_session_net(2) == pytest.approx(expected)
+
+
+def test_explore_max_states():
+    with pytest.raises(ValueError):
+        explore_strategy(examples.HammerLock(5), max_states=10)
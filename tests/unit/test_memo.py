@@ -0,0 +1,140 @@
+import pytest
+
+import crapssim.strategy.examples as examples
+from crapssim.bet import Come, Field, PassLine, Place
+from crapssim.strategy import (
+    AddIfTrue,
+    BetPassLine,
+    BetPlace,
+    CountStrategy,
+    MemoizedStrategy,
+    PassLineOddsMultiplier,
+    compile_strategy,
+)
+from crapssim.strategy.memo import benchmark_memoization
+from crapssim.strategy.single_bet import BetFire
+from crapssim.strategy.tools import NullStrategy
+from crapssim.table import Table, TableUpdate
+
+STRATEGIES = [
+    examples.Pass2Come(5),
+    examples.PlaceInside(5),
+    examples.Place68Move59(),
+    examples.IronCross(5),
+    examples.HammerLock(5),
+    examples.Risk12(),
+    examples.Knockout(5),
+    examples.DiceDoctor(),
+    examples.Place68PR(),
+    examples.Place68DontCome2Odds(),
+    compile_strategy(examples.HammerLock(5)),
+    BetPassLine(5) + PassLineOddsMultiplier(2) + BetFire(1),
+    BetPlace({5: 5, 6: 6}) + CountStrategy((PassLine, Come), 3, Come(5)),
+]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=repr)
+@pytest.mark.parametrize("bankroll", [30, 500])
+@pytest.mark.parametrize("bankroll_cap", [float("inf"), 100])
+def test_memoized_strategy_makes_same_bets(strategy, bankroll, bankroll_cap):
+    memoized = MemoizedStrategy(strategy, bankroll_cap=bankroll_cap)
+    table = Table(seed=5)
+    table.add_player(bankroll, strategy)
+    table.add_player(bankroll, memoized)
+    player, memoized_player = table.players
+
+    for _ in range(500):
+        TableUpdate().run(table, verbose=False)
+        assert memoized_player.bets == player.bets
+        assert memoized_player.bankroll == player.bankroll
+
+
+def test_memoized_strategy_hits():
+    memoized = MemoizedStrategy(examples.IronCross(5), bankroll_cap=100)
+    table = Table(seed=2)
+    table.add_player(10_000, memoized)
+    table.add_player(10_000, memoized)
+    table.run(200, verbose=False)
+    assert memoized.memoizable
+    assert memoized.hits > memoized.misses
+    assert memoized.hits + memoized.misses == 400
+
+
+def test_memoized_strategy_maxsize():
+    memoized = MemoizedStrategy(examples.Place68PR(), maxsize=5)
+    table = Table(seed=2)
+    table.add_player(1_000, memoized)
+    table.run(300, verbose=False)
+    assert len(memoized._cache.decisions) == 5
+
+
+def test_memoized_strategy_opt_out():
+    strategy = BetPassLine(5) + AddIfTrue(Field(5), lambda p: p.table.pass_rolls > 2)
+    memoized = MemoizedStrategy(strategy)
+    assert not memoized.memoizable
+
+    table = Table(seed=3)
+    table.add_player(100, strategy)
+    table.add_player(100, memoized)
+    for _ in range(100):
+        TableUpdate().run(table, verbose=False)
+        assert table.players[1].bets == table.players[0].bets
+    assert memoized.hits == memoized.misses == 0
+
+
+def test_memoized_strategy_declared_inputs():
+    class FieldAfterTwoRolls(AddIfTrue):
+        memoizable = True
+
+        def __init__(self):
+            super().__init__(Field(5), lambda p: p.table.pass_rolls > 2)
+
+        def memo_key(self, player):
+            return super().memo_key(player), player.table.pass_rolls > 2
+
+    memoized = MemoizedStrategy(FieldAfterTwoRolls() + BetPlace({6: 6}))
+    assert memoized.memoizable
+
+    table = Table(seed=3)
+    table.add_player(1_000, FieldAfterTwoRolls() + BetPlace({6: 6}))
+    table.add_player(1_000, memoized)
+    for _ in range(300):
+        TableUpdate().run(table, verbose=False)
+        assert table.players[1].bets == table.players[0].bets
+    assert memoized.hits > 0
+
+
+def test_memoized_strategy_repr():
+    assert repr(MemoizedStrategy(BetPlace({6: 6}))) == (
+        "MemoizedStrategy(BetPlace(place_bet_amounts={6: 6}, "
+        "mode=StrategyMode.BET_IF_POINT_ON, "
+        "skip_point=True, skip_come=False))"
+    )
+
+
+def test_memoizable_is_opt_in():
+    class PlaceSixIfPointOn(NullStrategy):
+        def update_bets(self, player):
+            if player.table.point.status == "On":
+                player.add_bet(Place(6, 6))
+
+    class PressedPlace(BetPlace):
+        def update_bets(self, player):
+            super().update_bets(player)
+
+    class CheckedPlace(PressedPlace):
+        memoizable = True
+
+    assert MemoizedStrategy(examples.IronCross(5)).memoizable
+    assert not MemoizedStrategy(PlaceSixIfPointOn()).memoizable
+    assert not MemoizedStrategy(PressedPlace({6: 6})).memoizable
+    assert MemoizedStrategy(CheckedPlace({6: 6})).memoizable
+    assert not MemoizedStrategy(BetPassLine(5) + PlaceSixIfPointOn()).memoizable
+
+
+def test_benchmark_memoization():
+    times = benchmark_memoization(
+        examples.IronCross(5), n_rolls=50, repeat=1, bankroll_cap=1_000
+    )
+    assert set(times) == {"plain", "memoized"}
+    assert all(x > 0 for x in times.values())
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from crapssim.bet import Field, Odds, PassLine
+from crapssim.optimal import solve_target
+from crapssim.table import Table
+
+
+def test_bold_play_pass_line():
+    policy = solve_target(10, 20, [[PassLine(5)], [PassLine(10)]])
+    assert policy.probability == pytest.approx(244 / 495)
+    assert policy.policy[(10.0, None, True, ())] == 1
+
+
+def test_odds_improve_probability():
+    actions = [[PassLine(5)], [PassLine(10)]]
+    odds = [[Odds(PassLine, x, 5) for x in (4, 5, 6, 8, 9, 10)]]
+    without_odds = solve_target(15, 30, actions)
+    with_odds = solve_target(15, 30, actions + odds)
+    assert with_odds.probability > without_odds.probability
+
+
+def test_policy_strategy_matches_probability():
+    policy = solve_target(20, 40, [[PassLine(5)], [Field(5)], [PassLine(10)]])
+    strategy = policy.strategy()
+
+    n_sessions = 1000
+    n_reached = 0
+    for seed in range(n_sessions):
+        table = Table(seed=seed)
+        table.add_player(20, strategy)
+        table.run(100_000, verbose=False)
+        n_reached += table.players[0].bankroll >= 40
+
+    error = math.sqrt(policy.probability * (1 - policy.probability) / n_sessions)
+    assert n_reached / n_sessions == pytest.approx(policy.probability, abs=4 * error)
+
+
+def test_no_affordable_action():
+    policy = solve_target(5, 20, [[PassLine(10)]])
+    assert policy.probability == 0
+    assert policy.n_states == 1
+    assert policy.policy == {}
+
+
+def test_max_states():
+    with pytest.raises(ValueError):
+        solve_target(10, 20, [[PassLine(5)]], max_states=3)
@@ -1,6 +1,9 @@
+from unittest.mock import MagicMock
+
 from crapssim import Table
-from crapssim.bet import PassLine
+from crapssim.bet import Fire, PassLine
 from crapssim.strategy import BetPassLine
+from crapssim.strategy.examples import Risk12
 
 
 def test_default_strategy():
@@ -31,3 +34,27 @@ def test_existing_bet():
     total_bet_amount = table.players[0].total_bet_amount
 
     assert (bet_count, bet_amount, bankroll, total_bet_amount) == (1, 100, 0, 100)
+
+
+def test_bets_resolved_once_per_roll():
+    table = Table()
+    table.add_player(strategy=Risk12())
+    table.fixed_run([(2, 2)])
+    bet = table.players[0].bets[0]
+    bet.get_result = MagicMock(wraps=bet.get_result)
+    table.fixed_run([(1, 1)])
+    assert bet.get_result.call_count == 1
+
+
+def test_get_bet_result_matches_update_bet():
+    table = Table()
+    table.add_player()
+    player = table.players[0]
+    player.add_bet(Fire(5))
+    table.point.number = 4
+    table.dice.result = (2, 2)
+    player.resolve_bets()
+    fire_bet = player.bets[0]
+    result = player.get_bet_result(fire_bet)
+    player.update_bet()
+    assert (result.amount, fire_bet.points_made) == (0, {4})
@@ -0,0 +1,133 @@
+import pickle
+
+import pytest
+
+import crapssim.strategy.examples as examples
+from crapssim.bet import Come, DontCome, Field, HardWay, PassLine, Place
+from crapssim.strategy import (
+    AddIfNotBet,
+    AddIfTrue,
+    AllOf,
+    AnyOf,
+    BankrollAbove,
+    BetPassLine,
+    CountBelow,
+    HasBet,
+    HasBetOfType,
+    IsBetType,
+    MatchesBet,
+    NewShooter,
+    Not,
+    PointIs,
+    PointOff,
+    PointOn,
+    RemoveIfTrue,
+)
+from crapssim.strategy.compiler import compile_strategy
+from crapssim.table import Table, TableUpdate
+
+
+@pytest.fixture
+def player():
+    table = Table()
+    table.add_player(100)
+    return table.players[0]
+
+
+def test_point_predicates(player):
+    assert PointOff()(player) and not PointOn()(player)
+    player.table.point.number = 6
+    assert PointOn()(player) and not PointOff()(player)
+    assert PointIs(6)(player) and not PointIs(8)(player)
+
+
+def test_bet_predicates(player):
+    player.table.new_shooter = True
+    player.bets = [PassLine(5), Come(5), Place(6, 6)]
+    assert NewShooter()(player)
+    assert HasBet(PassLine(5))(player) and not HasBet(PassLine(10))(player)
+    assert HasBetOfType((Place, Field))(player)
+    assert not HasBetOfType(DontCome)(player)
+    assert CountBelow((PassLine, Come), 3)(player)
+    assert not CountBelow((PassLine, Come), 2)(player)
+    assert BankrollAbove(99)(player) and not BankrollAbove(100)(player)
+
+
+def test_combinations(player):
+    key = PointOff() & ~HasBet(PassLine(5))
+    assert key == AllOf(PointOff(), Not(HasBet(PassLine(5))))
+    assert key(player)
+    player.bets = [PassLine(5)]
+    assert not key(player)
+    assert (key | HasBetOfType(PassLine))(player)
+    assert ~~PointOff() == PointOff()
+    assert AllOf()(player) and not AnyOf()(player)
+    assert repr(PointOn() | PointIs(4) & NewShooter()) == (
+        "PointOn() | (PointIs(4) & NewShooter())"
+    )
+
+
+def test_bet_level_predicates(player):
+    key = MatchesBet(Place(6, 12)) & PointOff()
+    assert key.on_bets
+    assert key.dependencies == {"bet", "point"}
+    assert key(Place(6, 6), player)
+    assert not key(Place(8, 6), player)
+    assert not MatchesBet(HardWay(4, 1))(HardWay(6, 1), player)
+    assert IsBetType(Place)(Place(9, 5), player)
+    assert not IsBetType(Place)(PassLine(5), player)
+
+
+def test_dependencies():
+    assert (PointOn() | NewShooter()).dependencies == {"point", "new_shooter"}
+    assert (~BankrollAbove(50)).dependencies == {"bankroll"}
+    assert CountBelow(Come, 2).dependencies == {"bets"}
+
+
+def test_compile_matches_call(player):
+    key = CountBelow(Come, 2) & ~HasBet(Come(5)) | PointIs(6)
+    check = key.compile()
+    for bets in [[], [Come(5)], [Come(10), Come(10)]]:
+        player.bets = bets
+        assert check(player) == key(player)
+
+
+def test_predicate_pickles(player):
+    key = PointOff() & ~HasBet(PassLine(5))
+    key(player)
+    copied = pickle.loads(pickle.dumps(key))
+    assert copied == key
+    assert copied(player)
+    strategy = pickle.loads(pickle.dumps(AddIfNotBet(PassLine(5))))
+    assert strategy.key(player)
+
+
+def test_add_if_true_memoizable_with_predicate():
+    assert AddIfTrue(Field(5), PointOff() & ~HasBet(Field(5))).memoizable
+    assert not AddIfTrue(Field(5), BankrollAbove(50)).memoizable
+    assert not AddIfTrue(Field(5), lambda p: True).memoizable
+    assert RemoveIfTrue(IsBetType(Field) & NewShooter()).memoizable
+
+
+def test_compiled_predicate_keys_make_same_bets():
+    strategy = (
+        BetPassLine(5)
+        + AddIfTrue(Place(6, 6), PointOn() & ~HasBetOfType(Place))
+        + AddIfTrue(Field(5), BankrollAbove(80) & ~HasBet(Field(5)))
+        + RemoveIfTrue(IsBetType(Place) & PointIs(6))
+    )
+    compiled = compile_strategy(strategy)
+    assert compiled.n_interpreted == 0
+
+    table = Table(seed=5)
+    table.add_player(100, strategy)
+    table.add_player(100, compiled)
+    player, compiled_player = table.players
+    for _ in range(300):
+        TableUpdate().run(table, verbose=False)
+        assert compiled_player.bets == player.bets
+        assert compiled_player.bankroll == player.bankroll
+
+
+def test_examples_use_predicates():
+    assert compile_strategy(examples.Place68DontCome2Odds()).n_interpreted == 0
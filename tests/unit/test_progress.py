@@ -0,0 +1,96 @@
+import io
+import math
+import threading
+
+import pytest
+
+from crapssim.progress import Progress, ProgressCounters, ProgressSnapshot, main, watch
+from crapssim.simulation import Simulation
+from crapssim.strategy.examples import IronCross
+
+
+def test_counters_snapshot():
+    with ProgressCounters.create(10, 2, resumed=4) as counters:
+        snapshot = counters.snapshot()
+        assert snapshot.sessions_done == 4
+        assert snapshot.worker_rates == {}
+        assert math.isinf(snapshot.eta)
+
+        other = ProgressCounters.attach(counters.name)
+        other.start_chunk(1)
+        other.add_session(1, 30)
+        other.add_session(1, 20)
+        other.close()
+
+        snapshot = counters.snapshot()
+        assert snapshot.sessions_done == 6
+        assert snapshot.rolls == 50
+        assert list(snapshot.worker_rates) == [threading.get_native_id()]
+        assert 0 < snapshot.eta < math.inf
+        assert not snapshot.finished
+
+        counters.finish()
+        assert counters.snapshot().finished
+        assert counters.snapshot().eta == 0
+
+
+def test_snapshot_str():
+    snapshot = ProgressSnapshot(10, 5, 1000, 10.0, {1: 60.0, 2: 40.0}, False)
+    assert snapshot.fraction == 0.5
+    assert snapshot.rolls_per_second == 100
+    assert snapshot.eta == 10
+    assert (
+        str(snapshot) == "5/10 sessions (50.0%), 100 rolls/s on 2 workers, ETA 0:00:10"
+    )
+
+
+@pytest.mark.parametrize(
+    "max_workers, backend", [(1, "process"), (2, "process"), (2, "thread")]
+)
+def test_run_reports_progress(max_workers, backend):
+    simulation = Simulation(IronCross(5), 12, max_shooter=2, seed=3)
+    snapshots = []
+    progress = Progress(snapshots.append, interval=0.01)
+    result = simulation.run(max_workers, 3, backend=backend, progress=progress)
+
+    assert snapshots[-1] is progress.last
+    assert progress.last.finished
+    assert progress.last.sessions_done == 12
+    assert progress.last.rolls == result.rolls.sum()
+    assert 1 <= len(progress.last.worker_rates) <= max_workers
+    assert progress.counters is None  # freed
+    assert all(
+        x.sessions_done <= y.sessions_done for x, y in zip(snapshots, snapshots[1:])
+    )
+
+
+def test_records_and_summary_report_progress():
+    simulation = Simulation(IronCross(5), 6, max_shooter=2, seed=3)
+    progress = Progress()
+    with simulation.run_records(1, 2, progress=progress) as records:
+        assert progress.last.rolls == records.records["rolls"].sum()
+
+    summary = simulation.summarize(1, 2, progress=progress)
+    summary.extend(4, 1, 2, progress=progress)
+    assert progress.last.sessions_done == 10
+    assert progress.last.resumed == 6
+    assert (
+        progress.last.rolls
+        == summary.extend(4, 1, 2).summary.total_rolls - summary.summary.total_rolls
+    )
+
+
+def test_watch_other_process_counters():
+    counters = ProgressCounters.create(3, 1)
+    counters.start_chunk(0)
+    counters.add_session(0, 7)
+    counters.finish()
+    output = io.StringIO()
+    snapshot = watch(counters.name, file=output)
+    assert snapshot.rolls == 7
+    assert output.getvalue().startswith("1/3 sessions")
+    counters.close()
+    counters.unlink()
+
+    with pytest.raises(SystemExit):
+        main([counters.name])
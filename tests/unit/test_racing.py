@@ -0,0 +1,107 @@
+import concurrent.futures
+
+import pytest
+
+from crapssim.racing import _rate, race
+from crapssim.strategy import BetPassLine
+from crapssim.strategy.single_bet import BetAny7, BetField
+
+STRATEGIES = {
+    "pass_line": BetPassLine(5),
+    "any7": BetAny7(25),
+    "field": BetField(5),
+}
+
+
+def strategy(name):
+    return STRATEGIES[name]
+
+
+def test_race_drops_worse_configurations():
+    result = race(
+        strategy,
+        {"name": ["any7", "pass_line", "field"]},
+        budget=600,
+        round_size=20,
+        max_shooter=3,
+        seed=3,
+        max_workers=1,
+    )
+    assert result.best.parameters == {"name": "pass_line"}
+    assert result.best.eliminated is None
+    any7 = result.entries[-1]
+    assert any7.parameters == {"name": "any7"}
+    assert any7.eliminated is not None
+    assert any7.summary.n_sessions < result.best.summary.n_sessions
+    assert result.n_sessions <= 600
+
+
+@pytest.mark.parametrize("metric", ["mean", "win_rate", "ruin_rate"])
+def test_race_metrics(metric):
+    result = race(
+        strategy,
+        [{"name": x} for x in STRATEGIES],
+        budget=90,
+        metric=metric,
+        round_size=10,
+        max_shooter=2,
+        seed=8,
+        max_workers=1,
+    )
+    assert result.metric == metric
+    assert len(result.entries) == 3
+    assert result.n_rounds >= 1
+    assert result.n_sessions <= 90
+
+
+def test_race_same_results_for_any_workers():
+    kwargs = {"budget": 60, "round_size": 10, "max_shooter": 2, "seed": 1}
+    grid = {"name": list(STRATEGIES)}
+    assert race(strategy, grid, max_workers=2, **kwargs) == race(
+        strategy, grid, max_workers=1, **kwargs
+    )
+
+
+def test_race_uses_one_executor(monkeypatch):
+    executors = []
+
+    class Executor(concurrent.futures.ThreadPoolExecutor):
+        def __init__(self, max_workers=None):
+            super().__init__(max_workers)
+            executors.append(self)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", Executor)
+    result = race(
+        strategy,
+        {"name": list(STRATEGIES)},
+        budget=60,
+        round_size=10,
+        max_shooter=2,
+        seed=1,
+        max_workers=2,
+    )
+    assert result.n_rounds > 1
+    assert len(executors) == 1
+
+
+def test_race_unknown_metric():
+    with pytest.raises(ValueError):
+        race(strategy, {"name": ["field"]}, budget=10, metric="median")
+
+
+@pytest.mark.parametrize("rate", [0.0, 1.0])
+def test_rate_interval_not_empty_at_bounds(rate):
+    lower, upper = _rate(rate, 20, 1.96)
+    assert 0 <= lower < upper <= 1
+    assert upper - lower > 0.1
+
+
+def test_race_min_sessions():
+    kwargs = {"budget": 600, "round_size": 20, "max_shooter": 3, "seed": 3}
+    grid = {"name": ["any7", "pass_line", "field"]}
+    result = race(strategy, grid, min_sessions=1000, max_workers=1, **kwargs)
+    assert all(x.eliminated is None for x in result.entries)
+    assert all(x.summary.n_sessions == 200 for x in result.entries)
+
+    result = race(strategy, grid, min_sessions=60, max_workers=1, **kwargs)
+    assert all(x.eliminated is None or x.eliminated >= 3 for x in result.entries)
@@ -0,0 +1,172 @@
+import asyncio
+import concurrent.futures
+import math
+import threading
+
+import pytest
+
+import crapssim.service as service_module
+from crapssim.cache import ResultCache
+from crapssim.service import JobService, JobStatus, simulation_from_request
+
+REQUEST = {
+    "strategy": {"type": "IronCross", "base_amount": 5},
+    "n_sessions": 10,
+    "max_shooter": 2,
+    "seed": 3,
+}
+
+
+def test_simulation_from_request():
+    simulation = simulation_from_request(REQUEST | {"max_rolls": None})
+    assert simulation.n_sessions == 10
+    assert math.isinf(simulation.max_rolls)
+    with pytest.raises(ValueError):
+        simulation_from_request({"n_sessions": 10})
+    with pytest.raises(ValueError):
+        simulation_from_request(REQUEST | {"sessions": 10})
+    with pytest.raises(ValueError, match="Invalid parameters"):
+        simulation_from_request(
+            REQUEST
+            | {"strategy": {"type": "PassLineOddsMultiplier", "odds_multiplier": 2.0}}
+        )
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_job_streams_updates_and_result(backend):
+    async def run():
+        async with JobService(2, chunk_size=3, backend=backend) as service:
+            job = service.submit_request(REQUEST)
+            updates = [x.n_sessions async for x in job.updates()]
+            return job, updates, await job.result()
+
+    job, updates, result = asyncio.run(run())
+    assert updates[-1] == 10
+    assert set(updates) <= {3, 6, 9, 10}
+    assert job.status is JobStatus.DONE
+    expected = simulation_from_request(REQUEST).summarize(max_workers=1, chunk_size=3)
+    assert result == expected
+
+
+def test_identical_jobs_are_deduplicated():
+    async def run():
+        async with JobService(2, chunk_size=2, backend="thread") as service:
+            job = service.submit_request(REQUEST)
+            assert service.submit_request(REQUEST) is job
+            other = service.submit_request(REQUEST | {"seed": 4})
+            assert other is not job
+            assert service.get(job.id) is job
+            await job.result()
+            await other.result()
+            return service
+
+    service = asyncio.run(run())
+    assert len(service.jobs) == 2
+
+
+def test_cancel(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    summarize_sessions = service_module._summarize_sessions
+
+    def slow_chunk(*args):
+        started.set()
+        release.wait(5)
+        return summarize_sessions(*args)
+
+    monkeypatch.setattr(service_module, "_summarize_sessions", slow_chunk)
+
+    async def run():
+        async with JobService(1, chunk_size=2, backend="thread") as service:
+            job = service.submit_request(REQUEST)
+            await asyncio.to_thread(started.wait, 5)
+            assert job.cancel()
+            release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await job.result()
+            assert not job.cancel()
+            # a cancelled job is no longer in flight, so it's submitted again
+            again = service.submit_request(REQUEST)
+            assert again is not job
+            return job, await again.result()
+
+    job, result = asyncio.run(run())
+    assert job.status is JobStatus.CANCELLED
+    assert result.n_sessions == 10
+
+
+def test_chunks_in_flight_bounded(monkeypatch):
+    class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+        in_flight = most = 0
+        lock = threading.Lock()
+
+        def submit(self, *args, **kwargs):
+            with self.lock:
+                CountingExecutor.in_flight += 1
+                CountingExecutor.most = max(self.most, self.in_flight)
+            future = super().submit(*args, **kwargs)
+            future.add_done_callback(self.done)
+            return future
+
+        def done(self, future):
+            with self.lock:
+                CountingExecutor.in_flight -= 1
+
+    monkeypatch.setitem(service_module.BACKENDS, "thread", CountingExecutor)
+
+    async def run():
+        async with JobService(2, chunk_size=1, backend="thread") as service:
+            jobs = [service.submit_request(REQUEST | {"seed": x}) for x in range(3)]
+            return [await x.result() for x in jobs]
+
+    results = asyncio.run(run())
+    assert [x.n_sessions for x in results] == [10, 10, 10]
+    assert CountingExecutor.most == 2
+
+
+def test_finished_jobs_evicted():
+    async def run():
+        async with JobService(
+            1, chunk_size=5, backend="thread", max_finished_jobs=2
+        ) as service:
+            jobs = [service.submit_request(REQUEST | {"seed": x}) for x in range(4)]
+            for job in jobs:
+                await job.result()
+            return service, jobs
+
+    service, jobs = asyncio.run(run())
+    assert list(service.jobs) == [x.id for x in jobs[2:]]
+    with pytest.raises(KeyError):
+        service.get(jobs[0].id)
+
+
+def test_failed_job(monkeypatch):
+    def broken_chunk(*args):
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(service_module, "_summarize_sessions", broken_chunk)
+
+    async def run():
+        async with JobService(1, backend="thread") as service:
+            job = service.submit_request(REQUEST)
+            with pytest.raises(RuntimeError):
+                await job.result()
+            return job
+
+    assert asyncio.run(run()).status is JobStatus.FAILED
+
+
+def test_cached_summary(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    simulation = simulation_from_request(REQUEST)
+    expected = simulation.summarize(max_workers=1, chunk_size=5, cache=cache)
+    monkeypatch.setattr(service_module, "_summarize_sessions", None)  # not run
+
+    async def run():
+        async with JobService(1, 5, backend="thread", cache=cache) as service:
+            job = service.submit(simulation)
+            return await job.result(), [x async for x in job.updates()]
+
+    result, updates = asyncio.run(run())
+    assert result == expected
+    assert updates == [expected]
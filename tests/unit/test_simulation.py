@@ -0,0 +1,230 @@
+import numpy as np
+import pytest
+
+import crapssim.simulation as simulation_module
+from crapssim import Table
+from crapssim.bet import Place
+from crapssim.simulation import SessionRecords, Simulation, benchmark_backends
+from crapssim.strategy import MemoizedStrategy, Strategy
+from crapssim.strategy.examples import IronCross
+from crapssim.sweep import sweep
+
+
+def assert_same_results(result, other):
+    assert result.seed == other.seed
+    np.testing.assert_array_equal(result.net, other.net)
+    np.testing.assert_array_equal(result.ruined, other.ruined)
+    np.testing.assert_array_equal(result.rolls, other.rolls)
+
+
+def test_simulation_result():
+    result = Simulation(IronCross(5), 10, max_shooter=2, seed=3).run(max_workers=1)
+    assert result.n_sessions == 10
+    assert result.rolls.min() > 0
+    np.testing.assert_array_equal(result.final_bankroll, 100 + result.net)
+    assert result.summary.n_sessions == 10
+    assert result.summary.mean == pytest.approx(result.net.mean())
+
+
+@pytest.mark.parametrize("max_workers, chunk_size", [(1, 3), (2, None), (3, 1)])
+def test_simulation_same_results_for_any_workers(max_workers, chunk_size):
+    simulation = Simulation(IronCross(5), 12, max_shooter=2, seed=7)
+    assert_same_results(
+        simulation.run(max_workers, chunk_size),
+        simulation.run(max_workers=1, chunk_size=12),
+    )
+
+
+def test_simulation_same_dice_as_sweep():
+    result = Simulation(IronCross(5), 8, max_shooter=2, seed=5).run(max_workers=1)
+    (swept,) = sweep(
+        IronCross,
+        [{"base_amount": 5}],
+        n_sessions=8,
+        max_shooter=2,
+        seed=5,
+        chunk_size=8,
+        max_workers=1,
+    )
+    assert result.summary == swept.summary
+
+
+def test_simulation_random_seed_is_kept():
+    simulation = Simulation(IronCross(5), 3, max_shooter=1)
+    assert_same_results(simulation.run(max_workers=1), simulation.run(max_workers=1))
+
+
+def test_run_records_matches_run():
+    simulation = Simulation(IronCross(5), 10, max_shooter=2, seed=3)
+    result = simulation.run(max_workers=1)
+    with simulation.run_records(max_workers=1) as records:
+        recorded = records.records
+        np.testing.assert_array_equal(recorded["session"], np.arange(10))
+        np.testing.assert_array_equal(recorded["final_bankroll"], result.final_bankroll)
+        np.testing.assert_array_equal(recorded["rolls"], result.rolls)
+        assert (recorded["max_bankroll"] >= recorded["final_bankroll"]).all()
+        assert (recorded["min_bankroll"] <= recorded["final_bankroll"]).all()
+        assert (recorded["max_bankroll"] >= 100).all()
+        assert (recorded["risked"] >= 100 - recorded["min_bankroll"]).all()
+        assert (recorded["shooters"] >= 1).all()
+        assert (recorded["shooters"] <= 2).all()
+
+
+def test_run_records_same_for_any_workers():
+    simulation = Simulation(IronCross(5), 9, max_shooter=2, seed=4)
+    with simulation.run_records(max_workers=1) as expected:
+        with simulation.run_records(max_workers=2, chunk_size=2) as records:
+            np.testing.assert_array_equal(records.records, expected.records)
+
+
+def test_risked_counts_bets_added():
+    class MovePlace6(Strategy):
+        def update_bets(self, player):
+            player.remove_bet(player.bets[0])
+            player.add_bet(Place(8, 6))  # same amount as the bet taken down
+            player.add_bet(Place(5, 5))  # pressed from 5 to 10
+
+        def completed(self, player):
+            return False
+
+    table = Table()
+    table.add_player(100)
+    player = table.players[0]
+    player.add_bet(Place(6, 6))
+    player.add_bet(Place(5, 5))
+    player.strategy = MovePlace6()
+    update = simulation_module._RecordingUpdate()
+    update.run_strategies(table)
+    assert player.total_bet_amount == 6 + 10
+    assert update.risked == 6 + 5
+
+
+def test_session_records_attach():
+    with SessionRecords.create(3) as records:
+        other = SessionRecords.attach(records.name, 3)
+        other.records["risked"][1] = 5.0
+        other.close()
+        assert records.records["risked"].tolist() == [0.0, 5.0, 0.0]
+
+
+def test_run_resumes_from_checkpoint(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "checkpoint.npz"
+    simulation = Simulation(IronCross(5), 10, max_shooter=2, seed=2)
+    expected = simulation.run(max_workers=1)
+
+    run_sessions = simulation_module._run_sessions
+
+    def crash_at_session_6(*args):
+        if args[-2] >= 6:
+            raise KeyboardInterrupt
+        return run_sessions(*args)
+
+    monkeypatch.setattr(simulation_module, "_run_sessions", crash_at_session_6)
+    with pytest.raises(KeyboardInterrupt):
+        simulation.run(1, 2, checkpoint=checkpoint, checkpoint_interval=0)
+    monkeypatch.undo()
+
+    assert checkpoint.exists()
+    calls = []
+
+    def count_sessions(*args):
+        calls.append(args[-2:])
+        return run_sessions(*args)
+
+    monkeypatch.setattr(simulation_module, "_run_sessions", count_sessions)
+    result = simulation.run(1, 2, checkpoint=checkpoint)
+    assert calls == [(6, 8), (8, 10)]
+    assert_same_results(result, expected)
+
+
+def test_checkpoint_for_other_simulation(tmp_path):
+    checkpoint = tmp_path / "checkpoint.npz"
+    Simulation(IronCross(5), 2, max_shooter=1, seed=2).run(1, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        Simulation(IronCross(10), 2, max_shooter=1, seed=2).run(
+            1, checkpoint=checkpoint
+        )
+
+
+def test_summary_extend():
+    simulation = Simulation(IronCross(5), 6, max_shooter=2, seed=8)
+    summary = simulation.summarize(max_workers=1, chunk_size=4)
+    assert summary.n_sessions == 6
+    extended = summary.extend(9, max_workers=1, chunk_size=4)
+    assert extended.n_sessions == 15
+    assert summary.n_sessions == 6
+
+    expected = Simulation(IronCross(5), 15, max_shooter=2, seed=8).run(max_workers=1)
+    assert extended.summary.total_rolls == expected.summary.total_rolls
+    assert extended.summary.n_wins == expected.summary.n_wins
+    assert extended.summary.mean == pytest.approx(expected.summary.mean)
+    assert extended.summary.variance == pytest.approx(expected.summary.variance)
+
+
+def test_summary_same_for_any_workers():
+    simulation = Simulation(IronCross(5), 6, max_shooter=2, seed=1)
+    summary = simulation.summarize(max_workers=2, chunk_size=2)
+    assert summary.extend(3, max_workers=2) == simulation.summarize(
+        max_workers=1, chunk_size=2
+    ).extend(3, max_workers=1)
+
+
+def test_thread_backend_same_results():
+    simulation = Simulation(MemoizedStrategy(IronCross(5)), 8, max_shooter=2, seed=3)
+    assert_same_results(
+        simulation.run(max_workers=3, chunk_size=2, backend="thread"),
+        simulation.run(max_workers=1),
+    )
+    assert simulation.summarize(2, 3, backend="thread") == simulation.summarize(2, 3)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        Simulation(IronCross(5), 4, max_shooter=1, seed=3).run(2, 1, backend="gpu")
+
+
+def test_benchmark_backends():
+    simulation = Simulation(IronCross(5), 2, max_shooter=1, seed=3)
+    times = benchmark_backends(simulation, max_workers=2)
+    assert set(times) == {"thread", "process"}
+    assert all(x > 0 for x in times.values())
+
+
+def test_simulation_runout_and_table_settings():
+    simulation = Simulation(
+        IronCross(5),
+        4,
+        max_rolls=5,
+        seed=2,
+        runout=True,
+        table_settings={"field_payouts": {2: 3, 3: 1, 4: 1, 9: 1, 10: 1, 11: 1, 12: 3}},
+    )
+    result = simulation.run(max_workers=1)
+    assert (result.rolls >= 5).all()
+    assert "runout=True" in repr(simulation)
+    with simulation.run_records(max_workers=1) as records:
+        assert records.records["rolls"].tolist() == result.rolls.tolist()
+
+
+def test_iter_summarize():
+    simulation = Simulation(IronCross(5), 7, max_shooter=2, seed=4)
+    summaries = list(simulation.iter_summarize(max_workers=1, chunk_size=3))
+    assert [x.n_sessions for x in summaries] == [3, 6, 7]
+    assert summaries[-1] == simulation.summarize(max_workers=1, chunk_size=3)
+
+
+def test_iter_summarize_closed_early(monkeypatch):
+    summarize_sessions = simulation_module._summarize_sessions
+    calls = []
+
+    def count_chunks(*args):
+        calls.append(args[-2])
+        return summarize_sessions(*args)
+
+    monkeypatch.setattr(simulation_module, "_summarize_sessions", count_chunks)
+    simulation = Simulation(IronCross(5), 200, max_shooter=2, seed=4)
+    summaries = simulation.iter_summarize(2, 1, backend="thread")
+    assert next(summaries).n_sessions == 1
+    summaries.close()
+    # only the chunks already running when the iterator was closed still finish
+    assert len(calls) < 20
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+import crapssim.strategy.examples as examples
+from crapssim.bet import Come, PassLine
+from crapssim.strategy import (
+    BetPassLine,
+    BetPlace,
+    CompiledStrategy,
+    CountStrategy,
+    PassLineOddsMultiplier,
+    load_spec,
+    spec_hash,
+    strategy_from_spec,
+)
+from crapssim.strategy.single_bet import BetHop, StrategyMode
+from crapssim.strategy.spec import PRESETS
+from crapssim.table import Table, TableUpdate
+
+PRESET_PARAMETERS = {
+    "Pass2Come": {"bet_amount": 5},
+    "PlaceInside": {"bet_amount": {"4": 5, "5": 5, "6": 6, "8": 6, "9": 5, "10": 5}},
+    "IronCross": {"base_amount": 5},
+    "HammerLock": {"base_amount": 5},
+    "Knockout": {"base_amount": 5},
+}
+
+
+@pytest.mark.parametrize("name", PRESETS)
+def test_spec_preset_makes_same_bets(name):
+    parameters = PRESET_PARAMETERS.get(name, {})
+    spec = json.loads(json.dumps({"type": name} | parameters))
+    strategy = PRESETS[name](
+        **{
+            k: {int(n): x for n, x in v.items()} if isinstance(v, dict) else v
+            for k, v in parameters.items()
+        }
+    )
+
+    table = Table(seed=7)
+    table.add_player(200, strategy)
+    table.add_player(200, strategy_from_spec(spec))
+    player, spec_player = table.players
+    for _ in range(200):
+        TableUpdate().run(table, verbose=False)
+        assert spec_player.bets == player.bets
+        assert spec_player.bankroll == player.bankroll
+
+
+def test_spec_builds_primitives():
+    spec = json.loads("""[
+            {"type": "BetPassLine", "bet_amount": 5},
+            {"type": "PassLineOddsMultiplier", "odds_multiplier": {"4": 3, "6": 5}},
+            {"type": "BetPlace", "place_bet_amounts": {"6": 6, "8": 6},
+             "skip_point": false},
+            {"type": "CountStrategy", "bet_type": ["PassLine", "Come"], "count": 2,
+             "bet": {"type": "Come", "amount": 5}},
+            {"type": "BetHop", "result": [1, 2], "bet_amount": 1, "mode": "REPLACE"}
+        ]""")
+    strategy = strategy_from_spec(spec, compile=False)
+    expected = (
+        BetPassLine(5)
+        + PassLineOddsMultiplier({4: 3, 6: 5})
+        + BetPlace({6: 6, 8: 6}, skip_point=False)
+        + CountStrategy((PassLine, Come), 2, Come(5))
+        + BetHop((1, 2), 1, StrategyMode.REPLACE)
+    )
+    assert repr(strategy) == repr(expected)
+
+
+def test_spec_compiles():
+    strategy = strategy_from_spec({"type": "BetPlace", "place_bet_amounts": {6: 6}})
+    assert isinstance(strategy, CompiledStrategy)
+    assert strategy.n_interpreted == 0
+
+
+def test_spec_string_preset():
+    assert repr(strategy_from_spec("Risk12", compile=False)) == repr(examples.Risk12())
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"type": "AddIfTrue", "bet": {"type": "Place", "number": 6, "amount": 6}},
+        {"type": "AddIfNotBet", "bet": {"type": "Lay", "number": 4, "amount": 6}},
+        {"type": "BetPassLine", "amount": 5},
+        {"type": "BetPassLine", "bet_amount": 5, "mode": "ADD_SOMETIMES"},
+        {"bet_amount": 5},
+        {"type": "PassLineOddsMultiplier", "odds_multiplier": 2.0},
+    ],
+)
+def test_spec_invalid(spec):
+    with pytest.raises(ValueError):
+        strategy_from_spec(spec)
+
+
+def test_spec_hash():
+    spec = {
+        "type": "AddIfNotBet",
+        "bet": {"type": "Place", "number": 6, "amount": 6},
+    }
+    assert spec_hash(spec) == spec_hash(
+        {"bet": {"amount": 6.0, "number": 6, "type": "Place"}, "type": "AddIfNotBet"}
+    )
+    assert spec_hash(spec) != spec_hash(
+        {"type": "AddIfNotBet", "bet": {"type": "Place", "number": 8, "amount": 6}}
+    )
+    assert spec_hash({"type": "BetPlace", "place_bet_amounts": {6: 6, 8: 6}}) != (
+        spec_hash({"type": "BetPlace", "place_bet_amounts": {8: 6, 6: 6}})
+    )
+
+
+def test_load_spec_json(tmp_path):
+    path = tmp_path / "strategy.json"
+    path.write_text('{"type": "IronCross", "base_amount": 10}')
+    assert load_spec(path) == {"type": "IronCross", "base_amount": 10}
+
+
+def test_load_spec_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "strategy.yaml"
+    path.write_text("- type: BetPassLine\n  bet_amount: 5\n- Risk12\n")
+    assert load_spec(path) == [{"type": "BetPassLine", "bet_amount": 5}, "Risk12"]
@@ -1,3 +1,6 @@
+import collections
+import pickle
+import types
 from unittest.mock import MagicMock, call
 
 import pytest
@@ -44,6 +47,7 @@ from crapssim.strategy.examples import (
 from crapssim.strategy.odds import OddsAmount, OddsMultiplier
 from crapssim.strategy.single_bet import StrategyMode, _BaseSingleBet
 from crapssim.strategy.tools import RemoveByType, RemoveIfPointOff, ReplaceIfTrue
+from crapssim.table import TableUpdate
 
 
 @pytest.fixture
@@ -572,6 +576,91 @@ def test_odds_multiplier_dont_come_bet_placed(player):
     player.add_bet.assert_called_with(Odds(DontCome, 6, 30))
 
 
+def test_odds_multiplier_reuses_odds_bet(player):
+    strategy = OddsMultiplier(DontCome, 6)
+    player.bets = [DontCome(5, 6)]
+    player.add_bet = MagicMock()
+    strategy.update_bets(player)
+    strategy.update_bets(player)
+    first, second = player.add_bet.call_args_list
+    assert first.args[0] is second.args[0]
+
+
+def test_bet_place_reuses_sub_strategies(player):
+    strategy = BetPlace({5: 5, 6: 6})
+    sub_strategies = list(strategy._place_strategies.values())
+    player.table.point.number = 4
+    strategy.update_bets(player)
+    assert player.bets == [Place(5, 5), Place(6, 6)]
+    assert list(strategy._place_strategies.values()) == sub_strategies
+    assert all(
+        x is y for x, y in zip(strategy._place_strategies.values(), sub_strategies)
+    )
+
+
+@pytest.mark.parametrize(
+    "strategy, name, value",
+    [
+        (BetPlace({5: 5, 6: 6}), "place_bet_amounts", {8: 6}),
+        (BetPlace({5: 5, 6: 6}), "mode", StrategyMode.ADD_IF_NOT_BET),
+        (_BaseSingleBet(PassLine(5)), "bet", PassLine(10)),
+        (OddsAmount(PassLine, {6: 10}), "odds_amounts", {8: 10}),
+        (OddsMultiplier(PassLine, 2), "odds_multiplier", {4: 3}),
+        (HammerLock(5), "base_amount", 10),
+        (HammerLock(5), "odds_multiplier", 3),
+        (Place68PR(6), "base_amount", 12),
+        (Place68PR(6), "press_amount", 18),
+        (Place68Move59(), "six_eight_amount", 12),
+        (Place682Come(), "pass_come_amount", 10),
+        (DiceDoctor(), "multipliers", [1, 2]),
+    ],
+)
+def test_cached_settings_assignable(strategy, name, value):
+    setattr(strategy, name, value)
+    assert getattr(strategy, name) == value
+
+
+def test_cached_settings_assignment_rebuilds_bets(player):
+    strategy = BetPlace({5: 5, 6: 6})
+    strategy.place_bet_amounts = {8: 6}
+    player.table.point.number = 4
+    strategy.update_bets(player)
+    assert player.bets == [Place(8, 6)]
+
+
+def test_hammer_lock_base_amount_assignment_rebuilds_strategies(player):
+    strategy = HammerLock(5)
+    strategy.base_amount = 10
+    strategy.update_bets(player)
+    assert player.bets == [PassLine(10), DontPass(10)]
+
+
+def test_place68pr_press_amount_assignment_rebuilds_bets(player):
+    strategy = Place68PR(6)
+    strategy.press_amount = 18
+    assert strategy._pressed_bets == {6: Place(6, 18), 8: Place(8, 18)}
+
+
+def test_odds_multiplier_int_assignment():
+    strategy = OddsMultiplier(PassLine, 2)
+    strategy.odds_multiplier = 3
+    assert strategy.odds_multiplier == {x: 3 for x in (4, 5, 6, 8, 9, 10)}
+
+
+def test_cached_settings_copied(player):
+    strategy = BetPlace({5: 5, 6: 6})
+    strategy.place_bet_amounts[8] = 6
+    player.table.point.number = 4
+    strategy.update_bets(player)
+    assert strategy.place_bet_amounts == {5: 5, 6: 6}
+    assert player.bets == [Place(5, 5), Place(6, 6)]
+
+
+def test_risk12_point_off_static(player):
+    Risk12.point_off(player)
+    assert player.bets == [PassLine(5), Field(5)]
+
+
 def test_base_single_bet_add_if_non_existent_add(player):
     strategy = _BaseSingleBet(PassLine(5))
     player.add_bet = MagicMock()
@@ -996,6 +1085,15 @@ def test_hammerlock_place_5689_added_bets(player):
     )
 
 
+def test_hammerlock_clone_shares_sub_strategies():
+    strategy = HammerLock(5)
+    strategy.place_win_count = 1
+    clone = strategy.clone()
+    clone.place_win_count += 1
+    assert strategy.place_win_count == 1
+    assert clone._place68_strategy is strategy._place68_strategy
+
+
 @pytest.mark.parametrize("place_win_count", [0, 1, 2])
 def test_hammerlock_always_add_dont_odds(player, place_win_count):
     strategy = HammerLock(5)
@@ -1345,3 +1443,104 @@ def test_place_68_cpr_update_bets_initial_bets_placed_no_update(player):
 def test_repr_names(strategy, strategy_name):
     # Check above visually make sense
     assert repr(strategy) == strategy_name
+
+
+def test_clone_aggregate_strategy_clones_children():
+    strategy = (
+        crapssim.strategy.BetPassLine(5) + crapssim.strategy.examples.DiceDoctor()
+    )
+    clone = strategy.clone()
+    assert clone.strategies[0] is not strategy.strategies[0]
+    assert clone.strategies[0].bet is strategy.strategies[0].bet
+    clone.strategies[1].current_progression = 3
+    assert strategy.strategies[1].current_progression == 0
+
+
+def test_clone_deep_copies_unshared_attributes(base_strategy):
+    base_strategy.history = [1, 2]
+    clone = base_strategy.clone()
+    clone.history.append(3)
+    assert base_strategy.history == [1, 2]
+
+
+def test_players_get_own_strategy_state():
+    table = Table()
+    strategy = crapssim.strategy.examples.Risk12()
+    table.add_player(strategy=strategy)
+    table.add_player(strategy=strategy)
+    table.players[0].strategy.pre_point_winnings = 10
+    assert table.players[1].strategy.pre_point_winnings == 0
+    assert strategy.pre_point_winnings == 0
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        crapssim.strategy.examples.IronCross(5),
+        crapssim.strategy.examples.Knockout(5),
+        crapssim.strategy.examples.Place68DontCome2Odds(),
+        HammerLock(5),
+        Place682Come(),
+        Place68PR(),
+        Risk12(),
+        DiceDoctor(),
+    ],
+    ids=repr,
+)
+def test_clones_leave_shared_attributes_unchanged(strategy):
+    # clones played on other tables (and threads) share the configuration
+    original = pickle.dumps(strategy)
+    table = Table(seed=3)
+    for _ in range(3):
+        table.add_player(1000, strategy)
+    for _ in range(300):
+        TableUpdate().run(table, verbose=False)
+    assert pickle.dumps(strategy) == original
+
+
+def test_clone_has_own_odds_bets(player):
+    strategy = OddsMultiplier(PassLine, 2)
+    player.table.point.number = 6
+    player.bets = [PassLine(5)]
+    strategy.update_bets(player)
+    clone = strategy.clone()
+    assert clone._odds_bets == {}
+    assert clone.state_key() == strategy.state_key()
+    assert strategy._odds_bets == {6: Odds(PassLine, 6, 10)}
+
+
+def test_state_key_changes_with_state():
+    strategy = HammerLock(5)
+    clone = strategy.clone()
+    assert clone.state_key() == strategy.state_key()
+    clone.place_win_count = 1
+    assert clone.state_key() != strategy.state_key()
+
+
+@pytest.mark.parametrize(
+    "strategy, attribute, value, capped",
+    [
+        (Risk12(), "pre_point_winnings", 15, 10),
+        (DiceDoctor(), "current_progression", 20, 11),
+    ],
+)
+def test_state_key_caps_counters(strategy, attribute, value, capped):
+    other = strategy.clone()
+    setattr(strategy, attribute, value)
+    setattr(other, attribute, capped)
+    assert strategy.state_key() == other.state_key()
+
+
+def test_state_key_of_object_attribute_follows_its_contents():
+    strategy = HammerLock(5)
+    strategy.counts = types.SimpleNamespace(wins=0)
+    key = strategy.state_key()
+    strategy.counts.wins = 1
+    assert strategy.state_key() != key
+
+
+def test_state_key_of_unsupported_attribute_raises():
+    strategy = HammerLock(5)
+    strategy.history = collections.deque([1, 2])
+    with pytest.raises(TypeError, match="deque"):
+        strategy.state_key()
@@ -0,0 +1,96 @@
+import math
+
+import pytest
+
+import crapssim
+from crapssim.strategy.examples import HammerLock, IronCross
+from crapssim.sweep import SessionSummary, SweepResult, sweep
+
+
+def run_sweep(**kwargs) -> dict[int, SweepResult]:
+    settings = {
+        "factory": IronCross,
+        "grid": {"base_amount": [5, 10]},
+        "n_sessions": 12,
+        "max_shooter": 2,
+        "seed": 4,
+        "chunk_size": 5,
+        "max_workers": 1,
+    } | kwargs
+    return {x.parameters["base_amount"]: x for x in sweep(**settings)}
+
+
+def test_sweep_summary():
+    results = run_sweep()
+    assert set(results) == {5, 10}
+    summary = results[5].summary
+    assert summary.n_sessions == 12
+    assert 0 <= summary.win_rate <= 1
+    assert summary.mean_rolls > 0
+
+
+def test_sweep_same_results_for_any_workers():
+    assert run_sweep(max_workers=2) == run_sweep(max_workers=1)
+
+
+def test_sweep_same_dice_for_each_configuration():
+    results = list(
+        sweep(
+            IronCross,
+            [{"base_amount": 5}, {"base_amount": 5}],
+            n_sessions=4,
+            max_shooter=2,
+            seed=9,
+            max_workers=1,
+        )
+    )
+    assert results[0] == results[1]
+
+
+def test_sweep_reuses_cache():
+    cache = {}
+    run_sweep(cache=cache)
+    assert len(cache) == 2 * 3
+
+    marked = SessionSummary(12, 1.0, 0.0, 0, 0, 1)
+    for key in cache:
+        cache[key] = marked
+    results = run_sweep(grid={"base_amount": [5, 10, 25]}, cache=cache)
+    assert len(cache) == 3 * 3
+    assert results[5].summary.mean == 1.0
+    assert results[25].summary.mean != 1.0
+
+
+def test_sweep_cache_keyed_by_version(monkeypatch):
+    cache = {}
+    run_sweep(cache=cache)
+    monkeypatch.setattr(crapssim, "__version__", crapssim.__version__ + ".dev1")
+    run_sweep(cache=cache)
+    assert len(cache) == 2 * 2 * 3
+
+
+def test_sweep_factory_function():
+    results = sweep(
+        lambda amount: HammerLock(amount),
+        [{"amount": 5}],
+        n_sessions=3,
+        max_shooter=1,
+        max_workers=1,
+    )
+    assert [x.summary.n_sessions for x in results] == [3]
+
+
+def test_session_summary_merge():
+    net = [10.0, -5.0, 0.0, 25.0, -40.0, 5.0]
+    ruined = [False, False, True, False, True, False]
+    summary = SessionSummary.from_sessions(net, ruined, 60)
+    merged = SessionSummary.from_sessions(net[:2], ruined[:2], 20).merge(
+        SessionSummary.from_sessions(net[2:], ruined[2:], 40)
+    )
+    assert merged.n_sessions == 6
+    assert merged.mean == pytest.approx(summary.mean)
+    assert merged.variance == pytest.approx(summary.variance)
+    assert merged.win_rate == summary.win_rate == 0.5
+    assert merged.ruin_rate == pytest.approx(1 / 3)
+    assert merged.mean_rolls == 10
+    assert math.isnan(SessionSummary.from_sessions([1.0], [False], 1).variance)